@@ -0,0 +1,257 @@
+"""Streaming export of records to JSON, JSON Lines, CSV and Parquet files.
+
+Every exporter consumes an iterable and writes each record as soon as it
+arrives, so exporting from a lazy, paginated source such as
+``AccountService.iter_account_logs`` or ``LogStore.iter_query`` keeps
+memory constant however many records there are. A path ending in ``.gz``
+is gzip-compressed. Parquet output needs the optional ``pyarrow`` package
+and is written in row groups of ``batch_size`` records.
+"""
+
+import csv
+import gzip
+import json
+import logging
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO, Union
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional dependency, only needed for Parquet exports
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# CSV columns of a PhoneNumber, with capabilities flattened to flags
+PHONE_NUMBER_FIELDS = [
+    "number", "friendly_name", "city", "state", "country",
+    "voice_enabled", "sms_enabled", "added_at"
+]
+
+# CSV columns of an account log entry
+LOG_FIELDS = [
+    "sid", "type", "timestamp", "from", "to", "direction",
+    "status", "duration", "body", "price"
+]
+
+# Parquet types of non-text columns; every other column is written as text
+PARQUET_TYPES = {
+    "price": "float64",
+    "voice_enabled": "bool",
+    "sms_enabled": "bool"
+}
+
+def _to_dict(record: Any) -> Dict:
+    """Convert a dataclass, pydantic model or mapping to a dict."""
+    if is_dataclass(record):
+        return asdict(record)
+    if hasattr(record, "model_dump"):
+        return record.model_dump()
+    return dict(record)
+
+def _json_default(value: Any) -> Any:
+    """Encode values json cannot serialize by default."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+def _flatten(data: Dict) -> Dict:
+    """Flatten a record for tabular output.
+
+    A ``capabilities`` mapping becomes one ``<name>_enabled`` column per
+    capability and datetimes become ISO strings.
+    """
+    row = {}
+    for key, value in data.items():
+        if key == "capabilities" and isinstance(value, dict):
+            for name, enabled in value.items():
+                row[f"{name}_enabled"] = enabled
+        elif isinstance(value, (datetime, date)):
+            row[key] = value.isoformat()
+        else:
+            row[key] = value
+    return row
+
+def _open_text(path: Union[str, Path]) -> TextIO:
+    """Open a file for text writing, gzip-compressed if it ends in .gz."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def export_to_json(records: Iterable[Any], path: Union[str, Path]) -> int:
+    """
+    Export records to a JSON array, one record at a time.
+    
+    Args:
+        records: Records to export; may be a lazy iterator
+        path: Output file, gzip-compressed if it ends in .gz
+        
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with _open_text(path) as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(_to_dict(record), default=_json_default))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    logger.info(f"Exported {count} records to {path}")
+    return count
+
+def export_to_jsonl(records: Iterable[Any], path: Union[str, Path]) -> int:
+    """
+    Export records as JSON Lines, one JSON object per line.
+    
+    Args:
+        records: Records to export; may be a lazy iterator
+        path: Output file, gzip-compressed if it ends in .gz
+        
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with _open_text(path) as f:
+        for record in records:
+            f.write(json.dumps(_to_dict(record), default=_json_default))
+            f.write("\n")
+            count += 1
+    logger.info(f"Exported {count} records to {path}")
+    return count
+
+def export_to_csv(records: Iterable[Any], path: Union[str, Path],
+                  fieldnames: Optional[Sequence[str]] = None) -> int:
+    """
+    Export records to CSV, one row at a time.
+    
+    Args:
+        records: Records to export; may be a lazy iterator
+        path: Output file, gzip-compressed if it ends in .gz
+        fieldnames: Columns to write; PhoneNumber columns if None.
+            Fields not listed are dropped.
+            
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    with _open_text(path) as f:
+        writer = csv.DictWriter(
+            f, fieldnames=list(fieldnames or PHONE_NUMBER_FIELDS), extrasaction="ignore"
+        )
+        writer.writeheader()
+        for record in records:
+            writer.writerow(_flatten(_to_dict(record)))
+            count += 1
+    logger.info(f"Exported {count} records to {path}")
+    return count
+
+def _parquet_schema(fieldnames: Sequence[str]) -> "pyarrow.Schema":
+    """Build the Parquet schema of the given columns, see PARQUET_TYPES."""
+    return pyarrow.schema([
+        (name, pyarrow.type_for_alias(PARQUET_TYPES.get(name, "string")))
+        for name in fieldnames
+    ])
+
+def _to_parquet_row(row: Dict, schema: "pyarrow.Schema") -> Dict:
+    """Coerce a flattened record to the columns and types of a schema."""
+    converted = {}
+    for field in schema:
+        value = row.get(field.name)
+        if value is not None:
+            if pyarrow.types.is_string(field.type):
+                value = str(value)
+            elif pyarrow.types.is_floating(field.type):
+                value = float(value)
+            elif pyarrow.types.is_boolean(field.type):
+                value = bool(value)
+        converted[field.name] = value
+    return converted
+
+def export_to_parquet(records: Iterable[Any], path: Union[str, Path],
+                      batch_size: int = 10000,
+                      fieldnames: Optional[Sequence[str]] = None) -> int:
+    """
+    Export records to Parquet, one row group per batch.
+    
+    Args:
+        records: Records to export; may be a lazy iterator
+        path: Output file
+        batch_size: Records held in memory and written per row group
+        fieldnames: Columns to write, typed by PARQUET_TYPES. Fields not
+            listed are dropped and missing ones are null. If None, the
+            schema is inferred from the first batch, so later records
+            must have the same fields.
+        
+    Returns:
+        Number of records written
+    """
+    if pyarrow is None:
+        raise ValueError("Parquet export requires the 'pyarrow' package")
+    
+    schema = _parquet_schema(fieldnames) if fieldnames else None
+    iterator = iter(records)
+    count = 0
+    writer = None
+    try:
+        while True:
+            batch: List[Dict] = [_flatten(_to_dict(record)) for record in islice(iterator, batch_size)]
+            if not batch:
+                break
+            if schema is not None:
+                batch = [_to_parquet_row(row, schema) for row in batch]
+            if writer is None:
+                table = pyarrow.Table.from_pylist(batch, schema=schema)
+                writer = pyarrow.parquet.ParquetWriter(str(path), table.schema)
+            else:
+                table = pyarrow.Table.from_pylist(batch, schema=writer.schema)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if writer is None:
+        # No records: still leave a valid, empty file behind
+        empty = schema.empty_table() if schema is not None else pyarrow.table({})
+        pyarrow.parquet.write_table(empty, str(path))
+    logger.info(f"Exported {count} records to {path}")
+    return count
+
+def export_records(records: Iterable[Any], path: Union[str, Path],
+                   fieldnames: Optional[Sequence[str]] = None) -> int:
+    """
+    Export records in the format given by the file extension.
+    
+    Supported: .json, .jsonl, .csv and .parquet, with .json.gz, .jsonl.gz
+    and .csv.gz for gzip-compressed output.
+    
+    Args:
+        records: Records to export; may be a lazy iterator
+        path: Output file
+        fieldnames: CSV and Parquet columns, see export_to_csv and
+            export_to_parquet
+        
+    Returns:
+        Number of records written
+    """
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes[-1:] == [".gz"]:
+        suffixes = suffixes[:-1]
+    format_ = suffixes[-1] if suffixes else ""
+    if format_ == ".json":
+        return export_to_json(records, path)
+    if format_ == ".jsonl":
+        return export_to_jsonl(records, path)
+    if format_ == ".csv":
+        return export_to_csv(records, path, fieldnames)
+    if format_ == ".parquet":
+        return export_to_parquet(records, path, fieldnames=fieldnames)
+    raise ValueError(f"Unsupported export format: {path}")
@@ -0,0 +1,128 @@
+"""Query-space planner for country-wide number searches.
+
+Repeating one country-wide query keeps returning overlapping numbers. The
+planner splits a search into disjoint sub-queries, one per area code or
+region in COUNTRY_DATA, and weights them for the search engine's
+scheduler: equally (round-robin) or by each shard's historical yield, the
+unique numbers found per page requested, read from the search log.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..gateways.file_logger import FileLogger
+from ..gateways.search_engine import LOCATION_FILTERS, default_search_shards, shard_key
+
+logger = logging.getLogger(__name__)
+
+# Planning modes
+ROUND_ROBIN = "round_robin"
+WEIGHTED = "weighted"
+
+@dataclass
+class SearchPlan:
+    """Sub-queries of one logical search and their scheduling weights."""
+    shards: List[Dict[str, Any]]  # Disjoint query parameters, highest weight first
+    weights: List[float]  # Scheduling weight per shard
+    mode: str  # round_robin/weighted
+    known: int = 0  # Shards with search history
+    yields: Dict[str, float] = field(default_factory=dict)  # Shard key -> historical yield
+
+class QueryPlanner:
+    """Plans sharded searches from COUNTRY_DATA and search history."""
+
+    def __init__(self, file_logger: Optional[FileLogger] = None,
+                 mode: str = WEIGHTED, history_limit: int = 200,
+                 prior_pages: float = 2.0):
+        """Initialize the planner.
+
+        Args:
+            file_logger: Source of search history; without one every plan
+                is round-robin
+            mode: round_robin or weighted
+            history_limit: Most recent searches read per plan
+            prior_pages: Pages of average yield each shard is assumed to
+                have, so shards with little history are neither starved
+                nor over-trusted
+        """
+        if mode not in (ROUND_ROBIN, WEIGHTED):
+            raise ValueError(f"Unknown planning mode: {mode}")
+        self.file_logger = file_logger
+        self.mode = mode
+        self.history_limit = history_limit
+        self.prior_pages = prior_pages
+
+    def shard_history(self, country: str, type_: str) -> Dict[str, Dict[str, int]]:
+        """Total pages and unique numbers per shard from past searches.
+
+        Args:
+            country: ISO country code
+            type_: Number type
+
+        Returns:
+            Shard key -> {"pages", "unique"}
+        """
+        if not self.file_logger:
+            return {}
+        totals: Dict[str, Dict[str, int]] = {}
+        for entry in self.file_logger.get_search_history(limit=self.history_limit, country=country):
+            if entry.get("type") != type_:
+                continue
+            for key, stats in (entry.get("shards") or {}).items():
+                total = totals.setdefault(key, {"pages": 0, "unique": 0})
+                total["pages"] += stats.get("pages", 0)
+                total["unique"] += stats.get("unique", 0)
+        return totals
+
+    def plan(self, country: str, type_: str,
+             filters: Optional[Dict[str, Any]] = None,
+             shards: Optional[List[Dict[str, Any]]] = None) -> SearchPlan:
+        """Plan the sub-queries of a search.
+
+        Args:
+            country: ISO country code
+            type_: Number type
+            filters: Twilio query parameters of the search; a search
+                already pinned to a location is not sharded further
+            shards: Sub-queries to weight instead of the COUNTRY_DATA ones
+
+        Returns:
+            SearchPlan for HTTPGateway.search_stream
+        """
+        if shards is None:
+            located = bool(filters and LOCATION_FILTERS.intersection(filters))
+            shards = [{}] if located else default_search_shards(country)
+
+        if self.mode == ROUND_ROBIN or len(shards) < 2:
+            return SearchPlan(shards=list(shards), weights=[1.0] * len(shards), mode=ROUND_ROBIN)
+
+        try:
+            history = self.shard_history(country, type_)
+        except Exception as e:
+            logger.error(f"Failed to read search history for planning: {e}")
+            history = {}
+
+        pages = sum(stats["pages"] for stats in history.values())
+        if not pages:
+            return SearchPlan(shards=list(shards), weights=[1.0] * len(shards), mode=ROUND_ROBIN)
+        prior = sum(stats["unique"] for stats in history.values()) / pages
+
+        # Smoothed towards the average so one lucky or empty page counts little
+        yields: Dict[str, float] = {}
+        for shard in shards:
+            stats = history.get(shard_key(shard), {"pages": 0, "unique": 0})
+            yields[shard_key(shard)] = (
+                (stats["unique"] + prior * self.prior_pages) /
+                (stats["pages"] + self.prior_pages)
+            )
+
+        # Weights relative to the average, best shards scheduled first
+        ordered = sorted(shards, key=lambda shard: -yields[shard_key(shard)])
+        return SearchPlan(
+            shards=ordered,
+            weights=[yields[shard_key(shard)] / prior if prior else 1.0 for shard in ordered],
+            mode=WEIGHTED,
+            known=sum(1 for shard in shards if shard_key(shard) in history),
+            yields=yields
+        )
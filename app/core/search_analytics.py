@@ -0,0 +1,155 @@
+"""Yield statistics over the search log.
+
+Aggregates logged searches by query shape (country, number type, area
+code and UTC hour of day) so operators and the query planner can see which
+shapes find the most new numbers per second and per request.
+
+Area codes come from each search's per-shard stats, or from its AreaCode
+filter when it was not sharded. A search's latency and throttles are not
+tracked per shard, so they are split across its shards by pages fetched.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Dimensions searches can be grouped by
+DIMENSIONS = ("country", "type", "area_code", "hour")
+
+@dataclass
+class QueryShapeStats:
+    """Totals of the searches sharing one query shape."""
+    shape: Dict[str, Any]  # Dimension -> value, e.g. {"country": "US", "area_code": "415"}
+    searches: int = 0  # Searches (or shards of searches) aggregated
+    pages: int = 0  # Pages requested
+    results: int = 0  # Numbers returned
+    unique: int = 0  # Numbers new to their search
+    duplicates: int = 0  # Numbers returned again within their search
+    latency: float = 0.0  # Seconds spent searching
+    throttles: float = 0.0  # Throttled requests
+
+    @property
+    def unique_per_second(self) -> float:
+        """New numbers found per second of searching."""
+        return self.unique / self.latency if self.latency else 0.0
+
+    @property
+    def unique_per_page(self) -> float:
+        """New numbers found per page requested."""
+        return self.unique / self.pages if self.pages else 0.0
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Share of returned numbers that were duplicates."""
+        returned = self.unique + self.duplicates
+        return self.duplicates / returned if returned else 0.0
+
+@dataclass
+class _Row:
+    """One search, or one shard of a search, with its dimensions."""
+    shape: Dict[str, Any]
+    pages: int
+    results: int
+    unique: int
+    duplicates: int
+    latency: float
+    throttles: float
+
+def _hour(timestamp: Optional[str]) -> Optional[int]:
+    """Hour of day of an ISO timestamp."""
+    try:
+        return datetime.fromisoformat(timestamp).hour
+    except (TypeError, ValueError):
+        return None
+
+def _rows(entry: Dict[str, Any], by_area_code: bool) -> List[_Row]:
+    """Split a search log entry into rows, per shard if grouping by area code."""
+    base = {
+        "country": entry.get("country"),
+        "type": entry.get("type"),
+        "hour": _hour(entry.get("timestamp")),
+        "area_code": (entry.get("filters") or {}).get("AreaCode")
+    }
+    latency = float(entry.get("latency") or 0.0)
+    throttles = float(entry.get("throttles") or 0)
+    results = entry.get("results_count", 0)
+    unique = entry.get("unique_count", results)
+    duplicates = entry.get("duplicate_count", 0)
+    shards = entry.get("shards") or {}
+    pages = sum(stats.get("pages", 0) for stats in shards.values()) or entry.get("page_depth", 1)
+
+    if not by_area_code or not shards:
+        return [_Row(base, pages, results, unique, duplicates, latency, throttles)]
+
+    rows = []
+    for key, stats in shards.items():
+        params = dict(part.split("=", 1) for part in key.split("&") if "=" in part)
+        share = stats.get("pages", 0) / pages if pages else 0.0
+        rows.append(_Row(
+            {**base, "area_code": params.get("AreaCode", base["area_code"])},
+            pages=stats.get("pages", 0),
+            results=stats.get("results", 0),
+            unique=stats.get("unique", 0),
+            # Older entries lack per-shard duplicates; split them by pages
+            duplicates=stats.get("duplicates", round(duplicates * share)),
+            latency=latency * share,
+            throttles=throttles * share
+        ))
+    return rows
+
+def aggregate_searches(entries: Iterable[Dict[str, Any]],
+                       by: Sequence[str] = ("country", "type")) -> List[QueryShapeStats]:
+    """Aggregate search log entries by query shape.
+
+    Args:
+        entries: Entries from FileLogger.get_search_history
+        by: Dimensions to group by, from DIMENSIONS
+
+    Returns:
+        One QueryShapeStats per shape, in order of first appearance
+
+    Raises:
+        ValueError: If a dimension is unknown.
+    """
+    unknown = set(by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown search dimensions: {', '.join(sorted(unknown))}")
+
+    groups: Dict[Tuple, QueryShapeStats] = {}
+    for entry in entries:
+        if entry.get("operation", "search") != "search":
+            continue
+        for row in _rows(entry, "area_code" in by):
+            shape = {dimension: row.shape[dimension] for dimension in by}
+            stats = groups.setdefault(tuple(shape.values()), QueryShapeStats(shape=shape))
+            stats.searches += 1
+            stats.pages += row.pages
+            stats.results += row.results
+            stats.unique += row.unique
+            stats.duplicates += row.duplicates
+            stats.latency += row.latency
+            stats.throttles += row.throttles
+    return list(groups.values())
+
+def rank_shapes(stats: Iterable[QueryShapeStats], metric: str = "unique_per_second",
+                limit: int = 5, min_searches: int = 1) -> Tuple[List[QueryShapeStats], List[QueryShapeStats]]:
+    """Get the best and worst performing query shapes.
+
+    Args:
+        stats: Aggregated shapes
+        metric: QueryShapeStats attribute to rank by
+        limit: Shapes returned at each end
+        min_searches: Searches a shape needs to be ranked at all
+
+    Returns:
+        (top, bottom): best first, and worst first
+    """
+    ranked = sorted(
+        (shape for shape in stats if shape.searches >= min_searches),
+        key=lambda shape: getattr(shape, metric),
+        reverse=True
+    )
+    top = ranked[:limit]
+    # Shapes already in the top are not repeated when there are few
+    bottom = ranked[len(top):][::-1][:limit]
+    return top, bottom
@@ -0,0 +1,239 @@
+"""Search session engine for available-number searches.
+
+A session collects the numbers of one logical search as batches arrive,
+keeping the first ``max_numbers`` unique ones. Every batch is scored by its
+yield, the share of returned numbers not seen before; once the recent
+yield drops below ``min_yield``, or ``empty_limit`` batches in a row add
+nothing, the pool behind the current query is treated as saturated. The
+session then moves on to the next query strategy (e.g. sharding per area
+code, then per region) or, with none left, asks the caller to stop.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..gateways.search_engine import AREA_CODE_COUNTRIES
+from ..models.country_data import COUNTRY_DATA
+
+# Query strategies in the order a saturated search falls back through them
+AREA_CODE = "area_code"
+REGION = "region"
+
+@dataclass
+class BatchStats:
+    """Yield of a single search batch."""
+    batch: int  # 1-based batch number within the session
+    strategy: Optional[str]  # Query strategy the batch was fetched with
+    returned: int  # Numbers in the batch
+    unique: int  # Numbers not seen before and kept
+    duplicates: int  # Numbers already seen or over the limit
+    saturation: float  # Recent share of duplicates, 0.0-1.0
+
+    @property
+    def yield_rate(self) -> float:
+        """Share of the batch that was new."""
+        return self.unique / self.returned if self.returned else 0.0
+
+@dataclass
+class StrategySwitch:
+    """Record of the session moving to another query strategy."""
+    batch: int  # Batch after which the switch happened
+    from_strategy: Optional[str]  # Strategy that saturated
+    to_strategy: str  # Strategy searched next
+    saturation: float  # Saturation that triggered the switch
+
+class SearchSession:
+    """Deduplicates search results and decides when a search is exhausted."""
+
+    def __init__(self, max_numbers: int = 500, empty_limit: int = 3,
+                 min_yield: float = 0.1, window: int = 3,
+                 strategies: Sequence[str] = ()):
+        """Initialize the session.
+
+        Args:
+            max_numbers: Unique numbers kept before the search is complete
+            empty_limit: Consecutive batches of only duplicates that
+                saturate the current strategy; without strategies, batches
+                with no results count too
+            min_yield: Recent yield below which the current strategy is
+                saturated
+            window: Batches the recent yield is measured over
+            strategies: Query strategies to try in order; the session
+                starts with the first and stops after the last saturates
+        """
+        self.max_numbers = max_numbers
+        self.empty_limit = empty_limit
+        self.min_yield = min_yield
+        self.window = window
+        self.strategies = list(strategies)
+        self.switches: List[StrategySwitch] = []
+        self.batches: List[BatchStats] = []
+        self.stop_reason: Optional[str] = None
+        self._numbers: Dict[str, object] = {}
+        self._strategy_index = 0
+        self._empty_streak = 0
+        self._recent: Deque[Tuple[int, int]] = deque(maxlen=window)
+
+    @property
+    def strategy(self) -> Optional[str]:
+        """Query strategy the caller should search with now."""
+        if self._strategy_index < len(self.strategies):
+            return self.strategies[self._strategy_index]
+        return None
+
+    @property
+    def total_batches(self) -> int:
+        """Batches added so far."""
+        return len(self.batches)
+
+    @property
+    def total_numbers(self) -> int:
+        """Unique numbers kept so far."""
+        return len(self._numbers)
+
+    @property
+    def empty_streak(self) -> int:
+        """Consecutive batches of only duplicates under the current strategy."""
+        return self._empty_streak
+
+    @property
+    def saturation(self) -> float:
+        """Share of duplicates over the recent batches; 0.0 before any results."""
+        returned = sum(count for count, _ in self._recent)
+        if not returned:
+            return 0.0
+        return 1.0 - sum(unique for _, unique in self._recent) / returned
+
+    def add_number(self, number) -> bool:
+        """Keep a number unless it is a duplicate or the session is full.
+
+        Args:
+            number: Any record with a ``number`` attribute
+
+        Returns:
+            True if the number was new and kept
+        """
+        if number.number in self._numbers or self.is_full():
+            return False
+        self._numbers[number.number] = number
+        return True
+
+    def add_batch(self, numbers: Iterable) -> BatchStats:
+        """Add a batch of search results and update the saturation estimate.
+
+        May advance ``strategy`` or set ``stop_reason``; callers check
+        both after every batch.
+
+        Args:
+            numbers: Records with a ``number`` attribute
+
+        Returns:
+            Yield statistics of the batch
+        """
+        numbers = list(numbers)
+        unique = sum(1 for number in numbers if self.add_number(number))
+        if numbers:
+            self._recent.append((len(numbers), unique))
+            self._empty_streak = 0 if unique else self._empty_streak + 1
+        elif self.strategy is None:
+            # A single query running dry is exhausted
+            self._empty_streak += 1
+        # Under a strategy an empty batch is a shard with no inventory, which
+        # says nothing about whether the pool is saturated
+
+        stats = BatchStats(
+            batch=len(self.batches) + 1,
+            strategy=self.strategy,
+            returned=len(numbers),
+            unique=unique,
+            duplicates=len(numbers) - unique,
+            saturation=self.saturation
+        )
+        self.batches.append(stats)
+
+        if self.is_full():
+            self.stop_reason = "limit"
+        elif self.is_saturated():
+            self.finish_strategy()
+        return stats
+
+    def is_full(self) -> bool:
+        """Check whether max_numbers unique numbers were found."""
+        return len(self._numbers) >= self.max_numbers
+
+    def is_saturated(self) -> bool:
+        """Check whether the current strategy has stopped finding new numbers."""
+        if self._empty_streak >= self.empty_limit:
+            return True
+        if len(self._recent) < self.window:
+            return False
+        return 1.0 - self.saturation < self.min_yield
+
+    def should_stop(self) -> bool:
+        """Check whether the search should stop."""
+        return self.stop_reason is not None
+
+    def get_numbers(self) -> List:
+        """Get the unique numbers in the order they were found."""
+        return list(self._numbers.values())
+
+    def finish_strategy(self) -> None:
+        """Move to the next strategy, or stop if there is none.
+
+        Called on saturation, and by callers whose query ran out of pages.
+        """
+        if self._strategy_index + 1 >= len(self.strategies):
+            self.stop_reason = self.stop_reason or "saturated"
+            return
+        self._strategy_index += 1
+        self.switches.append(StrategySwitch(
+            batch=self.total_batches,
+            from_strategy=self.strategies[self._strategy_index - 1],
+            to_strategy=self.strategy,
+            saturation=self.saturation
+        ))
+        # The new query's pool is judged on its own batches
+        self._empty_streak = 0
+        self._recent.clear()
+
+def search_strategies(country: str, locality: Optional[Dict] = None) -> List[str]:
+    """Get the query strategies that apply to a search.
+
+    A search already pinned to a location has a single pool to exhaust;
+    country-wide searches can be split per area code and per region.
+
+    Args:
+        country: ISO country code
+        locality: Location filters of the search
+
+    Returns:
+        Strategies to pass to SearchSession, in order
+    """
+    if any(locality.values() if locality else ()) or country not in COUNTRY_DATA:
+        return []
+    strategies = [AREA_CODE] if country in AREA_CODE_COUNTRIES else []
+    regions = COUNTRY_DATA[country]["regions"].values()
+    if any(details["code"] and not str(details["code"]).isdigit() for details in regions):
+        strategies.append(REGION)
+    return strategies
+
+def strategy_filters(strategy: Optional[str], country: str) -> Dict[str, Any]:
+    """Get the search filters that express a strategy.
+
+    Args:
+        strategy: Strategy from search_strategies, or None
+        country: ISO country code
+
+    Returns:
+        Filters for NumberService.stream_available; empty for None
+    """
+    regions = COUNTRY_DATA.get(country, {}).get("regions", {}).values()
+    if strategy == AREA_CODE:
+        return {"area_code": sorted({code for details in regions for code in details["area_codes"]})}
+    if strategy == REGION:
+        return {"region": [
+            details["code"] for details in regions
+            if details["code"] and not str(details["code"]).isdigit()
+        ]}
+    return {}
@@ -0,0 +1,114 @@
+"""Vectorized usage analytics over daily, per-category usage records.
+
+Records are laid out as day x category matrices of usage and cost, so
+rollups, moving averages and projections are whole-array NumPy
+operations instead of Python loops over records.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Twilio rollup category holding each day's total cost across categories
+TOTAL_CATEGORY = "totalprice"
+
+@dataclass
+class UsageMatrix:
+    """Daily usage and cost per category."""
+    days: List[date]  # One entry per row, consecutive and oldest first
+    categories: List[str]  # One entry per column, sorted
+    usage: np.ndarray  # days x categories usage quantities
+    cost: np.ndarray  # days x categories cost in USD
+    units: Dict[str, str]  # Category -> usage unit
+
+    def column(self, category: str, values: str = "usage") -> np.ndarray:
+        """Get one category's daily usage or cost; zeros if it has no records."""
+        if category not in self.categories:
+            return np.zeros(len(self.days))
+        return getattr(self, values)[:, self.categories.index(category)]
+
+    def daily_cost(self) -> np.ndarray:
+        """Total cost per day.
+
+        Uses Twilio's total rollup category when present; summing every
+        category would count sub-categories twice.
+        """
+        if TOTAL_CATEGORY in self.categories:
+            return self.column(TOTAL_CATEGORY, "cost")
+        return self.cost.sum(axis=1)
+
+def build_matrix(records: Iterable[Dict], start: date, end: date) -> UsageMatrix:
+    """Lay out usage records as day x category matrices.
+
+    Args:
+        records: Dicts with day, category, usage, units and cost
+        start: First day, inclusive
+        end: Last day, inclusive; days without records are zero
+    """
+    records = list(records)
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    categories = sorted({record["category"] for record in records})
+    column = {category: index for index, category in enumerate(categories)}
+
+    rows = np.array([(record["day"] - start).days for record in records], dtype=np.intp)
+    cols = np.array([column[record["category"]] for record in records], dtype=np.intp)
+    usage = np.zeros((len(days), len(categories)))
+    cost = np.zeros((len(days), len(categories)))
+    np.add.at(usage, (rows, cols), [record["usage"] for record in records])
+    np.add.at(cost, (rows, cols), [record["cost"] for record in records])
+
+    units = {record["category"]: record["units"] for record in records}
+    return UsageMatrix(days=days, categories=categories, usage=usage, cost=cost, units=units)
+
+def rollup(matrix: UsageMatrix) -> Dict[str, Dict]:
+    """Total usage and cost per category over the whole range."""
+    usage = matrix.usage.sum(axis=0)
+    cost = matrix.cost.sum(axis=0)
+    return {
+        category: {
+            "usage": float(usage[index]),
+            "units": matrix.units.get(category),
+            "cost": float(cost[index])
+        }
+        for index, category in enumerate(matrix.categories)
+    }
+
+def moving_average(values: np.ndarray, window: int = 7) -> np.ndarray:
+    """Trailing moving average; the first days average what is available."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+    sums = np.cumsum(np.insert(values, 0, 0.0))
+    ends = np.arange(1, values.size + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+def project_cost(daily_cost: np.ndarray, horizon: int = 30,
+                 half_life: float = 7.0) -> float:
+    """Project the cost of the next ``horizon`` days from recent trend.
+
+    Fits a linear trend to the daily costs by weighted least squares, with
+    weights halving every ``half_life`` days into the past, and sums the
+    fitted line over the coming days. Recent days dominate, so a rising or
+    falling spend shows up in the projection instead of being averaged
+    away. Projected days never go below zero.
+
+    Args:
+        daily_cost: Cost per day, oldest first
+        horizon: Days to project
+        half_life: Age in days at which a day's weight halves
+    """
+    daily_cost = np.asarray(daily_cost, dtype=float)
+    if daily_cost.size == 0:
+        return 0.0
+    if daily_cost.size == 1:
+        return float(max(daily_cost[0], 0.0) * horizon)
+
+    x = np.arange(daily_cost.size, dtype=float)
+    age = x[-1] - x
+    weights = 0.5 ** (age / half_life)
+    slope, intercept = np.polyfit(x, daily_cost, 1, w=np.sqrt(weights))
+    future = np.arange(daily_cost.size, daily_cost.size + horizon, dtype=float)
+    return float(np.clip(intercept + slope * future, 0.0, None).sum())
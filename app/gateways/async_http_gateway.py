@@ -0,0 +1,362 @@
+"""Native asyncio gateway for the Twilio REST API.
+
+Drop-in async alternative to HTTPGateway and the REST operations of
+TwilioGateway. All requests share one pooled aiohttp session, so calls made
+from the Textual event loop never block it and can overlap.
+"""
+
+import base64
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+from twilio.base.exceptions import TwilioRestException
+
+from .config import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN
+from .rate_limiter import (
+    ACCOUNT, CALLS, MESSAGES, PURCHASE, SEARCH, RateLimiter, get_rate_limiter, parse_retry_after
+)
+from .retry import Retrier
+from .search_engine import (
+    LOCATION_FILTERS, SearchEngine, build_search_params, default_search_shards
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TWIML_URL = "http://demo.twilio.com/docs/voice.xml"
+
+class AsyncHTTPGateway:
+    BASE_URL = "https://api.twilio.com/2010-04-01"
+    API_HOST = "https://api.twilio.com"
+
+    def __init__(self, pool_size: int = 10, timeout: float = 30.0,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retrier: Optional[Retrier] = None):
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retrier = retrier or Retrier()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncHTTPGateway":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it inside the running loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "Accept": "application/json",
+                    "Authorization": self._basic_auth()
+                }
+            )
+        return self._session
+
+    @staticmethod
+    def _basic_auth() -> str:
+        """Build the Basic authorization header for the account."""
+        credentials = f"{TWILIO_ACCOUNT_SID}:{TWILIO_AUTH_TOKEN}".encode()
+        return f"Basic {base64.b64encode(credentials).decode()}"
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _account_url(self, path: str) -> str:
+        """Build a URL under the configured account."""
+        return f"{self.BASE_URL}/Accounts/{TWILIO_ACCOUNT_SID}/{path}"
+
+    @staticmethod
+    def _form(values: Dict[str, Any]) -> Dict[str, str]:
+        """Convert parameters to the string values aiohttp sends."""
+        form = {}
+        for key, value in values.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            form[key] = str(value)
+        return form
+
+    @staticmethod
+    def _to_twilio_params(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert snake_case config keys to Twilio's PascalCase parameters."""
+        return {
+            "".join(part.capitalize() for part in key.split("_")): value
+            for key, value in config.items()
+        }
+
+    async def _request(self, method: str, url: str, endpoint: str,
+                       params: Optional[Dict] = None,
+                       data: Optional[Dict] = None,
+                       idempotent: Optional[bool] = None,
+                       reconcile: Optional[Callable[[], Awaitable[Any]]] = None,
+                       operation: Optional[str] = None) -> Dict:
+        """
+        Send a request with retries and decode the JSON response.
+        GET and DELETE requests are retried as idempotent unless told
+        otherwise; see Retrier for the rules applied to other requests.
+        """
+        # Twilio returns paging URLs relative to the API host
+        if url.startswith("/"):
+            url = f"{self.API_HOST}{url}"
+
+        return await self.retrier.call_async(
+            operation or f"{method} {endpoint}",
+            lambda: self._send(method, url, endpoint, params, data),
+            idempotent=method in ("GET", "DELETE") if idempotent is None else idempotent,
+            reconcile=reconcile
+        )
+
+    async def _send(self, method: str, url: str, endpoint: str,
+                    params: Optional[Dict], data: Optional[Dict]) -> Dict:
+        """
+        Send a single request attempt.
+        Waits for a token of the endpoint class first and reports the
+        response status back to the rate limiter. Error responses are raised
+        as TwilioRestException, matching the errors raised by the twilio
+        client in TwilioGateway.
+        """
+        await self.rate_limiter.acquire_async(endpoint)
+        session = self._get_session()
+        async with session.request(
+            method,
+            url,
+            params=self._form(params) if params else None,
+            data=self._form(data) if data else None
+        ) as response:
+            self.rate_limiter.on_response(
+                endpoint,
+                response.status,
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+            if response.status == 204:
+                return {}
+
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                payload = {"message": await response.text()}
+
+            if response.status >= 400:
+                raise TwilioRestException(
+                    response.status,
+                    url,
+                    msg=payload.get("message"),
+                    code=payload.get("code"),
+                    method=method
+                )
+            return payload
+
+    @staticmethod
+    def _to_page(data: Dict) -> Dict:
+        """Normalize an AvailablePhoneNumbers response to a page dict."""
+        numbers = data.get("available_phone_numbers", [])
+        logger.debug(f"Retrieved {len(numbers)} numbers")
+        return {
+            "numbers": numbers,
+            "next_page_url": data.get("next_page_url"),
+            "uri": data.get("uri")
+        }
+
+    async def search_batch(self, country: str, type_: str,
+                           capabilities: Optional[Dict] = None,
+                           page_size: int = 50,
+                           page_token: Optional[str] = None,
+                           filters: Optional[Dict] = None) -> Dict:
+        """
+        Search for available phone numbers.
+        Supports pagination and capability filtering.
+        """
+        try:
+            params = build_search_params(capabilities, page_size, filters)
+            if page_token:
+                params["PageToken"] = page_token
+
+            data = await self._request(
+                "GET",
+                self._account_url(f"AvailablePhoneNumbers/{country}/{type_}.json"),
+                SEARCH,
+                params=params,
+                operation="search_batch"
+            )
+            return self._to_page(data)
+
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"HTTP request failed during number search: {e}")
+            raise
+
+    async def fetch_page(self, page_url: str) -> Dict:
+        """
+        Fetch a follow-up page using the next_page_url of a previous result.
+        """
+        try:
+            return self._to_page(await self._request(
+                "GET", page_url, SEARCH, operation="fetch_page"
+            ))
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"HTTP request failed while fetching {page_url}: {e}")
+            raise
+
+    async def search_stream(self, country: str, type_: str,
+                            capabilities: Optional[Dict] = None,
+                            page_size: int = 50,
+                            filters: Optional[Dict] = None,
+                            shards: Optional[List[Dict]] = None,
+                            concurrency: int = 4,
+                            max_pages_per_shard: Optional[int] = None,
+                            weights: Optional[List[float]] = None,
+                            errors: Optional[List[Dict]] = None) -> AsyncIterator[Dict]:
+        """
+        Stream result pages of a sharded, multi-page search.
+        Same contract as HTTPGateway.search_stream, with every shard fetched
+        over the shared connection pool.
+        """
+        async def fetch(shard: Dict, page_url: Optional[str]) -> Dict:
+            if page_url:
+                return await self.fetch_page(page_url)
+            return await self.search_batch(
+                country,
+                type_,
+                capabilities=capabilities,
+                page_size=page_size,
+                filters={**(filters or {}), **shard}
+            )
+
+        engine = SearchEngine(
+            fetch,
+            concurrency=concurrency,
+            max_pages_per_shard=max_pages_per_shard,
+            errors=errors
+        )
+        if shards is None:
+            located = bool(filters and LOCATION_FILTERS.intersection(filters))
+            shards = [{}] if located else default_search_shards(country)
+
+        async for page in engine.stream(shards, weights):
+            yield page
+
+    async def find_owned_number(self, phone_number: str) -> Optional[Dict]:
+        """Find a number already on the account; the purchase idempotency check."""
+        data = await self._request(
+            "GET",
+            self._account_url("IncomingPhoneNumbers.json"),
+            ACCOUNT,
+            params={"PhoneNumber": phone_number, "PageSize": 1},
+            operation="find_owned_number"
+        )
+        owned = data.get("incoming_phone_numbers", [])
+        return owned[0] if owned else None
+
+    async def purchase_number(self, phone_number: str) -> Optional[str]:
+        """Purchase a phone number, returns SID if successful."""
+        try:
+            number = await self._request(
+                "POST",
+                self._account_url("IncomingPhoneNumbers.json"),
+                PURCHASE,
+                data={"PhoneNumber": phone_number},
+                # The phone number is the idempotency key: before retrying an
+                # ambiguous failure, check whether the purchase went through
+                reconcile=lambda: self.find_owned_number(phone_number),
+                operation="purchase_number"
+            )
+            logger.info(f"Successfully purchased number: {phone_number}")
+            return number.get("sid")
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to purchase number {phone_number}: {e}")
+            raise
+
+    async def release_number(self, sid: str) -> bool:
+        """Release a phone number by SID."""
+        url = self._account_url(f"IncomingPhoneNumbers/{sid}.json")
+        attempts = 0
+
+        async def release() -> Dict:
+            nonlocal attempts
+            attempts += 1
+            try:
+                return await self._send("DELETE", url, PURCHASE, None, None)
+            except TwilioRestException as e:
+                # A retry after a lost success response finds the number gone
+                if e.status == 404 and attempts > 1:
+                    logger.info(f"Number {sid} already released by an earlier attempt")
+                    return {}
+                raise
+
+        try:
+            await self.retrier.call_async("release_number", release, idempotent=True)
+            logger.info(f"Successfully released number with SID: {sid}")
+            return True
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to release number {sid}: {e}")
+            raise
+
+    async def get_number(self, sid: str) -> Dict:
+        """Fetch the full resource of an incoming phone number."""
+        try:
+            return await self._request(
+                "GET",
+                self._account_url(f"IncomingPhoneNumbers/{sid}.json"),
+                ACCOUNT,
+                operation="get_number"
+            )
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to fetch number {sid}: {e}")
+            raise
+
+    async def update_number_config(self, sid: str, config: Dict) -> bool:
+        """Update phone number configuration."""
+        try:
+            await self._request(
+                "POST",
+                self._account_url(f"IncomingPhoneNumbers/{sid}.json"),
+                PURCHASE,
+                data=self._to_twilio_params(config),
+                idempotent=True,
+                operation="update_number_config"
+            )
+            logger.info(f"Successfully updated config for number {sid}")
+            return True
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to update number config {sid}: {e}")
+            raise
+
+    async def make_call(self, from_: str, to: str) -> str:
+        """Initiate a call, returns call SID."""
+        try:
+            call = await self._request(
+                "POST",
+                self._account_url("Calls.json"),
+                CALLS,
+                data={"To": to, "From": from_, "Url": DEFAULT_TWIML_URL},
+                operation="make_call"
+            )
+            logger.info(f"Successfully initiated call from {from_} to {to}")
+            return call["sid"]
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to make call from {from_} to {to}: {e}")
+            raise
+
+    async def send_sms(self, from_: str, to: str, body: str) -> str:
+        """Send SMS message, returns message SID."""
+        try:
+            message = await self._request(
+                "POST",
+                self._account_url("Messages.json"),
+                MESSAGES,
+                data={"To": to, "From": from_, "Body": body},
+                operation="send_sms"
+            )
+            logger.info(f"Successfully sent SMS from {from_} to {to}")
+            return message["sid"]
+        except (aiohttp.ClientError, TwilioRestException) as e:
+            logger.error(f"Failed to send SMS from {from_} to {to}: {e}")
+            raise
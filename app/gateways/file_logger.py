@@ -1,58 +1,653 @@
-"""File-based logging gateway for operation tracking and debugging."""
+"""File-based logging gateway for operation tracking and debugging.
 
+Entries are stored as JSON Lines: one JSON object per line, appended with a
+single ``O_APPEND`` write so that logging cost does not depend on how much
+history has already been recorded.
+
+In background mode entries are handed to a writer thread through a queue and
+written in batches, so callers never wait on disk I/O.
+
+With a RotationPolicy the live file is rolled over by size or age into
+timestamped, optionally compressed segments that the readers query
+transparently.
+"""
+
+import atexit
+import functools
+import gzip
 import json
 import logging
-from datetime import datetime
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Iterator, Optional, List, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for zstd archives
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# Block size used when scanning log files backwards from the end
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Queue marker asking the writer thread to write its pending batch now
+_FLUSH = object()
+
+# File suffixes for each supported archive compression
+_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+def _close_at_exit(ref: "weakref.ReferenceType[FileLogger]") -> None:
+    """Close a background FileLogger at exit, unless it was collected."""
+    file_logger = ref()
+    if file_logger is not None:
+        file_logger.close()
+
+@dataclass
+class RotationPolicy:
+    """Rotation settings for a FileLogger history file."""
+    max_bytes: Optional[int] = None  # Rotate before the live file exceeds this size
+    max_age_days: Optional[int] = None  # Rotate once the live file spans this many days
+    compression: Optional[str] = "gzip"  # Archive compression: gzip, zstd or None
+    backup_count: Optional[int] = None  # Archived segments to keep (None keeps all)
+
 class FileLogger:
-    """JSON file-based logger for tracking operations and debugging."""
+    """JSON Lines file-based logger for tracking operations and debugging."""
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self, log_dir: str = "logs", background: bool = False,
+                 batch_size: int = 100, flush_interval: float = 0.5,
+                 rotation: Optional[Union[RotationPolicy, Dict[str, RotationPolicy]]] = None):
         """Initialize the file logger.
         
         Args:
             log_dir: Directory to store log files. Created if doesn't exist.
+            background: Write entries from a background thread instead of
+                the calling thread
+            batch_size: Maximum number of queued entries written per batch
+                in background mode
+            flush_interval: Maximum seconds an entry waits in the queue
+                before its batch is written in background mode
+            rotation: Rotation policy applied to every history file, or a
+                mapping of log name ("operations", "searches", "debug") to
+                its policy. No rotation when omitted.
+                
+        Raises:
+            ValueError: If a policy requests an unsupported compression.
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         
         # Initialize log files
-        self.operation_log = self.log_dir / "operations.json"
-        self.search_log = self.log_dir / "searches.json"
-        self.debug_log = self.log_dir / "debug.json"
+        self.operation_log = self.log_dir / "operations.jsonl"
+        self.search_log = self.log_dir / "searches.jsonl"
+        self.debug_log = self.log_dir / "debug.jsonl"
+        
+        self._open_storage()
         
-        # Create files if they don't exist
+        # Rotation state
+        self._rotation = self._resolve_rotation(rotation)
+        self._rotation_lock = threading.Lock()
+        self._segment_started: Dict[Path, date] = {}
+        
+        # Background writer state
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: Optional[queue.Queue] = None
+        self._queue_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._exit_hook = None
+        if background:
+            self._start_writer()
+
+    def _open_storage(self) -> None:
+        """Prepare the history files, migrating legacy JSON arrays."""
         for log_file in [self.operation_log, self.search_log, self.debug_log]:
-            if not log_file.exists():
-                log_file.write_text("[]")
+            self._migrate_legacy_log(log_file)
+            log_file.touch(exist_ok=True)
+
+    def _resolve_rotation(self, rotation) -> Dict[Path, RotationPolicy]:
+        """Map each history file to its rotation policy.
+        
+        Args:
+            rotation: A single policy or a mapping of log name to policy
+            
+        Returns:
+            Dictionary mapping log file paths to their policies
+            
+        Raises:
+            ValueError: If a policy requests an unsupported compression.
+        """
+        log_files = [self.operation_log, self.search_log, self.debug_log]
+        if rotation is None:
+            return {}
+        if isinstance(rotation, RotationPolicy):
+            policies = {log_file: rotation for log_file in log_files}
+        else:
+            policies = {
+                log_file: rotation[log_file.stem]
+                for log_file in log_files if log_file.stem in rotation
+            }
+        
+        for policy in policies.values():
+            if policy.compression not in (None, *_COMPRESSION_SUFFIXES):
+                raise ValueError(f"Unsupported log compression: {policy.compression}")
+            if policy.compression == "zstd" and zstandard is None:
+                raise ValueError("zstd log compression requires the 'zstandard' package")
+        
+        return policies
+
+    def _start_writer(self) -> None:
+        """Start the background writer thread and register the exit flush."""
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            args=(self._queue,),
+            name="FileLoggerWriter",
+            daemon=True
+        )
+        self._writer.start()
+        # Registered through a weak reference so atexit does not keep the
+        # logger alive once its writer is closed
+        self._exit_hook = functools.partial(_close_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
+
+    def _writer_loop(self, pending: queue.Queue) -> None:
+        """Drain the queue in batches until the stop sentinel is received.
+        
+        A single thread writes entries in the order they were queued, so
+        per-file ordering is the same as in synchronous mode.
+        
+        Args:
+            pending: Queue of this writer; close() detaches it from the
+                logger before the writer has drained it
+        """
+        stopping = False
+        while not stopping:
+            item = pending.get()
+            if item is None:
+                pending.task_done()
+                break
+            if item is _FLUSH:
+                pending.task_done()
+                continue
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = pending.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None or item is _FLUSH:
+                    stopping = item is None
+                    pending.task_done()
+                    break
+                batch.append(item)
+            
+            self._write_batch(batch)
+            for _ in batch:
+                pending.task_done()
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """Write a batch of queued entries, grouped per file.
+        
+        Args:
+            batch: List of (log_file, entry) tuples in queue order
+        """
+        by_file: Dict[Path, List[Dict[str, Any]]] = {}
+        for log_file, entry in batch:
+            by_file.setdefault(log_file, []).append(entry)
+        
+        for log_file, entries in by_file.items():
+            self._write_entries(log_file, entries)
+
+    def flush(self) -> None:
+        """Block until every queued entry has been written to disk."""
+        with self._queue_lock:
+            pending = self._queue
+            if pending is None or not self._writer.is_alive():
+                return
+            pending.put(_FLUSH)
+        pending.join()
+
+    def close(self) -> None:
+        """Flush pending entries and stop the background writer.
+        
+        Safe to call more than once; later log calls are written
+        synchronously.
+        """
+        with self._queue_lock:
+            if self._writer is None:
+                return
+            # Entries logged from now on bypass the queue, so none can be
+            # queued behind the stop sentinel and lost
+            writer, self._writer = self._writer, None
+            pending, self._queue = self._queue, None
+            pending.put(None)
+        
+        if writer.is_alive():
+            writer.join()
+        atexit.unregister(self._exit_hook)
+        self._exit_hook = None
+
+    def _migrate_legacy_log(self, log_file: Path) -> None:
+        """Convert a legacy JSON array log into JSON Lines, once.
+        
+        Older versions stored each log as a single JSON array in a ``.json``
+        file next to the new ``.jsonl`` file. Legacy entries are written
+        ahead of any lines already in the ``.jsonl`` file so chronological
+        order is preserved, then the legacy file is renamed to
+        ``*.json.migrated`` so the migration never runs twice.
+        
+        Args:
+            log_file: Path to the JSON Lines log file
+        """
+        legacy_file = log_file.with_suffix(".json")
+        if not legacy_file.exists():
+            return
+        
+        try:
+            with legacy_file.open('r') as f:
+                entries = json.load(f)
+            
+            tmp_file = log_file.with_suffix(".jsonl.tmp")
+            with tmp_file.open('w') as out:
+                for entry in entries:
+                    out.write(self._encode_entry(entry))
+                if log_file.exists():
+                    with log_file.open('r') as current:
+                        for line in current:
+                            out.write(line)
+            
+            os.replace(tmp_file, log_file)
+            legacy_file.rename(legacy_file.with_suffix(".json.migrated"))
+            logger.info(f"Migrated {len(entries)} entries from {legacy_file} to {log_file}")
+            
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy log file {legacy_file}: {e}")
+
+    @staticmethod
+    def _encode_entry(entry: Dict[str, Any]) -> str:
+        """Serialize an entry as a single JSON Lines record.
+        
+        Args:
+            entry: Dictionary containing the log entry
+            
+        Returns:
+            Compact JSON representation terminated by a newline
+        """
+        return json.dumps(entry, separators=(",", ":"), default=str) + "\n"
 
     def _append_to_log(self, log_file: Path, entry: Dict[str, Any]) -> None:
-        """Append a new entry to a JSON log file.
+        """Append a new entry to a log.
+        
+        In background mode a copy of the entry is queued for the writer
+        thread; otherwise it is written immediately.
         
         Args:
             log_file: Path to the log file
             entry: Dictionary containing the log entry
         """
+        entry["timestamp"] = datetime.utcnow().isoformat()
+        
+        if self._queue is not None:
+            try:
+                # Copied as stored, so changes the caller makes to the entry
+                # while it waits in the queue are not written
+                entry = json.loads(self._encode_entry(entry))
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to encode entry for log file {log_file}: {e}")
+                return
+        
+        with self._queue_lock:
+            if self._queue is not None:
+                self._queue.put((log_file, entry))
+                return
+        self._write_entries(log_file, [entry])
+
+    def _write_entries(self, log_file: Path, entries: List[Dict[str, Any]]) -> None:
+        """Persist entries to storage in order.
+        
+        Args:
+            log_file: Path to the log file
+            entries: Log entries to write
+        """
         try:
-            # Read existing logs
-            with log_file.open('r') as f:
-                logs = json.load(f)
-            
-            # Add timestamp and append
-            entry["timestamp"] = datetime.utcnow().isoformat()
-            logs.append(entry)
+            data = "".join(self._encode_entry(entry) for entry in entries)
+        except Exception as e:
+            logger.error(f"Failed to encode entries for log file {log_file}: {e}")
+            return
+        
+        self._write_lines(log_file, data.encode("utf-8"))
+
+    def _write_lines(self, log_file: Path, data: bytes) -> None:
+        """Append encoded JSON Lines records to a log file.
+        
+        Records are written on a descriptor opened with ``O_APPEND``, so
+        concurrent writers never interleave partial lines and existing
+        history is never read or rewritten.
+        
+        Args:
+            log_file: Path to the log file
+            data: One or more newline-terminated records
+        """
+        try:
+            policy = self._rotation.get(log_file)
+            if policy is None:
+                self._append_bytes(log_file, data)
+                return
             
-            # Write back to file
-            with log_file.open('w') as f:
-                json.dump(logs, f, indent=2)
+            # Rotation and the write must not interleave with other writers
+            with self._rotation_lock:
+                self._maybe_rotate(log_file, policy, len(data))
+                self._append_bytes(log_file, data)
                 
         except Exception as e:
             logger.error(f"Failed to write to log file {log_file}: {e}")
 
+    @staticmethod
+    def _append_bytes(log_file: Path, data: bytes) -> None:
+        """Append raw bytes to a file opened with ``O_APPEND``.
+        
+        Args:
+            log_file: Path to the log file
+            data: Bytes to append
+        """
+        fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+
+    def _maybe_rotate(self, log_file: Path, policy: RotationPolicy,
+                      incoming: int) -> None:
+        """Rotate the live file if the next write would break its policy.
+        
+        Args:
+            log_file: Path to the live log file
+            policy: Rotation policy for the file
+            incoming: Size in bytes of the records about to be written
+        """
+        today = datetime.utcnow().date()
+        try:
+            size = log_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        
+        if size == 0:
+            self._segment_started[log_file] = today
+            return
+        
+        if policy.max_bytes is not None and size + incoming > policy.max_bytes:
+            self._rotate(log_file, policy)
+        elif policy.max_age_days is not None:
+            started = self._segment_started.get(log_file) or self._first_entry_date(log_file)
+            self._segment_started[log_file] = started
+            if (today - started).days >= policy.max_age_days:
+                self._rotate(log_file, policy)
+
+    def _first_entry_date(self, log_file: Path) -> date:
+        """Get the UTC date of the oldest entry in a live log file.
+        
+        Args:
+            log_file: Path to the live log file
+            
+        Returns:
+            Date of the first entry, or today if it cannot be determined
+        """
+        try:
+            with log_file.open('rb') as f:
+                entry = self._decode_line(f.readline(), log_file)
+            return datetime.fromisoformat(entry["timestamp"]).date()
+        except Exception:
+            return datetime.utcnow().date()
+
+    def _rotate(self, log_file: Path, policy: RotationPolicy) -> None:
+        """Move the live file into a timestamped archive segment.
+        
+        Args:
+            log_file: Path to the live log file
+            policy: Rotation policy for the file
+        """
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        segment = log_file.with_name(f"{log_file.stem}.{stamp}.jsonl")
+        os.replace(log_file, segment)
+        log_file.touch()
+        self._segment_started[log_file] = datetime.utcnow().date()
+        
+        if policy.compression:
+            self._compress_segment(segment, policy.compression)
+        
+        if policy.backup_count is not None:
+            for old_segment in self._archived_segments(log_file)[policy.backup_count:]:
+                old_segment.unlink(missing_ok=True)
+        
+        logger.info(f"Rotated log file {log_file} to {segment.name}")
+
+    @staticmethod
+    def _compress_segment(segment: Path, compression: str) -> None:
+        """Compress an archive segment and remove the uncompressed copy.
+        
+        The compressed file is written under a temporary name first, so a
+        crash never leaves a truncated archive behind.
+        
+        Args:
+            segment: Path to the uncompressed segment
+            compression: Compression to apply (gzip or zstd)
+        """
+        target = segment.with_name(segment.name + _COMPRESSION_SUFFIXES[compression])
+        tmp_target = target.with_name(target.name + ".tmp")
+        
+        with segment.open('rb') as src, tmp_target.open('wb') as raw:
+            if compression == "zstd":
+                with zstandard.ZstdCompressor().stream_writer(raw) as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as dst:
+                    shutil.copyfileobj(src, dst)
+        
+        os.replace(tmp_target, target)
+        segment.unlink()
+
+    def _archived_segments(self, log_file: Path) -> List[Path]:
+        """List the archive segments of a log file, newest first.
+        
+        Args:
+            log_file: Path to the live log file
+            
+        Returns:
+            Paths of archived segments
+        """
+        pattern = re.compile(
+            rf"^{re.escape(log_file.stem)}\.(\d{{8}}T\d+)\.jsonl(\.gz|\.zst)?$"
+        )
+        segments = [
+            (match.group(1), path)
+            for path in log_file.parent.iterdir()
+            if (match := pattern.match(path.name))
+        ]
+        segments.sort(reverse=True)
+        return [path for _, path in segments]
+
+    def _decode_line(self, line: bytes, log_file: Path) -> Optional[Dict[str, Any]]:
+        """Parse a single JSON Lines record.
+        
+        Args:
+            line: Raw line without its trailing newline
+            log_file: Path of the file the line came from (for diagnostics)
+            
+        Returns:
+            The parsed entry, or None for blank or malformed lines
+            (e.g. a torn write after a crash)
+        """
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.warning(f"Skipping malformed line in {log_file}")
+            return None
+
+    def _read_log_reversed(self, log_file: Path) -> Iterator[Dict[str, Any]]:
+        """Iterate over the entries of a plain JSON Lines file, newest first.
+        
+        The file is read backwards in fixed-size blocks starting from the
+        end, so callers that stop early only pay for the tail they consume.
+        
+        Args:
+            log_file: Path to the log file
+            
+        Yields:
+            Parsed log entries, newest first
+        """
+        with log_file.open('rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            
+            while position > 0:
+                read_size = min(TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b"\n")
+                
+                # The first line may continue in the previous block
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    entry = self._decode_line(line, log_file)
+                    if entry is not None:
+                        yield entry
+            
+            entry = self._decode_line(remainder, log_file)
+            if entry is not None:
+                yield entry
+
+    def _read_compressed_reversed(self, segment: Path) -> Iterator[Dict[str, Any]]:
+        """Iterate over a compressed archive segment, newest first.
+        
+        Compressed streams cannot be read backwards, so the segment is
+        decompressed in full; segments are bounded by the rotation policy.
+        
+        Args:
+            segment: Path to a ``.gz`` or ``.zst`` segment
+            
+        Yields:
+            Parsed log entries, newest first
+        """
+        if segment.suffix == ".zst":
+            if zstandard is None:
+                logger.warning(f"Skipping {segment}: 'zstandard' is not installed")
+                return
+            with segment.open('rb') as raw:
+                data = zstandard.ZstdDecompressor().stream_reader(raw).read()
+        else:
+            with gzip.open(segment, 'rb') as f:
+                data = f.read()
+        
+        for line in reversed(data.split(b"\n")):
+            entry = self._decode_line(line, segment)
+            if entry is not None:
+                yield entry
+
+    def _read_history_reversed(self, log_file: Path) -> Iterator[Dict[str, Any]]:
+        """Iterate over a log's live file and its archives, newest first.
+        
+        Args:
+            log_file: Path to the live log file
+            
+        Yields:
+            Parsed log entries, newest first
+        """
+        yield from self._read_log_reversed(log_file)
+        for segment in self._archived_segments(log_file):
+            try:
+                if segment.suffix == ".jsonl":
+                    yield from self._read_log_reversed(segment)
+                else:
+                    yield from self._read_compressed_reversed(segment)
+            except FileNotFoundError:
+                # Pruned by a concurrent rotation
+                continue
+
+    @staticmethod
+    def _format_bound(value: Optional[datetime]) -> Optional[str]:
+        """Convert a time-range bound to the stored timestamp format.
+        
+        Stored timestamps are naive UTC ISO strings, so aware datetimes
+        are converted to UTC first.
+        
+        Args:
+            value: Bound to convert
+            
+        Returns:
+            ISO formatted bound, or None if no bound was given
+        """
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+
+    def _query_log(self, log_file: Path, limit: int,
+                   filters: Optional[Dict[str, Any]] = None,
+                   since: Optional[datetime] = None,
+                   until: Optional[datetime] = None) -> List[Dict]:
+        """Return the newest matching entries of a log and its archives.
+        
+        Reading stops as soon as ``limit`` matches have been collected or
+        an entry older than ``since`` is reached, so the cost depends on
+        how far back the matches are, not on the total size of the log.
+        
+        Args:
+            log_file: Path to the log file
+            limit: Maximum number of entries to return
+            filters: Field values entries must match exactly
+            since: Only include entries logged at or after this time
+            until: Only include entries logged at or before this time
+            
+        Returns:
+            Up to ``limit`` matching entries, oldest first
+        """
+        logs: List[Dict] = []
+        if limit <= 0:
+            return logs
+        
+        # Make sure queued entries are visible to the reader
+        self.flush()
+        
+        filters = filters or {}
+        since_bound = self._format_bound(since)
+        until_bound = self._format_bound(until)
+        
+        for log in self._read_history_reversed(log_file):
+            timestamp = log.get("timestamp", "")
+            if since_bound is not None and timestamp < since_bound:
+                break
+            if until_bound is not None and timestamp > until_bound:
+                continue
+            if all(log.get(field) == value for field, value in filters.items()):
+                logs.append(log)
+                if len(logs) >= limit:
+                    break
+        
+        logs.reverse()
+        return logs
+
     def log_operation(self, operation: str, number: str,
                      status: str = "success",
                      details: Optional[Dict] = None) -> None:
@@ -74,7 +669,14 @@ class FileLogger:
 
     def log_search(self, country: str, type_: str,
                   capabilities: Optional[Dict] = None,
-                  results_count: int = 0) -> None:
+                  results_count: int = 0,
+                  shards: Optional[Dict[str, Dict]] = None,
+                  filters: Optional[Dict] = None,
+                  latency: Optional[float] = None,
+                  unique_count: Optional[int] = None,
+                  duplicate_count: Optional[int] = None,
+                  page_depth: Optional[int] = None,
+                  throttles: Optional[int] = None) -> None:
         """Log a phone number search operation.
         
         Args:
@@ -82,6 +684,14 @@ class FileLogger:
             type_: Number type (local/mobile/toll-free)
             capabilities: Required capabilities
             results_count: Number of results found
+            shards: Per-shard pages, results, unique and duplicate numbers,
+                keyed by shard (e.g. "AreaCode=415")
+            filters: Twilio query parameters sent with every request
+            latency: Wall-clock seconds from the first request to the end of the search
+            unique_count: Numbers not seen before in the search
+            duplicate_count: Numbers returned again by a later page or shard
+            page_depth: Deepest page fetched in any shard
+            throttles: Requests throttled (HTTP 429) during the search
         """
         entry = {
             "operation": "search",
@@ -90,6 +700,16 @@ class FileLogger:
             "capabilities": capabilities or {},
             "results_count": results_count
         }
+        optional = {
+            "shards": shards,
+            "filters": filters,
+            "latency": latency,
+            "unique_count": unique_count,
+            "duplicate_count": duplicate_count,
+            "page_depth": page_depth,
+            "throttles": throttles
+        }
+        entry.update({key: value for key, value in optional.items() if value is not None})
         self._append_to_log(self.search_log, entry)
 
     def log_debug(self, component: str, action: str,
@@ -109,72 +729,76 @@ class FileLogger:
         self._append_to_log(self.debug_log, entry)
 
     def get_recent_operations(self, limit: int = 100,
-                            operation_type: Optional[str] = None) -> List[Dict]:
+                            operation_type: Optional[str] = None,
+                            number: Optional[str] = None,
+                            since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> List[Dict]:
         """Get recent operations from the log.
         
         Args:
             limit: Maximum number of operations to return
             operation_type: Filter by operation type
+            number: Filter by phone number (or SID) involved
+            since: Only include operations at or after this time
+            until: Only include operations at or before this time
             
         Returns:
             List of operation log entries
         """
         try:
-            with self.operation_log.open('r') as f:
-                logs = json.load(f)
-            
+            filters = {}
             if operation_type:
-                logs = [log for log in logs if log["operation"] == operation_type]
+                filters["operation"] = operation_type
+            if number:
+                filters["number"] = number
             
-            return logs[-limit:]
+            return self._query_log(self.operation_log, limit, filters, since, until)
             
         except Exception as e:
             logger.error(f"Failed to read operation logs: {e}")
             return []
 
     def get_search_history(self, limit: int = 100,
-                         country: Optional[str] = None) -> List[Dict]:
+                         country: Optional[str] = None,
+                         since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> List[Dict]:
         """Get recent search operations.
         
         Args:
             limit: Maximum number of searches to return
             country: Filter by country code
+            since: Only include searches at or after this time
+            until: Only include searches at or before this time
             
         Returns:
             List of search log entries
         """
         try:
-            with self.search_log.open('r') as f:
-                logs = json.load(f)
-            
-            if country:
-                logs = [log for log in logs if log["country"] == country]
-            
-            return logs[-limit:]
+            filters = {"country": country} if country else {}
+            return self._query_log(self.search_log, limit, filters, since, until)
             
         except Exception as e:
             logger.error(f"Failed to read search logs: {e}")
             return []
 
     def get_debug_logs(self, limit: int = 100,
-                      component: Optional[str] = None) -> List[Dict]:
+                      component: Optional[str] = None,
+                      since: Optional[datetime] = None,
+                      until: Optional[datetime] = None) -> List[Dict]:
         """Get recent debug logs.
         
         Args:
             limit: Maximum number of logs to return
             component: Filter by component name
+            since: Only include logs at or after this time
+            until: Only include logs at or before this time
             
         Returns:
             List of debug log entries
         """
         try:
-            with self.debug_log.open('r') as f:
-                logs = json.load(f)
-            
-            if component:
-                logs = [log for log in logs if log["component"] == component]
-            
-            return logs[-limit:]
+            filters = {"component": component} if component else {}
+            return self._query_log(self.debug_log, limit, filters, since, until)
             
         except Exception as e:
             logger.error(f"Failed to read debug logs: {e}")
@@ -1,68 +1,158 @@
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 from .config import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN
+from .rate_limiter import SEARCH, RateLimiter, get_rate_limiter, parse_retry_after
+from .retry import Retrier
+from .search_engine import (
+    LOCATION_FILTERS, SearchEngine, build_search_params, default_search_shards
+)
 
 logger = logging.getLogger(__name__)
 
 class HTTPGateway:
     BASE_URL = "https://api.twilio.com/2010-04-01"
-    
-    def __init__(self):
+    API_HOST = "https://api.twilio.com"
+
+    def __init__(self, pool_size: int = 10,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retrier: Optional[Retrier] = None):
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retrier = retrier or Retrier()
         self._session = requests.Session()
         self._session.auth = (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
         self._session.headers.update({
             "Accept": "application/json",
             "Content-Type": "application/json"
         })
+        # Size the connection pool for concurrent page fetches
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+
+    def _search_url(self, country: str, type_: str) -> str:
+        """Build the AvailablePhoneNumbers resource URL."""
+        return f"{self.BASE_URL}/Accounts/{TWILIO_ACCOUNT_SID}/AvailablePhoneNumbers/{country}/{type_}.json"
+
+    def _get_page(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Fetch one page of available numbers.
+
+        The caller must acquire a search token first; the response status
+        is reported back to the rate limiter.
+        """
+        # Twilio returns next_page_url relative to the API host
+        if url.startswith("/"):
+            url = f"{self.API_HOST}{url}"
+
+        response = self._session.get(url, params=params)
+        self.rate_limiter.on_response(
+            SEARCH,
+            response.status_code,
+            parse_retry_after(response.headers.get("Retry-After"))
+        )
+        response.raise_for_status()
 
-    def search_batch(self, country: str, type_: str, 
+        data = response.json()
+        logger.debug(f"Retrieved {len(data.get('available_phone_numbers', []))} numbers")
+
+        return {
+            "numbers": data.get("available_phone_numbers", []),
+            "next_page_url": data.get("next_page_url"),
+            "uri": data.get("uri")
+        }
+
+    def search_batch(self, country: str, type_: str,
                     capabilities: Optional[Dict] = None,
                     page_size: int = 50,
-                    page_token: Optional[str] = None) -> Dict:
+                    page_token: Optional[str] = None,
+                    filters: Optional[Dict] = None) -> Dict:
         """
         Search for available phone numbers using raw HTTP requests.
         Supports pagination and capability filtering.
         """
         try:
-            url = f"{self.BASE_URL}/Accounts/{TWILIO_ACCOUNT_SID}/AvailablePhoneNumbers/{country}/{type_}.json"
-            
-            params = {
-                "PageSize": page_size
-            }
-            
-            # Add capabilities filtering
-            if capabilities:
-                if capabilities.get("voice"):
-                    params["VoiceEnabled"] = "true"
-                if capabilities.get("sms"):
-                    params["SmsEnabled"] = "true"
-                if capabilities.get("mms"):
-                    params["MmsEnabled"] = "true"
-            
+            params = build_search_params(capabilities, page_size, filters)
+
             # Add pagination token if provided
             if page_token:
                 params["PageToken"] = page_token
 
-            response = self._session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.debug(f"Retrieved {len(data.get('available_phone_numbers', []))} numbers")
-            
-            return {
-                "numbers": data.get("available_phone_numbers", []),
-                "next_page_url": data.get("next_page_url"),
-                "uri": data.get("uri")
-            }
+            def attempt() -> Dict:
+                self.rate_limiter.acquire(SEARCH)
+                return self._get_page(self._search_url(country, type_), params)
+
+            return self.retrier.call("search_batch", attempt, idempotent=True)
 
         except RequestException as e:
             logger.error(f"HTTP request failed during number search: {e}")
             raise
 
+    def fetch_page(self, page_url: str) -> Dict:
+        """
+        Fetch a follow-up page using the next_page_url of a previous result.
+        """
+        try:
+            def attempt() -> Dict:
+                self.rate_limiter.acquire(SEARCH)
+                return self._get_page(page_url)
+
+            return self.retrier.call("fetch_page", attempt, idempotent=True)
+        except RequestException as e:
+            logger.error(f"HTTP request failed while fetching {page_url}: {e}")
+            raise
+
+    async def search_stream(self, country: str, type_: str,
+                            capabilities: Optional[Dict] = None,
+                            page_size: int = 50,
+                            filters: Optional[Dict] = None,
+                            shards: Optional[List[Dict]] = None,
+                            concurrency: int = 4,
+                            max_pages_per_shard: Optional[int] = None,
+                            weights: Optional[List[float]] = None,
+                            errors: Optional[List[Dict]] = None) -> AsyncIterator[Dict]:
+        """
+        Stream result pages of a sharded, multi-page search.
+        Shards default to the area codes/regions in COUNTRY_DATA and are
+        crawled concurrently, following next_page_url, round-robin or by
+        weight; blocking requests run in worker threads so the event loop
+        stays free. Failed shards are appended to ``errors`` if given, and
+        SearchError is raised if every shard failed.
+        """
+        base_params = build_search_params(capabilities, page_size, filters)
+        url = self._search_url(country, type_)
+
+        async def fetch(shard: Dict, page_url: Optional[str]) -> Dict:
+            async def attempt() -> Dict:
+                # Wait for a token on the loop rather than in a worker thread
+                await self.rate_limiter.acquire_async(SEARCH)
+                if page_url:
+                    return await asyncio.to_thread(self._get_page, page_url)
+                params = {**base_params, **shard}
+                return await asyncio.to_thread(self._get_page, url, params)
+
+            try:
+                return await self.retrier.call_async("search_stream", attempt, idempotent=True)
+            except RequestException as e:
+                logger.error(f"HTTP request failed during number search: {e}")
+                raise
+
+        engine = SearchEngine(
+            fetch,
+            concurrency=concurrency,
+            max_pages_per_shard=max_pages_per_shard,
+            errors=errors
+        )
+        if shards is None:
+            located = bool(filters and LOCATION_FILTERS.intersection(filters))
+            shards = [{}] if located else default_search_shards(country)
+
+        async for page in engine.stream(shards, weights):
+            yield page
+
     def __del__(self):
         """Ensure proper cleanup of session."""
         if hasattr(self, '_session'):
-            self._session.close()
\ No newline at end of file
+            self._session.close()
@@ -0,0 +1,190 @@
+"""Persistent SQLite cache of the account's phone number inventory.
+
+Records are keyed by SID together with the ``date_updated`` Twilio reported
+for them. A sync against a fresh listing only writes rows whose
+``date_updated`` moved and deletes SIDs that are gone, so refreshing a large
+inventory costs local writes proportional to what changed. Reads never touch
+the API, and the service keeps the cache current on its own writes.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..models.phone_number_model import NumberRecord
+
+logger = logging.getLogger(__name__)
+
+class InventoryCache:
+    """SQLite-backed cache of owned numbers keyed by SID."""
+
+    def __init__(self, db_path: str = "logs/inventory.db", ttl: float = 300.0):
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            ttl: Seconds after a refresh during which the cache is fresh
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS numbers ("
+            "sid TEXT PRIMARY KEY, "
+            "number TEXT NOT NULL, "
+            "date_updated TEXT, "
+            "record TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_numbers_number ON numbers (number)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+    @staticmethod
+    def _encode(record: NumberRecord) -> str:
+        return json.dumps(asdict(record), separators=(",", ":"))
+
+    @staticmethod
+    def _decode(data: str) -> NumberRecord:
+        return NumberRecord(**json.loads(data))
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @property
+    def last_refresh(self) -> Optional[float]:
+        """Epoch time of the last completed refresh, None if never refreshed."""
+        with self._lock:
+            value = self._get_meta("last_refresh")
+        return float(value) if value is not None else None
+
+    def is_fresh(self) -> bool:
+        """Check whether the last refresh is within the TTL."""
+        last_refresh = self.last_refresh
+        return last_refresh is not None and time.time() - last_refresh < self.ttl
+
+    def invalidate(self) -> None:
+        """Mark the cache stale so the next read refreshes it."""
+        with self._lock:
+            self._conn.execute("DELETE FROM meta WHERE key = 'last_refresh'")
+
+    def list_records(self) -> List[NumberRecord]:
+        """Get all cached records ordered by phone number."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM numbers ORDER BY number"
+            ).fetchall()
+        return [self._decode(data) for (data,) in rows]
+
+    def get(self, sid: str) -> Optional[NumberRecord]:
+        """Get the cached record of a SID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM numbers WHERE sid = ?", (sid,)
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def sync(self, records: Iterable[NumberRecord]) -> Dict[str, int]:
+        """Reconcile the cache with a complete listing of the account.
+
+        Args:
+            records: Every owned number, as listed by the API
+
+        Returns:
+            Counts of ``added``, ``updated``, ``removed`` and ``unchanged`` records
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        with self._lock:
+            known = dict(self._conn.execute("SELECT sid, date_updated FROM numbers"))
+
+        # Records may be streamed from the API, so reads stay unblocked
+        # until the delta is ready to write
+        seen = set()
+        changed = []
+        for record in records:
+            seen.add(record.sid)
+            if record.sid not in known:
+                counts["added"] += 1
+            elif record.date_updated is None or known[record.sid] != record.date_updated:
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+            changed.append(
+                (record.sid, record.number, record.date_updated, self._encode(record))
+            )
+
+        removed = [(sid,) for sid in known if sid not in seen]
+        counts["removed"] = len(removed)
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO numbers (sid, number, date_updated, record) "
+                    "VALUES (?, ?, ?, ?)",
+                    changed
+                )
+                self._conn.executemany("DELETE FROM numbers WHERE sid = ?", removed)
+                self._set_meta("last_refresh", str(time.time()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        logger.debug(f"Inventory sync: {counts}")
+        return counts
+
+    def upsert(self, record: NumberRecord) -> None:
+        """Insert or replace a single record."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO numbers (sid, number, date_updated, record) "
+                "VALUES (?, ?, ?, ?)",
+                (record.sid, record.number, record.date_updated, self._encode(record))
+            )
+
+    def update_fields(self, sid: str, **fields) -> None:
+        """Update fields of a cached record, if present.
+
+        The stored ``date_updated`` is cleared so the next sync rewrites the
+        record with the server's view.
+        """
+        record = self.get(sid)
+        if record is None:
+            return
+        for name, value in fields.items():
+            if hasattr(record, name):
+                setattr(record, name, value)
+        record.date_updated = None
+        self.upsert(record)
+
+    def remove(self, sid: str) -> None:
+        """Remove a released number."""
+        with self._lock:
+            self._conn.execute("DELETE FROM numbers WHERE sid = ?", (sid,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,255 @@
+"""Local SQLite warehouse of call and message logs.
+
+Entries are keyed by SID, so syncing an overlapping window is idempotent
+and picks up status changes of recent calls and messages. A high-water
+mark per log type records the newest timestamp synced, letting each sync
+pull only what is new. Queries filter and page through indexed columns
+locally instead of re-listing the logs from Twilio.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "sid", "type", "timestamp", "from_number", "to_number",
+    "direction", "status", "duration", "body", "price"
+)
+
+def to_utc_iso(value: Optional[datetime]) -> Optional[str]:
+    """Format a timestamp as sortable UTC ISO text; naive values are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+class LogStore:
+    """SQLite-backed store of call and message log entries."""
+
+    def __init__(self, db_path: str = "logs/account_logs.db", ttl: float = 60.0):
+        """Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            ttl: Seconds after a sync during which the store is fresh
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS logs ("
+            "sid TEXT PRIMARY KEY, "
+            "type TEXT NOT NULL, "
+            "timestamp TEXT, "
+            "from_number TEXT, to_number TEXT, "
+            "direction TEXT, status TEXT, "
+            "duration TEXT, body TEXT, price REAL)"
+        )
+        for name, columns in (
+            ("timestamp", "timestamp"),
+            ("type", "type, timestamp"),
+            ("from", "from_number, timestamp"),
+            ("to", "to_number, timestamp"),
+            ("direction", "direction, timestamp"),
+            ("status", "status, timestamp"),
+        ):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_logs_{name} ON logs ({columns})"
+            )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def high_water_mark(self, type_: str) -> Optional[datetime]:
+        """Newest timestamp synced for a log type, None if never synced."""
+        value = self._get_meta(f"high_water:{type_}")
+        return datetime.fromisoformat(value) if value else None
+
+    def set_high_water_mark(self, type_: str, value: datetime) -> None:
+        """Record the newest timestamp synced for a log type."""
+        self._set_meta(f"high_water:{type_}", to_utc_iso(value))
+
+    def mark_synced(self) -> None:
+        """Record that a sync just completed."""
+        self._set_meta("last_sync", str(time.time()))
+
+    def is_fresh(self) -> bool:
+        """Check whether the last sync is within the TTL."""
+        last_sync = self._get_meta("last_sync")
+        return last_sync is not None and time.time() - float(last_sync) < self.ttl
+
+    def upsert(self, entries: Iterable[Dict]) -> int:
+        """Insert or replace log entries by SID.
+
+        Args:
+            entries: Account log entries as built by AccountService
+
+        Returns:
+            Number of entries written
+        """
+        rows = [
+            (
+                entry["sid"], entry["type"], to_utc_iso(entry["timestamp"]),
+                entry.get("from"), entry.get("to"), entry.get("direction"),
+                entry.get("status"), entry.get("duration"), entry.get("body"),
+                entry.get("price")
+            )
+            for entry in entries
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO logs ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    @staticmethod
+    def _where(number: Optional[str], type_: Optional[str], direction: Optional[str],
+               status: Optional[str], start: Optional[datetime],
+               end: Optional[datetime]) -> tuple:
+        clauses, params = [], []
+        if number:
+            # Two indexed lookups instead of a scan over an OR
+            clauses.append(
+                "rowid IN (SELECT rowid FROM logs WHERE from_number = ? "
+                "UNION SELECT rowid FROM logs WHERE to_number = ?)"
+            )
+            params.extend([number, number])
+        for column, value in (("type", type_), ("direction", direction), ("status", status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start:
+            clauses.append("timestamp >= ?")
+            params.append(to_utc_iso(start))
+        if end:
+            clauses.append("timestamp <= ?")
+            params.append(to_utc_iso(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, number: Optional[str] = None, type_: Optional[str] = None,
+              direction: Optional[str] = None, status: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None,
+              limit: int = 20, offset: int = 0,
+              after: Optional[Tuple[Optional[datetime], str]] = None) -> List[Dict]:
+        """Query log entries, newest first, then by SID.
+
+        Args:
+            number: Only entries from or to this number
+            type_: "call" or "message"
+            direction: Twilio direction, e.g. "inbound"
+            status: Twilio status, e.g. "failed"
+            start: Only entries at or after this time
+            end: Only entries at or before this time
+            limit: Maximum entries to return
+            offset: Entries to skip
+            after: (timestamp, sid) of the last entry of the previous page;
+                only entries ordered after it are returned. Unlike an
+                offset, this stays in place when entries are added.
+
+        Returns:
+            Log entries in the AccountService entry format
+        """
+        where, params = self._where(number, type_, direction, status, start, end)
+        if after is not None:
+            timestamp, sid = after
+            if timestamp is None:
+                # Entries without a timestamp sort last
+                clause = "(timestamp IS NULL AND sid > ?)"
+                params = params + [sid]
+            else:
+                clause = "(timestamp < ? OR (timestamp = ? AND sid > ?) OR timestamp IS NULL)"
+                params = params + [to_utc_iso(timestamp), to_utc_iso(timestamp), sid]
+            where += f" AND {clause}" if where else f" WHERE {clause}"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM logs{where} "
+                f"ORDER BY timestamp DESC, sid LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def iter_query(self, number: Optional[str] = None, type_: Optional[str] = None,
+                   direction: Optional[str] = None, status: Optional[str] = None,
+                   start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Lazily yield every entry matching the query filters, newest first.
+
+        Entries are read in batches, so only ``batch_size`` of them are in
+        memory at a time. Each batch continues from the last entry of the
+        one before, so entries synced during the iteration neither shift
+        nor repeat it. Filters are as for query.
+        """
+        after = None
+        while True:
+            batch = self.query(number, type_, direction, status, start, end,
+                               limit=batch_size, after=after)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after = (batch[-1]["timestamp"], batch[-1]["sid"])
+
+    def count(self, number: Optional[str] = None, type_: Optional[str] = None,
+              direction: Optional[str] = None, status: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        """Count log entries matching the query filters."""
+        where, params = self._where(number, type_, direction, status, start, end)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM logs{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _to_entry(row: tuple) -> Dict:
+        sid, type_, timestamp, from_, to, direction, status, duration, body, price = row
+        entry = {
+            "sid": sid,
+            "type": type_,
+            "timestamp": datetime.fromisoformat(timestamp) if timestamp else None,
+            "from": from_,
+            "to": to,
+            "direction": direction,
+            "status": status,
+            "price": price
+        }
+        if type_ == "call":
+            entry["duration"] = duration
+        else:
+            entry["body"] = body
+        return entry
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
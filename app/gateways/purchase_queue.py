@@ -0,0 +1,215 @@
+"""Durable SQLite job queue for number purchases.
+
+Each phone number has at most one job, so enqueueing a number twice, or
+after it was purchased, is a no-op; enqueueing a number whose job failed
+puts that job back in the queue. Jobs move from ``queued`` to
+``in_progress`` when a worker claims them and end as ``purchased`` or
+``failed``. A job still ``in_progress`` when the process starts again was
+interrupted by a crash; ``recover`` puts it back in the queue with its
+attempt count kept, so the next worker knows to check whether the earlier
+purchase went through before buying again.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..models.phone_number_model import PurchaseJob
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+PURCHASED = "purchased"
+FAILED = "failed"
+
+_COLUMNS = "number, status, attempts, sid, error, created_at, updated_at"
+
+class PurchaseQueue:
+    """SQLite-backed purchase queue with exactly-once jobs per number."""
+
+    def __init__(self, db_path: str = "logs/purchase_queue.db"):
+        """Initialize the queue, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS purchase_jobs ("
+            "number TEXT PRIMARY KEY, "
+            "status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "sid TEXT, error TEXT, "
+            "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_purchase_jobs_status "
+            "ON purchase_jobs (status, created_at)"
+        )
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.utcnow().isoformat()
+
+    @staticmethod
+    def _to_job(row: tuple) -> PurchaseJob:
+        return PurchaseJob(*row)
+
+    def enqueue(self, numbers: Iterable[str]) -> int:
+        """Add purchase jobs for numbers that have none yet.
+
+        Failed jobs of the given numbers are requeued.
+
+        Args:
+            numbers: Phone numbers to purchase
+
+        Returns:
+            Number of jobs added or requeued; numbers already queued, in
+            progress or purchased are left untouched
+        """
+        now = self._now()
+        numbers = list(dict.fromkeys(numbers))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO purchase_jobs "
+                    "(number, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    [(number, QUEUED, now, now) for number in numbers]
+                )
+                self._conn.executemany(
+                    "UPDATE purchase_jobs SET status = ?, error = NULL, updated_at = ? "
+                    "WHERE number = ? AND status = ?",
+                    [(QUEUED, now, number, FAILED) for number in numbers]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def claim(self) -> Optional[PurchaseJob]:
+        """Atomically take the oldest queued job.
+
+        Returns:
+            The claimed job, now in progress, or None if the queue is empty
+        """
+        now = self._now()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two processes
+            # sharing the database cannot claim the same job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM purchase_jobs WHERE status = ? "
+                    f"ORDER BY created_at, rowid LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE purchase_jobs SET status = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE number = ?",
+                        (IN_PROGRESS, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if not row:
+            return None
+        job = self._to_job(row)
+        job.status = IN_PROGRESS
+        job.attempts += 1
+        job.updated_at = now
+        return job
+
+    def complete(self, number: str, sid: Optional[str]) -> None:
+        """Mark a job purchased."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE purchase_jobs SET status = ?, sid = ?, error = NULL, "
+                "updated_at = ? WHERE number = ?",
+                (PURCHASED, sid, self._now(), number)
+            )
+
+    def fail(self, number: str, error: str) -> None:
+        """Mark a job failed."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE purchase_jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE number = ?",
+                (FAILED, error, self._now(), number)
+            )
+
+    def recover(self) -> int:
+        """Requeue jobs left in progress by an interrupted process.
+
+        Only call this when no workers are running.
+
+        Returns:
+            Number of jobs requeued
+        """
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE purchase_jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (QUEUED, self._now(), IN_PROGRESS)
+            ).rowcount
+        if count:
+            logger.warning(f"Recovered {count} interrupted purchase job(s)")
+        return count
+
+    def get_job(self, number: str) -> Optional[PurchaseJob]:
+        """Get the job for a number, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM purchase_jobs WHERE number = ?",
+                (number,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 1000) -> List[PurchaseJob]:
+        """List jobs, oldest first.
+
+        Args:
+            status: Only include jobs with this status
+            limit: Maximum number of jobs to return
+        """
+        sql = f"SELECT {_COLUMNS} FROM purchase_jobs"
+        params: list = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at, rowid LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Count jobs by status."""
+        counts = {QUEUED: 0, IN_PROGRESS: 0, PURCHASED: 0, FAILED: 0}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM purchase_jobs GROUP BY status"
+            ).fetchall()
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,276 @@
+"""Adaptive token-bucket rate limiting for Twilio API calls.
+
+Every gateway request acquires a token from the bucket of its endpoint
+class before it is sent and reports the response status afterwards. Rates
+adapt AIMD style: each successful request raises the rate by a small step
+up to a ceiling, and a 429 cuts it multiplicatively and pauses the bucket
+for the ``Retry-After`` period. This converges on the highest rate the
+account allows without sustained throttling.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from ..shared.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Endpoint classes with independent limits
+SEARCH = "search"
+PURCHASE = "purchase"
+MESSAGES = "messages"
+CALLS = "calls"
+ACCOUNT = "account"
+ENDPOINT_CLASSES = (SEARCH, PURCHASE, MESSAGES, CALLS, ACCOUNT)
+
+# Pause applied on a 429 that carries no Retry-After header
+DEFAULT_THROTTLE_PAUSE = 1.0
+
+@dataclass
+class EndpointLimit:
+    """Rate configuration for one endpoint class."""
+    rate: float  # Initial requests per second
+    burst: int = 1  # Requests that may be sent back to back
+    min_rate: float = 0.05  # Floor for multiplicative decrease
+    max_rate: Optional[float] = None  # Ceiling for additive increase, 10x rate if unset
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def limits_from_settings(settings: Optional[Settings] = None) -> Dict[str, EndpointLimit]:
+    """Build endpoint limits from the ``*_rate_limit`` settings.
+
+    Settings express limits as seconds between requests; a value of 0 or
+    less means the class starts at its ceiling of 10 requests per second.
+
+    Args:
+        settings: Settings to read; the Settings defaults if None
+
+    Returns:
+        Limits keyed by endpoint class
+    """
+    source = settings if settings is not None else Settings
+
+    def to_rate(interval: float) -> float:
+        return 1.0 / interval if interval > 0 else 10.0
+
+    return {
+        SEARCH: EndpointLimit(rate=to_rate(source.search_rate_limit)),
+        PURCHASE: EndpointLimit(rate=to_rate(source.purchase_rate_limit)),
+        MESSAGES: EndpointLimit(rate=to_rate(source.messages_rate_limit), burst=5),
+        CALLS: EndpointLimit(rate=to_rate(source.calls_rate_limit)),
+        ACCOUNT: EndpointLimit(rate=to_rate(source.account_rate_limit)),
+    }
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD rate adjustment."""
+
+    def __init__(self, limit: EndpointLimit, increase: float = 0.05,
+                 decrease: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the bucket.
+
+        Args:
+            limit: Rate configuration
+            increase: Requests per second added after each success
+            decrease: Factor the rate is multiplied by on a 429
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.rate = limit.rate
+        self.burst = max(1, limit.burst)
+        self.min_rate = min(limit.min_rate, limit.rate)
+        self.max_rate = limit.max_rate if limit.max_rate is not None else limit.rate * 10
+        self.increase = increase
+        self.decrease = decrease
+        self.requests = 0
+        self.throttles = 0
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        # Time from which tokens accrue; pushed into the future by Retry-After
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update."""
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token, going into debt if none is available.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            self.requests += 1
+
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self) -> float:
+        """Block the calling thread until a token is available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait on the event loop until a token is available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        """Additively increase the rate after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Cut the rate and pause the bucket after a 429.
+
+        Args:
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            pause = DEFAULT_THROTTLE_PAUSE if retry_after is None else retry_after
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + pause)
+
+class RateLimiter:
+    """Registry of adaptive token buckets, one per endpoint class."""
+
+    def __init__(self, limits: Optional[Dict[str, EndpointLimit]] = None,
+                 increase: float = 0.05, decrease: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the rate limiter.
+
+        Args:
+            limits: Limits per endpoint class, merged over the Settings defaults
+            increase: Requests per second added after each success
+            decrease: Factor a rate is multiplied by on a 429
+            clock: Monotonic clock, replaceable in tests
+        """
+        configured = {**limits_from_settings(), **(limits or {})}
+        self._buckets: Dict[str, TokenBucket] = {
+            endpoint: TokenBucket(limit, increase=increase, decrease=decrease, clock=clock)
+            for endpoint, limit in configured.items()
+        }
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RateLimiter":
+        """Create a rate limiter from application settings."""
+        return cls(limits_from_settings(settings))
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """Get the bucket for an endpoint class.
+
+        Raises:
+            KeyError: If the endpoint class is not configured.
+        """
+        try:
+            return self._buckets[endpoint]
+        except KeyError:
+            raise KeyError(f"Unknown rate limit endpoint class: {endpoint}") from None
+
+    def acquire(self, endpoint: str) -> float:
+        """Block until a request to the endpoint class may be sent."""
+        return self.bucket(endpoint).acquire()
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """Wait on the event loop until a request may be sent."""
+        return await self.bucket(endpoint).acquire_async()
+
+    def on_response(self, endpoint: str, status: int,
+                    retry_after: Optional[float] = None) -> None:
+        """Feed a response status back into the endpoint's rate.
+
+        Args:
+            endpoint: Endpoint class the request belonged to
+            status: HTTP status code of the response
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        bucket = self.bucket(endpoint)
+        if status == 429:
+            bucket.on_throttle(retry_after)
+            logger.warning(
+                f"Throttled on {endpoint} requests, rate lowered to "
+                f"{bucket.rate:.2f}/s"
+            )
+        elif status < 400:
+            bucket.on_success()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get current rate and counters per endpoint class."""
+        return {
+            endpoint: {
+                "rate": bucket.rate,
+                "max_rate": bucket.max_rate,
+                "requests": bucket.requests,
+                "throttles": bucket.throttles
+            }
+            for endpoint, bucket in self._buckets.items()
+        }
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter shared by all gateways."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
+
+def configure_rate_limiter(settings: Settings) -> RateLimiter:
+    """Replace the shared rate limiter with one built from settings."""
+    global _shared_limiter
+    with _shared_lock:
+        _shared_limiter = RateLimiter.from_settings(settings)
+        return _shared_limiter
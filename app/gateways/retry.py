@@ -0,0 +1,231 @@
+"""Retry with capped exponential backoff and jitter for gateway calls.
+
+Failures are classified before retrying:
+
+* 429 responses and connections that were never established did not reach
+  Twilio, so any request may be retried.
+* 5xx responses, resets and timeouts are ambiguous; the request may have
+  taken effect. Only idempotent requests (GET, DELETE, full-state updates)
+  are retried, or requests with an idempotency key whose ``reconcile``
+  check can tell whether the earlier attempt already succeeded.
+* Anything else (4xx) is raised immediately.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple
+
+import aiohttp
+from requests import exceptions as requests_exceptions
+from twilio.base.exceptions import TwilioRestException
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; 429 is the only one guaranteed not processed
+THROTTLED = 429
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+@dataclass
+class RetryPolicy:
+    """Retry limits and backoff shape."""
+    max_attempts: int = 4  # Total attempts including the first
+    base_delay: float = 0.5  # Backoff before the first retry, in seconds
+    max_delay: float = 8.0  # Cap on a single backoff
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter backoff before the given retry (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)
+
+@dataclass
+class RetryStats:
+    """Retry counters for one gateway operation."""
+    calls: int = 0  # Logical calls made
+    attempts: int = 0  # Requests sent, including retries
+    retries: int = 0  # Attempts beyond the first
+    recovered: int = 0  # Ambiguous failures resolved by reconcile
+    failures: int = 0  # Calls that raised after exhausting retries
+    last_error: Optional[str] = None  # Message of the most recent failure
+
+def classify_error(error: BaseException) -> Tuple[Optional[int], bool]:
+    """Classify a request failure.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        Tuple of the HTTP status (None for transport errors) and whether
+        the request may have reached the server. Unrecognized errors are
+        reported as ``(None, True)`` and are never retried.
+    """
+    if isinstance(error, TwilioRestException):
+        return error.status, True
+    if isinstance(error, requests_exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code, True
+    if isinstance(error, (requests_exceptions.ConnectTimeout, aiohttp.ClientConnectorError)):
+        return None, False
+    # Resets and read timeouts may happen after the request was written
+    return None, True
+
+def is_transport_error(error: BaseException) -> bool:
+    """Check whether an error came from the network rather than the API."""
+    return isinstance(error, (
+        requests_exceptions.ConnectionError, requests_exceptions.Timeout,
+        aiohttp.ClientConnectionError, asyncio.TimeoutError
+    ))
+
+class Retrier:
+    """Runs gateway requests under a retry policy and counts retries."""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        """Initialize the retrier.
+
+        Args:
+            policy: Retry limits; defaults to RetryPolicy()
+            sleep: Blocking sleep, replaceable in tests
+            async_sleep: Event loop sleep, replaceable in tests
+        """
+        self.policy = policy or RetryPolicy()
+        self.stats: Dict[str, RetryStats] = {}
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._lock = threading.Lock()
+
+    def _stats_for(self, operation: str) -> RetryStats:
+        with self._lock:
+            return self.stats.setdefault(operation, RetryStats())
+
+    def _should_retry(self, error: BaseException, attempt: int,
+                      idempotent: bool, has_key: bool) -> Tuple[bool, bool]:
+        """Decide whether a failed attempt is retried.
+
+        Returns:
+            Tuple of (retry, ambiguous) where ambiguous means the failed
+            attempt may have taken effect
+        """
+        if attempt >= self.policy.max_attempts:
+            return False, False
+
+        status, sent = classify_error(error)
+        if status is None and not is_transport_error(error):
+            return False, False
+        if status is not None and status not in self.policy.retry_statuses:
+            return False, False
+
+        ambiguous = sent and status != THROTTLED
+        if ambiguous and not (idempotent or has_key):
+            return False, True
+        return True, ambiguous
+
+    def _record(self, operation: str, **changes: Any) -> None:
+        stats = self._stats_for(operation)
+        with self._lock:
+            for name, value in changes.items():
+                if name == "last_error":
+                    stats.last_error = value
+                else:
+                    setattr(stats, name, getattr(stats, name) + value)
+
+    def call(self, operation: str, request: Callable[[], Any],
+             idempotent: bool = False,
+             reconcile: Optional[Callable[[], Any]] = None) -> Any:
+        """Run a blocking request with retries.
+
+        Args:
+            operation: Name the retry counters are kept under
+            request: Callable performing one attempt
+            idempotent: Whether repeating the request is harmless
+            reconcile: For non-idempotent requests with an idempotency key,
+                a callable returning the result of an earlier attempt that
+                took effect, or None if it did not
+
+        Returns:
+            Result of the request
+        """
+        self._record(operation, calls=1)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._record(operation, attempts=1)
+            try:
+                return request()
+            except Exception as e:
+                retry, ambiguous = self._should_retry(
+                    e, attempt, idempotent, reconcile is not None
+                )
+                if not retry:
+                    self._record(operation, failures=1, last_error=str(e))
+                    raise
+
+                if ambiguous and reconcile is not None:
+                    try:
+                        result = reconcile()
+                    except Exception as check_error:
+                        # Unknown outcome, a retry could apply the request twice
+                        logger.error(f"{operation} reconcile failed: {check_error}")
+                        self._record(operation, failures=1, last_error=str(e))
+                        raise e
+                    if result is not None:
+                        logger.info(f"{operation} took effect despite error: {e}")
+                        self._record(operation, recovered=1)
+                        return result
+
+                delay = self.policy.backoff(attempt)
+                logger.warning(
+                    f"{operation} attempt {attempt} failed ({e}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                self._record(operation, retries=1, last_error=str(e))
+                self._sleep(delay)
+
+    async def call_async(self, operation: str,
+                         request: Callable[[], Awaitable[Any]],
+                         idempotent: bool = False,
+                         reconcile: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """Run an async request with retries.
+
+        Same contract as ``call`` with coroutine functions for
+        ``request`` and ``reconcile``.
+        """
+        self._record(operation, calls=1)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._record(operation, attempts=1)
+            try:
+                return await request()
+            except Exception as e:
+                retry, ambiguous = self._should_retry(
+                    e, attempt, idempotent, reconcile is not None
+                )
+                if not retry:
+                    self._record(operation, failures=1, last_error=str(e))
+                    raise
+
+                if ambiguous and reconcile is not None:
+                    try:
+                        result = await reconcile()
+                    except Exception as check_error:
+                        # Unknown outcome, a retry could apply the request twice
+                        logger.error(f"{operation} reconcile failed: {check_error}")
+                        self._record(operation, failures=1, last_error=str(e))
+                        raise e
+                    if result is not None:
+                        logger.info(f"{operation} took effect despite error: {e}")
+                        self._record(operation, recovered=1)
+                        return result
+
+                delay = self.policy.backoff(attempt)
+                logger.warning(
+                    f"{operation} attempt {attempt} failed ({e}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                self._record(operation, retries=1, last_error=str(e))
+                await self._async_sleep(delay)
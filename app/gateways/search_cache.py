@@ -0,0 +1,148 @@
+"""Short-lived in-memory cache of available-number search results.
+
+Searches are keyed by a fingerprint of the normalized query, so the same
+country, type, capabilities, pattern and locality map to one entry
+however they were spelled. Entries expire after a short TTL, since
+availability changes, and the least recently used entry is dropped once
+the cache is full. Numbers we purchase are evicted from every entry so
+they are not offered again.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ..models.phone_number_model import NumberRecord
+from .search_engine import CONTAINS_PATTERN
+
+logger = logging.getLogger(__name__)
+
+def _normalize(value: Any) -> Union[str, List[str]]:
+    """Normalize a filter value for fingerprinting."""
+    if isinstance(value, (list, set)):
+        return sorted({_normalize(part) for part in value})
+    if isinstance(value, tuple):
+        # Ordered values such as a (latitude, longitude) pair
+        return ",".join(str(part) for part in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip().lower()
+
+@dataclass
+class SearchCacheEntry:
+    """Cached results of one search query."""
+    records: List[NumberRecord]  # Unique results in the order they were found
+    complete: bool  # Whether the search ran to the end of the results
+    stored_at: float  # Clock time the entry was stored
+
+class SearchCache:
+    """Thread-safe LRU cache of search results with a TTL."""
+
+    def __init__(self, ttl: float = 120.0, max_entries: int = 32,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry is served after it was stored
+            max_entries: Entries kept before the least recently used is dropped
+            clock: Monotonic time source
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, SearchCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(country: str, type_: str,
+                    capabilities: Optional[Union[Dict, List]] = None,
+                    pattern: Optional[str] = None,
+                    locality: Optional[Dict] = None) -> str:
+        """Build the cache key of a search query.
+
+        Country and type are case-folded, capabilities reduced to the sorted
+        set of required ones, multi-valued filters sorted, and empty filters
+        dropped. Patterns pushed down as a Contains filter are case-folded;
+        regex patterns are kept as written, since case matters to them.
+        """
+        pattern = (pattern or "").strip()
+        if CONTAINS_PATTERN.match(pattern):
+            pattern = pattern.upper()
+        if isinstance(capabilities, dict):
+            capabilities = [name for name, required in capabilities.items() if required]
+        query = {
+            "country": country.upper(),
+            "type": type_.lower().replace("-", ""),
+            "capabilities": sorted({name.lower() for name in capabilities or []}),
+            "pattern": pattern,
+            "locality": {
+                key: _normalize(value)
+                for key, value in sorted((locality or {}).items()) if value not in (None, "", [])
+            }
+        }
+        data = json.dumps(query, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[SearchCacheEntry]:
+        """Get a live entry, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.stored_at >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return SearchCacheEntry(list(entry.records), entry.complete, entry.stored_at)
+
+    def put(self, key: str, records: List[NumberRecord], complete: bool) -> None:
+        """Store the results of a search, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = SearchCacheEntry(list(records), complete, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict_number(self, number: str) -> int:
+        """Remove a number from every entry.
+
+        Returns:
+            Number of entries it was removed from
+        """
+        removed = 0
+        with self._lock:
+            for entry in self._entries.values():
+                kept = [record for record in entry.records if record.number != number]
+                if len(kept) != len(entry.records):
+                    entry.records = kept
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+_shared_cache: Optional[SearchCache] = None
+_shared_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache shared by all services."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache()
+        return _shared_cache
@@ -0,0 +1,371 @@
+"""Concurrent multi-page search engine for available phone numbers.
+
+A logical search is split into shards (one query per area code or region),
+and each shard is crawled by following ``next_page_url`` until it is
+exhausted. Pages of all shards are interleaved, round-robin or weighted,
+fetched concurrently under a bounded limit and streamed to the caller as
+soon as they arrive.
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ..models.country_data import COUNTRY_DATA
+
+logger = logging.getLogger(__name__)
+
+# Countries where Twilio accepts the AreaCode search filter
+AREA_CODE_COUNTRIES = {"US", "CA"}
+
+# Twilio filters that already pin a search to a location; such searches are
+# not sharded further
+LOCATION_FILTERS = {
+    "AreaCode", "InRegion", "InLocality", "InPostalCode",
+    "InRateCenter", "InLata", "NearNumber", "NearLatLong"
+}
+
+# Search filter names accepted by the service layer, mapped to Twilio's
+SEARCH_FILTER_PARAMS = {
+    "contains": "Contains",
+    "area_code": "AreaCode",
+    "region": "InRegion",
+    "state": "InRegion",
+    "locality": "InLocality",
+    "city": "InLocality",
+    "postal_code": "InPostalCode",
+    "near_lat_long": "NearLatLong",
+    "distance": "Distance",
+    "exclude_all_address_required": "ExcludeAllAddressRequired",
+    "beta": "Beta"
+}
+
+# Twilio filters that may be split into one shard per value, in order of preference
+SHARDABLE_PARAMS = ("AreaCode", "InRegion", "InLocality", "InPostalCode")
+
+# Fields of an AvailablePhoneNumbers entry checked by residual filters
+RESIDUAL_FIELDS = {
+    "AreaCode": "area_code",
+    "InRegion": "region",
+    "InLocality": "locality",
+    "InPostalCode": "postal_code"
+}
+
+# Patterns Twilio's Contains filter accepts: digits, letters and * wildcards
+CONTAINS_PATTERN = re.compile(r"^\+?[0-9A-Za-z*]{2,}$")
+
+# Signature of a page fetcher: (shard_params, page_url) -> page dict
+PageFetcher = Callable[[Dict[str, Any], Optional[str]], Awaitable[Dict]]
+
+# Smallest shard weight; keeps zero-yield shards in the schedule
+MIN_SHARD_WEIGHT = 0.01
+
+# Queue marker signalling that every shard has been crawled
+_DONE = object()
+
+def build_search_params(capabilities: Optional[Dict] = None,
+                        page_size: int = 50,
+                        filters: Optional[Dict] = None) -> Dict[str, Any]:
+    """Build query parameters for an AvailablePhoneNumbers search.
+
+    Args:
+        capabilities: Required capabilities (voice/sms/mms)
+        page_size: Numbers requested per page
+        filters: Raw Twilio filters (AreaCode, InRegion, ...)
+
+    Returns:
+        Query parameter dict
+    """
+    params: Dict[str, Any] = {
+        "PageSize": page_size
+    }
+
+    # Add capabilities filtering
+    if capabilities:
+        if capabilities.get("voice"):
+            params["VoiceEnabled"] = "true"
+        if capabilities.get("sms"):
+            params["SmsEnabled"] = "true"
+        if capabilities.get("mms"):
+            params["MmsEnabled"] = "true"
+
+    if filters:
+        params.update(filters)
+
+    return params
+
+@dataclass
+class SearchQuery:
+    """A search split into what Twilio evaluates and what we check locally."""
+    params: Dict[str, Any] = field(default_factory=dict)  # Filters sent with every request
+    shards: Optional[List[Dict[str, Any]]] = None  # One sub-query per value of a multi-valued filter
+    pattern: Optional[re.Pattern] = None  # Number pattern Contains cannot express
+    residual: Dict[str, set] = field(default_factory=dict)  # Entry field -> accepted values
+
+    def matches(self, num: Dict) -> bool:
+        """Check an AvailablePhoneNumbers entry against the residual predicates."""
+        if self.pattern and not self.pattern.search(num.get("phone_number", "")):
+            return False
+        for field_name, values in self.residual.items():
+            if field_name == "area_code":
+                # Not returned by Twilio; only derivable for NANP numbers
+                value = num.get("phone_number", "")[2:5]
+            else:
+                value = num.get(field_name) or ""
+            if str(value).lower() not in values:
+                return False
+        return True
+
+def _format_filter(value: Any) -> str:
+    """Format a filter value the way Twilio expects it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (tuple, list)):
+        return ",".join(str(part) for part in value)
+    return str(value)
+
+def plan_search_query(pattern: Optional[str] = None,
+                      filters: Optional[Dict[str, Any]] = None) -> SearchQuery:
+    """Push as much of a search down to Twilio as it can evaluate.
+
+    Filters may use the snake_case names in SEARCH_FILTER_PARAMS or Twilio's
+    own names. A pattern Contains accepts, and every single-valued filter,
+    become query parameters. One multi-valued location filter (e.g.
+    several area codes) becomes one shard per value. What is left, a
+    pattern Contains cannot express or further multi-valued filters, is
+    checked client-side by ``SearchQuery.matches``.
+
+    Args:
+        pattern: Number pattern; Twilio syntax or a regular expression
+        filters: Search filters
+
+    Returns:
+        SearchQuery with the pushed-down and residual predicates
+    """
+    query = SearchQuery()
+    multi: Dict[str, List[Any]] = {}
+
+    for name, value in (filters or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        param = SEARCH_FILTER_PARAMS.get(name, name)
+        if param in query.params or param in multi:
+            continue
+        if param in SHARDABLE_PARAMS and isinstance(value, (list, set)):
+            values = list(dict.fromkeys(value))
+            if len(values) > 1:
+                multi[param] = values
+                continue
+            value = values[0]
+        query.params[param] = _format_filter(value)
+
+    if pattern:
+        pattern = pattern.strip()
+        if CONTAINS_PATTERN.match(pattern):
+            query.params["Contains"] = pattern
+        else:
+            try:
+                query.pattern = re.compile(pattern)
+            except re.error:
+                query.pattern = re.compile(re.escape(pattern))
+
+    # Shard on the filter earliest in SHARDABLE_PARAMS, check the others locally
+    for param in sorted(multi, key=SHARDABLE_PARAMS.index):
+        values = multi[param]
+        if query.shards is None:
+            query.shards = [{param: _format_filter(value)} for value in values]
+        else:
+            query.residual[RESIDUAL_FIELDS[param]] = {str(value).lower() for value in values}
+
+    return query
+
+def default_search_shards(country: str, region: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Split a search into disjoint sub-queries using COUNTRY_DATA.
+
+    Area-code countries are sharded per area code; other countries are
+    sharded per named region. Regions identified only by a dialing code
+    cannot be expressed as a Twilio filter and fall back to a single
+    country-wide query.
+
+    Args:
+        country: ISO country code
+        region: Optional region name to restrict the shards to
+
+    Returns:
+        List of Twilio query parameter dicts, one per shard. A single empty
+        dict means an unsharded, country-wide query.
+    """
+    country_info = COUNTRY_DATA.get(country)
+    if not country_info:
+        return [{}]
+
+    regions = country_info["regions"]
+    if region is not None:
+        regions = {region: regions[region]} if region in regions else {}
+
+    shards: List[Dict[str, Any]] = []
+    seen = set()
+    for details in regions.values():
+        if country in AREA_CODE_COUNTRIES:
+            candidates = [{"AreaCode": code} for code in details["area_codes"]]
+        elif details["code"] and not str(details["code"]).isdigit():
+            candidates = [{"InRegion": details["code"]}]
+        else:
+            candidates = []
+
+        for shard in candidates:
+            key = tuple(sorted(shard.items()))
+            if key not in seen:
+                seen.add(key)
+                shards.append(shard)
+
+    return shards or [{}]
+
+class SearchError(Exception):
+    """Raised when every shard of a search failed."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        detail = errors[0]["error"] if errors else "no shards"
+        super().__init__(f"All {len(errors)} search shard(s) failed: {detail}")
+
+class SearchEngine:
+    """Crawls search shards concurrently and streams result pages."""
+
+    def __init__(self, fetch_page: PageFetcher, concurrency: int = 4,
+                 max_pages_per_shard: Optional[int] = None,
+                 errors: Optional[List[Dict[str, Any]]] = None):
+        """Initialize the search engine.
+
+        Args:
+            fetch_page: Coroutine fetching one page. Called with the shard
+                parameters and no URL for the first page, then with the
+                ``next_page_url`` of the previous page.
+            concurrency: Maximum number of shards crawled at the same time
+            max_pages_per_shard: Optional cap on pages fetched per shard
+            errors: List receiving failed shards; a new one if None
+        """
+        self.fetch_page = fetch_page
+        self.concurrency = max(1, concurrency)
+        self.max_pages_per_shard = max_pages_per_shard
+        self.errors: List[Dict[str, Any]] = errors if errors is not None else []
+
+    async def stream(self, shards: Optional[List[Dict[str, Any]]] = None,
+                     weights: Optional[List[float]] = None) -> AsyncIterator[Dict]:
+        """Crawl all shards and yield pages in arrival order.
+
+        Pages are scheduled one at a time rather than a shard at a time:
+        after each page the shard's next page is queued behind the others,
+        so shards are crawled round-robin in the given order. With weights,
+        a shard's pages are spaced 1/weight apart, so a shard weighted 2 is
+        paged twice as often as one weighted 1 (stride scheduling).
+
+        A failing shard is logged and recorded in ``errors`` without
+        aborting the others. Breaking out of the iteration cancels any
+        in-flight requests.
+
+        Args:
+            shards: Shard query parameters; defaults to one unsharded query
+            weights: Positive weight per shard; equal weights if None
+
+        Raises:
+            SearchError: If every shard failed, once the others are done.
+
+        Yields:
+            Page dicts with ``numbers``, ``next_page_url``, ``uri``, the
+            ``shard`` parameters and the 1-based ``page`` depth
+        """
+        shards = shards or [{}]
+        strides = [1.0 / max(weight, MIN_SHARD_WEIGHT) for weight in weights or [1.0] * len(shards)]
+        # (pass, shard index, pages fetched, page URL); lowest pass is fetched next
+        ready: List[tuple] = [(strides[index], index, 0, None) for index in range(len(shards))]
+        heapq.heapify(ready)
+        in_flight = 0
+        changed = asyncio.Condition()
+        # Bounded so crawlers pause when the consumer falls behind
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            nonlocal in_flight
+            while True:
+                async with changed:
+                    # A page in flight may still queue its shard's next page
+                    await changed.wait_for(lambda: ready or not in_flight)
+                    if not ready:
+                        return
+                    pass_, index, depth, page_url = heapq.heappop(ready)
+                    in_flight += 1
+                next_url = None
+                try:
+                    next_url = await self._fetch(shards[index], page_url, depth, results)
+                finally:
+                    async with changed:
+                        in_flight -= 1
+                        if next_url:
+                            heapq.heappush(ready, (pass_ + strides[index], index, depth + 1, next_url))
+                        changed.notify_all()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, len(shards)))
+        ]
+
+        async def finish():
+            await asyncio.gather(*workers, return_exceptions=True)
+            await results.put(_DONE)
+
+        finisher = asyncio.create_task(finish())
+
+        try:
+            while True:
+                page = await results.get()
+                if page is _DONE:
+                    break
+                yield page
+
+            failed = {shard_key(error["shard"]) for error in self.errors}
+            if failed >= {shard_key(shard) for shard in shards}:
+                raise SearchError(self.errors)
+        finally:
+            for task in [*workers, finisher]:
+                task.cancel()
+            await asyncio.gather(*workers, finisher, return_exceptions=True)
+
+    async def _fetch(self, shard: Dict[str, Any], page_url: Optional[str],
+                     depth: int, results: asyncio.Queue) -> Optional[str]:
+        """Fetch one page of a shard.
+
+        Args:
+            shard: Query parameters for the shard
+            page_url: next_page_url of the previous page; None for the first
+            depth: Pages of the shard fetched so far
+            results: Queue receiving the fetched page
+
+        Returns:
+            URL of the shard's next page, or None once it is exhausted,
+            capped or failed
+        """
+        try:
+            page = await self.fetch_page(shard, page_url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Search shard {shard} failed after {depth} page(s): {e}")
+            self.errors.append({"shard": shard, "pages": depth, "error": str(e)})
+            return None
+
+        depth += 1
+        await results.put({**page, "shard": shard, "page": depth})
+
+        if not page.get("numbers"):
+            return None
+        if self.max_pages_per_shard is not None and depth >= self.max_pages_per_shard:
+            return None
+        return page.get("next_page_url")
+
+def shard_key(shard: Dict[str, Any]) -> str:
+    """Stable string identifying a shard, e.g. ``AreaCode=415``."""
+    return "&".join(f"{name}={value}" for name, value in sorted(shard.items()))
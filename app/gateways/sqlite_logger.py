@@ -0,0 +1,217 @@
+"""SQLite-backed history logger with indexed filtering.
+
+Drop-in alternative to FileLogger for large histories: entries are stored in
+a WAL-mode SQLite database with indexes on the fields the get_* queries
+filter by, so filtering and time-range lookups do not scan the full history.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .file_logger import FileLogger
+
+logger = logging.getLogger(__name__)
+
+# Table and indexed columns backing each history log
+_TABLES = {
+    "operations": ("operation", "number", "status"),
+    "searches": ("country", "type"),
+    "debug": ("component", "action"),
+}
+
+class SQLiteLogger(FileLogger):
+    """SQLite-backed logger exposing the FileLogger interface."""
+
+    def __init__(self, log_dir: str = "logs", background: bool = False,
+                 batch_size: int = 100, flush_interval: float = 0.5,
+                 db_name: str = "history.db"):
+        """Initialize the SQLite logger.
+
+        Args:
+            log_dir: Directory to store the database. Created if doesn't exist.
+            background: Write entries from a background thread instead of
+                the calling thread
+            batch_size: Maximum number of queued entries written per
+                transaction in background mode
+            flush_interval: Maximum seconds an entry waits in the queue
+                before its batch is written in background mode
+            db_name: File name of the database inside ``log_dir``
+        """
+        self.db_path = Path(log_dir) / db_name
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        super().__init__(
+            log_dir=log_dir,
+            background=background,
+            batch_size=batch_size,
+            flush_interval=flush_interval
+        )
+
+    def _open_storage(self) -> None:
+        """Open the database and create tables and indexes if needed."""
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        for table, columns in _TABLES.items():
+            column_defs = ", ".join(f"{column} TEXT" for column in columns)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                f"timestamp TEXT NOT NULL, {column_defs}, entry TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_timestamp "
+                f"ON {table} (timestamp)"
+            )
+            for column in columns:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} "
+                    f"ON {table} ({column}, timestamp)"
+                )
+
+    def _table_for(self, log_file: Path) -> str:
+        """Get the table that backs a history log.
+
+        Args:
+            log_file: Path identifying the log (e.g. ``self.operation_log``)
+
+        Returns:
+            Table name
+        """
+        return log_file.stem
+
+    def _write_entries(self, log_file: Path, entries: List[Dict[str, Any]]) -> None:
+        """Insert entries in a single transaction.
+
+        An entry that cannot be encoded or inserted is logged and skipped
+        without losing the rest of the batch.
+
+        Args:
+            log_file: Path identifying the log
+            entries: Log entries to write
+        """
+        table = self._table_for(log_file)
+        columns = _TABLES[table]
+        placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+        sql = (
+            f"INSERT INTO {table} (timestamp, {', '.join(columns)}, entry) "
+            f"VALUES ({placeholders})"
+        )
+
+        rows = []
+        for entry in entries:
+            try:
+                rows.append((
+                    entry["timestamp"],
+                    *(self._column_value(entry.get(column)) for column in columns),
+                    json.dumps(entry, separators=(",", ":"), default=str)
+                ))
+            except Exception as e:
+                logger.error(f"Skipping unencodable entry for {table} in {self.db_path}: {e}")
+
+        try:
+            with self._db_lock:
+                self._conn.execute("BEGIN")
+                try:
+                    for row in rows:
+                        try:
+                            self._conn.execute(sql, row)
+                        except sqlite3.Error as e:
+                            # A failed statement is undone on its own
+                            logger.error(f"Skipping entry rejected by {table} in {self.db_path}: {e}")
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+        except Exception as e:
+            logger.error(f"Failed to write to {table} in {self.db_path}: {e}")
+
+    @staticmethod
+    def _column_value(value: Any) -> Optional[str]:
+        """Convert an entry field to its indexed column value.
+
+        Args:
+            value: Field value from the entry
+
+        Returns:
+            String value for the column, or None if missing
+        """
+        return None if value is None else str(value)
+
+    def _query_log(self, log_file: Path, limit: int,
+                   filters: Optional[Dict[str, Any]] = None,
+                   since: Optional[datetime] = None,
+                   until: Optional[datetime] = None) -> List[Dict]:
+        """Return the newest matching entries using the table indexes.
+
+        Args:
+            log_file: Path identifying the log
+            limit: Maximum number of entries to return
+            filters: Field values entries must match exactly
+            since: Only include entries logged at or after this time
+            until: Only include entries logged at or before this time
+
+        Returns:
+            Up to ``limit`` matching entries, oldest first
+
+        Raises:
+            ValueError: If a filter field is not an indexed column.
+        """
+        if limit <= 0:
+            return []
+
+        # Make sure queued entries are visible to the reader
+        self.flush()
+
+        table = self._table_for(log_file)
+        clauses = []
+        params: List[Any] = []
+
+        for field, value in (filters or {}).items():
+            if field not in _TABLES[table]:
+                raise ValueError(f"Cannot filter {table} by '{field}'")
+            clauses.append(f"{field} = ?")
+            params.append(self._column_value(value))
+
+        since_bound = self._format_bound(since)
+        if since_bound is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since_bound)
+
+        until_bound = self._format_bound(until)
+        if until_bound is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until_bound)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT entry FROM {table} {where} "
+            f"ORDER BY timestamp DESC, id DESC LIMIT ?"
+        )
+        params.append(limit)
+
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        logs = [json.loads(entry) for (entry,) in rows]
+        logs.reverse()
+        return logs
+
+    def close(self) -> None:
+        """Flush pending entries, stop the writer and close the database."""
+        super().close()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
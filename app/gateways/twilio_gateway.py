@@ -1,43 +1,158 @@
-from typing import Optional, Dict, List
+from datetime import date
+from typing import Any, Callable, Optional, Dict, Iterator, List
 import logging
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
+from ..models.country_data import classify_number, get_monthly_price
 from ..models.phone_number_model import NumberRecord
 from .config import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN
+from .rate_limiter import ACCOUNT, CALLS, MESSAGES, PURCHASE, RateLimiter, get_rate_limiter
+from .retry import Retrier
 
 logger = logging.getLogger(__name__)
 
+# IncomingPhoneNumber fields making up a number's routing configuration
+NUMBER_CONFIG_FIELDS = (
+    "friendly_name",
+    "voice_url", "voice_method", "voice_fallback_url", "voice_fallback_method",
+    "voice_application_sid", "trunk_sid",
+    "sms_url", "sms_method", "sms_fallback_url", "sms_fallback_method",
+    "sms_application_sid",
+    "status_callback", "status_callback_method"
+)
+
 class TwilioGateway:
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 retrier: Optional[Retrier] = None):
         self._client: Optional[Client] = None
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retrier = retrier or Retrier()
 
     def get_client(self) -> Client:
         if not self._client:
             self._client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
         return self._client
 
+    def _call(self, endpoint: str, operation: str, request: Callable[..., Any],
+              *args, idempotent: bool = False,
+              reconcile: Optional[Callable[[], Any]] = None, **kwargs) -> Any:
+        """Run a client request under the endpoint's rate limit with retries."""
+        def attempt() -> Any:
+            self.rate_limiter.acquire(endpoint)
+            try:
+                result = request(*args, **kwargs)
+            except TwilioRestException as e:
+                # The client does not expose Retry-After, so the default pause applies
+                self.rate_limiter.on_response(endpoint, e.status)
+                raise
+            self.rate_limiter.on_response(endpoint, 200)
+            return result
+
+        return self.retrier.call(
+            operation, attempt, idempotent=idempotent, reconcile=reconcile
+        )
+
+    def find_owned_number(self, phone_number: str) -> Optional[Any]:
+        """Find a number already on the account; the purchase idempotency check."""
+        owned = self._call(
+            ACCOUNT,
+            "find_owned_number",
+            self.get_client().incoming_phone_numbers.list,
+            idempotent=True,
+            phone_number=phone_number,
+            limit=1
+        )
+        return owned[0] if owned else None
+
+    @staticmethod
+    def _to_number_record(number: Any) -> NumberRecord:
+        """Convert an IncomingPhoneNumber resource to a NumberRecord."""
+        country, type_ = classify_number(number.phone_number)
+        capabilities = number.capabilities or {}
+        return NumberRecord(
+            number=number.phone_number,
+            country=country,
+            type=type_,
+            capabilities=[name for name, enabled in capabilities.items() if enabled],
+            price=get_monthly_price(country, type_),
+            sid=number.sid,
+            friendly_name=number.friendly_name,
+            date_updated=number.date_updated.isoformat() if number.date_updated else None
+        )
+
     def list_numbers(self, filters: Optional[Dict] = None) -> List[NumberRecord]:
         """List active phone numbers with optional filtering."""
         try:
-            numbers = self.get_client().incoming_phone_numbers.list(**filters or {})
-            return [
-                NumberRecord(
-                    number=n.phone_number,
-                    city=n.locality,
-                    state=n.region,
-                    type="local" if n.address_requirements == "local" else "toll-free",
-                    price=float(n.voice_rate)
-                ) for n in numbers
-            ]
+            numbers = self._call(
+                ACCOUNT,
+                "list_numbers",
+                self.get_client().incoming_phone_numbers.list,
+                idempotent=True,
+                **filters or {}
+            )
+            return [self._to_number_record(n) for n in numbers]
+        except TwilioRestException as e:
+            logger.error(f"Failed to list numbers: {e}")
+            raise
+
+    def iter_number_pages(self, filters: Optional[Dict] = None,
+                          page_size: int = 50) -> Iterator[List[NumberRecord]]:
+        """Lazily page through active phone numbers.
+
+        Each page is fetched only when the previous one has been consumed,
+        under the rate limiter and with retries, so memory stays bounded by
+        the page size and the first page is available after one request.
+
+        Args:
+            filters: Optional list filters, as accepted by list_numbers
+            page_size: Numbers per API page
+
+        Yields:
+            One list of NumberRecord objects per page
+        """
+        try:
+            page = self._call(
+                ACCOUNT,
+                "list_numbers",
+                self.get_client().incoming_phone_numbers.page,
+                idempotent=True,
+                page_size=page_size,
+                **filters or {}
+            )
+            while page is not None:
+                yield [self._to_number_record(n) for n in page]
+                if not page.next_page_url:
+                    break
+                page = self._call(ACCOUNT, "list_numbers", page.next_page, idempotent=True)
         except TwilioRestException as e:
             logger.error(f"Failed to list numbers: {e}")
             raise
 
+    def stream_numbers(self, filters: Optional[Dict] = None,
+                       page_size: int = 50) -> Iterator[NumberRecord]:
+        """Lazily yield active phone numbers, one page at a time.
+
+        Args:
+            filters: Optional list filters, as accepted by list_numbers
+            page_size: Numbers per API page
+
+        Yields:
+            NumberRecord objects in API order
+        """
+        for records in self.iter_number_pages(filters, page_size):
+            yield from records
+
     def purchase_number(self, phone_number: str) -> Optional[str]:
         """Purchase a phone number, returns SID if successful."""
         try:
-            number = self.get_client().incoming_phone_numbers.create(
+            # The phone number is the idempotency key: before retrying an
+            # ambiguous failure, check whether the purchase went through
+            number = self._call(
+                PURCHASE,
+                "purchase_number",
+                self.get_client().incoming_phone_numbers.create,
+                reconcile=lambda: self.find_owned_number(phone_number),
                 phone_number=phone_number
             )
             logger.info(f"Successfully purchased number: {phone_number}")
@@ -48,18 +163,53 @@ class TwilioGateway:
 
     def release_number(self, sid: str) -> bool:
         """Release a phone number by SID."""
+        delete = self.get_client().incoming_phone_numbers(sid).delete
+        attempts = 0
+
+        def release() -> bool:
+            nonlocal attempts
+            attempts += 1
+            try:
+                return delete()
+            except TwilioRestException as e:
+                # A retry after a lost success response finds the number gone
+                if e.status == 404 and attempts > 1:
+                    logger.info(f"Number {sid} already released by an earlier attempt")
+                    return True
+                raise
+
         try:
-            self.get_client().incoming_phone_numbers(sid).delete()
+            self._call(PURCHASE, "release_number", release, idempotent=True)
             logger.info(f"Successfully released number with SID: {sid}")
             return True
         except TwilioRestException as e:
             logger.error(f"Failed to release number {sid}: {e}")
             raise
 
+    def get_number_config(self, sid: str) -> Dict:
+        """Fetch the routing configuration of a phone number."""
+        try:
+            number = self._call(
+                ACCOUNT,
+                "get_number_config",
+                self.get_client().incoming_phone_numbers(sid).fetch,
+                idempotent=True
+            )
+            return {field: getattr(number, field, None) for field in NUMBER_CONFIG_FIELDS}
+        except TwilioRestException as e:
+            logger.error(f"Failed to fetch config for number {sid}: {e}")
+            raise
+
     def update_number_config(self, sid: str, config: Dict) -> bool:
         """Update phone number configuration."""
         try:
-            self.get_client().incoming_phone_numbers(sid).update(**config)
+            self._call(
+                PURCHASE,
+                "update_number_config",
+                self.get_client().incoming_phone_numbers(sid).update,
+                idempotent=True,
+                **config
+            )
             logger.info(f"Successfully updated config for number {sid}")
             return True
         except TwilioRestException as e:
@@ -69,7 +219,10 @@ class TwilioGateway:
     def make_call(self, from_: str, to: str) -> str:
         """Initiate a call, returns call SID."""
         try:
-            call = self.get_client().calls.create(
+            call = self._call(
+                CALLS,
+                "make_call",
+                self.get_client().calls.create,
                 to=to,
                 from_=from_,
                 url="http://demo.twilio.com/docs/voice.xml"  # Default TwiML
@@ -83,7 +236,10 @@ class TwilioGateway:
     def send_sms(self, from_: str, to: str, body: str) -> str:
         """Send SMS message, returns message SID."""
         try:
-            message = self.get_client().messages.create(
+            message = self._call(
+                MESSAGES,
+                "send_sms",
+                self.get_client().messages.create,
                 to=to,
                 from_=from_,
                 body=body
@@ -94,24 +250,127 @@ class TwilioGateway:
             logger.error(f"Failed to send SMS from {from_} to {to}: {e}")
             raise
 
-    def list_logs(self, type_: str, sid: Optional[str] = None, 
-                 page_token: Optional[str] = None) -> Dict:
-        """List logs by type (calls/messages) with optional filtering."""
+    def list_applications(self) -> List[Any]:
+        """List the account's TwiML applications."""
         try:
-            client = self.get_client()
-            resource = client.calls if type_ == "calls" else client.messages
-            
-            filters = {"page_size": 20}
-            if sid:
-                filters["sid"] = sid
-            if page_token:
-                filters["page_token"] = page_token
-
-            logs = resource.list(**filters)
+            return self._call(
+                ACCOUNT,
+                "list_applications",
+                self.get_client().applications.list,
+                idempotent=True
+            )
+        except TwilioRestException as e:
+            logger.error(f"Failed to list applications: {e}")
+            raise
+
+    def list_sip_trunks(self) -> List[Any]:
+        """List the account's Elastic SIP trunks."""
+        try:
+            return self._call(
+                ACCOUNT,
+                "list_sip_trunks",
+                self.get_client().trunking.v1.trunks.list,
+                idempotent=True
+            )
+        except TwilioRestException as e:
+            logger.error(f"Failed to list SIP trunks: {e}")
+            raise
+
+    def fetch_billing(self) -> Dict:
+        """Fetch the account balance and last month's charges."""
+        try:
+            balance = self._call(
+                ACCOUNT,
+                "fetch_billing",
+                self.get_client().api.balance.fetch,
+                idempotent=True
+            )
+            charges = self._call(
+                ACCOUNT,
+                "fetch_billing",
+                self.get_client().api.balance.last_month.fetch,
+                idempotent=True
+            )
+            return {
+                "balance": float(balance.balance),
+                "currency": balance.currency,
+                "last_month_charges": float(charges.total),
+                "last_month_usage": float(charges.usage_charges),
+                "last_month_fees": float(charges.total_fee)
+            }
+        except TwilioRestException as e:
+            logger.error(f"Failed to fetch billing information: {e}")
+            raise
+
+    def list_daily_usage(self, start_date: date, end_date: date) -> List[Dict]:
+        """List per-day, per-category usage records for a date range.
+
+        Args:
+            start_date: First day, inclusive
+            end_date: Last day, inclusive
+
+        Returns:
+            Dicts with day, category, usage, units and cost
+        """
+        try:
+            records = self._call(
+                ACCOUNT,
+                "list_daily_usage",
+                self.get_client().usage.records.daily.list,
+                idempotent=True,
+                start_date=start_date,
+                end_date=end_date
+            )
+            return [
+                {
+                    "day": record.start_date,
+                    "category": record.category,
+                    "usage": float(record.usage or 0),
+                    "units": record.usage_unit,
+                    "cost": float(record.price or 0)
+                }
+                for record in records
+            ]
+        except TwilioRestException as e:
+            logger.error(f"Failed to list daily usage: {e}")
+            raise
+
+    def fetch_log_page(self, type_: str, page_size: int = 20,
+                       page_url: Optional[str] = None, **filters) -> Dict:
+        """Fetch one page of call or message logs.
+
+        Args:
+            type_: "calls" or "messages"
+            page_size: Entries per page, used for the first page only
+            page_url: next_page_token of a previous page; the first page if None
+            **filters: List filters for the first page
+
+        Returns:
+            Dict with the page's ``items`` and the ``next_page_token``,
+            None on the last page
+        """
+        try:
+            resource = self.get_client().calls if type_ == "calls" else self.get_client().messages
+            endpoint = CALLS if type_ == "calls" else MESSAGES
+            if page_url:
+                page = self._call(
+                    endpoint, "list_logs", resource.get_page, page_url, idempotent=True
+                )
+            else:
+                page = self._call(
+                    endpoint, "list_logs", resource.page,
+                    idempotent=True, page_size=page_size, **filters
+                )
             return {
-                "items": list(logs),
-                "next_page_token": logs.next_page_url
+                "items": list(page),
+                "next_page_token": page.next_page_url
             }
         except TwilioRestException as e:
             logger.error(f"Failed to list {type_} logs: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def list_logs(self, type_: str, sid: Optional[str] = None, 
+                 page_token: Optional[str] = None) -> Dict:
+        """List logs by type (calls/messages) with optional filtering."""
+        filters = {"sid": sid} if sid else {}
+        return self.fetch_log_page(type_, 20, page_token, **filters)
@@ -0,0 +1,138 @@
+"""Local SQLite cache of daily usage records.
+
+Twilio's per-day usage records do not change once a day is over, so each
+past day is fetched once and read locally from then on. The days fetched
+are recorded separately from the records, since a day without usage has
+no records but is still known.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+class UsageStore:
+    """SQLite-backed cache of per-day, per-category usage."""
+
+    def __init__(self, db_path: str = "logs/usage.db"):
+        """Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_usage ("
+            "day TEXT NOT NULL, "
+            "category TEXT NOT NULL, "
+            "usage REAL NOT NULL, "
+            "units TEXT, "
+            "cost REAL NOT NULL, "
+            "PRIMARY KEY (day, category))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetched_days (day TEXT PRIMARY KEY, fetched_at TEXT NOT NULL)"
+        )
+
+    def missing_days(self, start: date, end: date,
+                     settle: timedelta = timedelta(days=1),
+                     recent_ttl: timedelta = timedelta(minutes=15)) -> List[date]:
+        """List the days of a range that need fetching.
+
+        A day needs fetching if it never was, or if it was fetched before it
+        settled (within ``settle`` of its end, while usage could still be
+        added) and that fetch is older than ``recent_ttl``.
+
+        Args:
+            start: First day, inclusive
+            end: Last day, inclusive
+            settle: Time after a day's end before its usage is final
+            recent_ttl: How long a fetch of an unsettled day stays valid
+        """
+        with self._lock:
+            fetched = dict(self._conn.execute(
+                "SELECT day, fetched_at FROM fetched_days WHERE day BETWEEN ? AND ?",
+                (start.isoformat(), end.isoformat())
+            ))
+        now = datetime.utcnow()
+        missing = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            fetched_at = fetched.get(day.isoformat())
+            if fetched_at is None:
+                missing.append(day)
+                continue
+            fetched_at = datetime.fromisoformat(fetched_at)
+            settled_at = datetime.combine(day, datetime.min.time()) + timedelta(days=1) + settle
+            if fetched_at < settled_at and now - fetched_at > recent_ttl:
+                missing.append(day)
+        return missing
+
+    def store_days(self, start: date, end: date, records: Iterable[Dict]) -> None:
+        """Replace the records of a range of days and mark them fetched.
+
+        Args:
+            start: First day, inclusive
+            end: Last day, inclusive
+            records: Dicts with day, category, usage, units and cost
+        """
+        rows = [
+            (record["day"].isoformat(), record["category"], record["usage"],
+             record["units"], record["cost"])
+            for record in records
+        ]
+        days = [
+            ((start + timedelta(days=offset)).isoformat(), datetime.utcnow().isoformat())
+            for offset in range((end - start).days + 1)
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM daily_usage WHERE day BETWEEN ? AND ?",
+                    (start.isoformat(), end.isoformat())
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO daily_usage (day, category, usage, units, cost) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO fetched_days (day, fetched_at) VALUES (?, ?)",
+                    days
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load(self, start: date, end: date) -> List[Dict]:
+        """Get the cached records of a range of days, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, category, usage, units, cost FROM daily_usage "
+                "WHERE day BETWEEN ? AND ? ORDER BY day, category",
+                (start.isoformat(), end.isoformat())
+            ).fetchall()
+        return [
+            {"day": date.fromisoformat(day), "category": category,
+             "usage": usage, "units": units, "cost": cost}
+            for day, category, usage, units, cost in rows
+        ]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
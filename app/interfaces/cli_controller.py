@@ -4,6 +4,7 @@ import logging
 from typing import Optional
 from rich.console import Console
 from ..gateways.config import load_settings
+from ..gateways.rate_limiter import configure_rate_limiter
 from ..shared.logging import configure_logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,7 @@ class CLIController:
         """Initialize the CLI controller."""
         self.settings = load_settings()
         configure_logging(self.settings)
+        configure_rate_limiter(self.settings)
         self.console = Console()
         
         # Services will be initialized here in future phases
@@ -23,14 +23,20 @@ class ActiveNumbersMenu(BaseMenu):
         self.number_service = NumberService()
         self.numbers: List[NumberRecord] = []
         
-    def show(self) -> None:
-        """Display the active numbers menu."""
+    def show(self, force_refresh: bool = False) -> None:
+        """Display the active numbers menu.
+        
+        Args:
+            force_refresh: Refresh the cached inventory before listing.
+        """
         self.clear_screen()
         self.render_header("Active Phone Numbers")
         
         try:
             # Fetch active numbers
-            self.numbers = self.number_service.list_active_numbers()
+            self.numbers = self.number_service.list_active_numbers(
+                force_refresh=force_refresh
+            )
             
             if not self.numbers:
                 self.console.print("[yellow]No active numbers found![/yellow]")
@@ -54,13 +60,16 @@ class ActiveNumbersMenu(BaseMenu):
                 )
             
             self.console.print(table)
-            self.console.print("\nSelect a number to manage or 'b' to go back.")
+            self.console.print(
+                "\nSelect a number to manage, 'r' to refresh or 'b' to go back."
+            )
             
             # Build options dict
             options: Dict[str, Callable] = {
                 str(i): lambda n=number: self.manage_number(n)
                 for i, number in enumerate(self.numbers, 1)
             }
+            options["r"] = self.refresh_numbers
             
             while self.prompt_choice(options):
                 self.clear_screen()
@@ -82,4 +91,13 @@ class ActiveNumbersMenu(BaseMenu):
         """
         menu = NumberActionsMenu(number, parent=self)
         menu.show()
-        return True
\ No newline at end of file
+        return True
+
+    def refresh_numbers(self) -> bool:
+        """Refresh the number list from Twilio.
+        
+        Returns:
+            False to exit the current menu loop once the refreshed list closes.
+        """
+        self.show(force_refresh=True)
+        return False
@@ -52,7 +52,7 @@ class ReleaseMenu(BaseMenu):
         
         try:
             # Release the number
-            self.number_service.release_number(self.number.number)
+            self.number_service.release_number(self.number.sid)
             self.console.print("\n[green]Number released successfully![/green]")
             
         except Exception as e:
@@ -1,15 +1,29 @@
 """Menu for confirming number purchases."""
 
 import asyncio
+import hashlib
+from pathlib import Path
 from typing import Dict, List, Optional
 from textual.widgets import Static, Button, DataTable
 from textual.screen import Screen
 from textual.containers import Vertical, Horizontal
 from textual.binding import Binding
+from textual.coordinate import Coordinate
 
-from ....models.phone_number_model import NumberRecord
+from ....models.phone_number_model import NumberRecord, PurchaseResult
 from ....services.number_service import NumberService
 
+def purchase_checkpoint_path(numbers: List[NumberRecord], log_dir: str = "logs") -> Path:
+    """Get the checkpoint file of a purchase of these numbers.
+    
+    The name is derived from the selection, so confirming the same numbers
+    again resumes an interrupted purchase.
+    """
+    digest = hashlib.sha1("\n".join(sorted(num.number for num in numbers)).encode()).hexdigest()
+    path = Path(log_dir) / f"purchase_checkpoint_{digest[:12]}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
 class PurchaseConfirmMenu(Screen):
     """Menu for confirming and executing number purchases."""
 
@@ -19,9 +33,12 @@ class PurchaseConfirmMenu(Screen):
         Binding("q", "toggle_queue", "Toggle Queue", show=True)
     ]
 
-    def __init__(self, numbers: List[NumberRecord], **kwargs):
+    def __init__(self, numbers: List[NumberRecord],
+                 checkpoint_path: Optional[str] = None, **kwargs):
         super().__init__(**kwargs)
         self.numbers = numbers
+        # Resumable purchase checkpoint file
+        self.checkpoint_path = checkpoint_path or purchase_checkpoint_path(numbers)
         self.number_service = NumberService()
         self.status: Optional[Static] = None
         self.table: Optional[DataTable] = None
@@ -39,7 +56,7 @@ class PurchaseConfirmMenu(Screen):
         for number in self.numbers:
             capabilities = ", ".join(number.capabilities) if number.capabilities else "N/A"
             table.add_row(
-                number.phone_number,
+                number.number,
                 number.type,
                 capabilities,
                 "Pending"
@@ -94,9 +111,7 @@ class PurchaseConfirmMenu(Screen):
         if not self.table:
             return
             
-        row = list(self.table.get_row(index))
-        row[2] = status
-        self.table.update_row(index, *row)
+        self.table.update_cell_at(Coordinate(index, 3), status)
 
     def _update_purchase_mode(self):
         """Update UI elements based on purchase mode."""
@@ -128,12 +143,14 @@ class PurchaseConfirmMenu(Screen):
         try:
             if self.use_queue:
                 # Queue all numbers at once
-                result = await self.number_service.queue_purchase(
-                    [num.phone_number for num in self.numbers]
+                added = await self.number_service.queue_purchase(
+                    [num.number for num in self.numbers]
                 )
                 
-                if result:
-                    self.status.update("✓ All numbers queued for purchase")
+                if added is not None:
+                    self.status.update(
+                        f"✓ Queued {added} of {len(self.numbers)} numbers for purchase"
+                    )
                     for i in range(len(self.numbers)):
                         self._update_number_status(i, "✓ Queued")
                 else:
@@ -142,30 +159,43 @@ class PurchaseConfirmMenu(Screen):
                         self._update_number_status(i, "✖ Queue Failed")
                 
             else:
-                # Purchase numbers immediately
-                for i, number in enumerate(self.numbers):
-                    try:
-                        # Update status
-                        self._update_number_status(i, "Purchasing...")
-                        self.status.update(f"Purchasing number {i+1} of {len(self.numbers)}...")
-                        
-                        # Purchase number
-                        result = await self.number_service.purchase_number(number.phone_number)
-                        
-                        # Update status based on result
-                        if result:
-                            self._update_number_status(i, "✓ Purchased")
-                        else:
-                            self._update_number_status(i, "✖ Failed")
-                        
-                    except Exception as e:
-                        self._update_number_status(i, f"✖ Error: {str(e)}")
+                # Purchase numbers concurrently, updating rows as they finish
+                rows = {num.number: i for i, num in enumerate(self.numbers)}
+                labels = {
+                    "purchasing": "Purchasing...",
+                    "purchased": "✓ Purchased",
+                    "skipped": "✓ Already Purchased"
+                }
+                done = 0
+                
+                def on_progress(result: PurchaseResult):
+                    nonlocal done
+                    if result.status == "failed":
+                        label = f"✖ Error: {result.error}"
+                    else:
+                        label = labels[result.status]
+                    self._update_number_status(rows[result.number], label)
                     
-                    # Small delay between purchases
-                    await asyncio.sleep(0.5)
+                    if result.status != "purchasing":
+                        done += 1
+                        self.status.update(f"Processed {done} of {len(self.numbers)} numbers...")
+                
+                summary = await self.number_service.purchase_numbers(
+                    list(rows),
+                    progress=on_progress,
+                    checkpoint_path=self.checkpoint_path
+                )
                 
                 # Update final status
-                self.status.update("Purchase complete")
+                if summary.complete:
+                    self.status.update("Purchase complete")
+                    # Nothing left to resume
+                    Path(self.checkpoint_path).unlink(missing_ok=True)
+                else:
+                    self.status.update(
+                        f"Purchase finished: {len(summary.purchased)} purchased, "
+                        f"{len(summary.failed)} failed"
+                    )
             
         except Exception as e:
             self.status.update(f"Error: {str(e)}")
@@ -184,4 +214,4 @@ class PurchaseConfirmMenu(Screen):
     async def action_confirm_purchase(self):
         """Handle purchase confirmation."""
         if not self.purchase_in_progress:
-            await self._purchase_numbers() (confirm purchase)
+            await self._purchase_numbers()
@@ -1,13 +1,13 @@
 """Menu showing search progress for available numbers."""
 
 import asyncio
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional
 from textual.widgets import ProgressBar, Static, DataTable
 from textual.screen import Screen
 from textual.containers import Vertical
 from textual.binding import Binding
 
-from ....models.phone_number_model import NumberRecord
+from ....core.search_session import SearchSession, search_strategies, strategy_filters
 from ....services.number_service import NumberService
 from .search_results_menu import SearchResultsMenu
 
@@ -39,16 +39,15 @@ class SearchProgressMenu(Screen):
         self.progress: Optional[ProgressBar] = None
         self.status: Optional[Static] = None
         self.stats: Optional[Static] = None
-        self.found_numbers: Set[str] = set()
         self.search_cancelled = False
         
         # Search parameters
         self.batch_size = 50
-        self.max_numbers = 500
-        self.max_empty_rounds = 3
-        self.empty_rounds = 0
-        self.total_batches = 0
-        self.total_requests = 0
+        self.session = SearchSession(
+            max_numbers=500,
+            empty_limit=3,
+            strategies=search_strategies(country_code, locality)
+        )
 
     def compose(self):
         """Create child widgets."""
@@ -69,64 +68,67 @@ class SearchProgressMenu(Screen):
     def _update_stats(self):
         """Update search statistics."""
         self.stats.update(
-            f"Found: {len(self.found_numbers)} | "
-            f"Batches: {self.total_batches} | "
-            f"Requests: {self.total_requests} | "
-            f"Empty Rounds: {self.empty_rounds}"
+            f"Found: {self.session.total_numbers} | "
+            f"Batches: {self.session.total_batches} | "
+            f"Saturation: {self.session.saturation:.0%} | "
+            f"Empty Rounds: {self.session.empty_streak}"
         )
 
     async def _search_numbers(self):
-        """Search for available numbers."""
+        """Search for available numbers, consuming pages as they stream in.
+        
+        Each query strategy is searched until the session reports its pool
+        saturated, then the next one is started; the search ends when the
+        session is full or every strategy is exhausted.
+        """
         self.status.update("Starting search...")
         
-        while (len(self.found_numbers) < self.max_numbers and 
-               self.empty_rounds < self.max_empty_rounds and
-               not self.search_cancelled):
-            
-            # Update progress
-            progress = min(100, (len(self.found_numbers) / self.max_numbers) * 100)
-            self.progress.update(progress=progress)
+        while not self.search_cancelled and not self.session.should_stop():
+            strategy = self.session.strategy
+            pages = self.number_service.stream_available(
+                country=self.country_code,
+                type_=self.number_type,
+                capabilities=self.capabilities,
+                pattern=self.search_pattern,
+                locality=self.locality,
+                page_size=self.batch_size,
+                filters=strategy_filters(strategy, self.country_code)
+            )
+            exhausted = True
             
             try:
-                # Search batch
-                self.total_batches += 1
-                self.total_requests += 1
-                
-                new_numbers = await self.number_service.search_available(
-                    country=self.country_code,
-                    type_=self.number_type,
-                    capabilities=self.capabilities,
-                    pattern=self.search_pattern,
-                    locality=self.locality,
-                    limit=self.batch_size
-                )
-                
-                # Update status
-                if not new_numbers:
-                    self.empty_rounds += 1
-                    self.status.update(f"No numbers found in batch {self.total_batches}")
-                else:
-                    self.empty_rounds = 0
-                    new_count = len(new_numbers)
-                    old_count = len(self.found_numbers)
-                    self.found_numbers.update(num.phone_number for num in new_numbers)
-                    unique_count = len(self.found_numbers) - old_count
+                async for new_numbers in pages:
+                    if self.search_cancelled:
+                        break
                     
-                    self.status.update(
-                        f"Batch {self.total_batches}: "
-                        f"Found {new_count} numbers ({unique_count} unique)"
-                    )
-                
-                self._update_stats()
-                
-                # Small delay between batches
-                await asyncio.sleep(1)
-                
+                    batch = self.session.add_batch(new_numbers)
+                    if not batch.unique:
+                        self.status.update(f"No new numbers in batch {batch.batch}")
+                    else:
+                        self.status.update(
+                            f"Batch {batch.batch}: "
+                            f"Found {batch.returned} numbers ({batch.unique} unique)"
+                        )
+                    
+                    # Update progress
+                    progress = min(100, (self.session.total_numbers / self.session.max_numbers) * 100)
+                    self.progress.update(progress=progress)
+                    self._update_stats()
+                    
+                    if self.session.should_stop() or self.session.strategy != strategy:
+                        exhausted = False
+                        break
+            
             except Exception as e:
-                self.status.update(f"Error in batch {self.total_batches}: {str(e)}")
-                self.empty_rounds += 1
+                self.status.update(f"Error in batch {self.session.total_batches}: {str(e)}")
                 self._update_stats()
-                await asyncio.sleep(2)
+                break
+            
+            finally:
+                await pages.aclose()
+            
+            if exhausted:
+                self.session.finish_strategy()
         
         # Search complete
         if not self.search_cancelled:
@@ -134,24 +136,14 @@ class SearchProgressMenu(Screen):
 
     async def _show_results(self):
         """Show search results."""
-        if not self.found_numbers:
+        numbers = self.session.get_numbers()
+        if not numbers:
             self.status.update("No numbers found")
             self._update_stats()
             await asyncio.sleep(2)
             await self.app.pop_screen()
             return
         
-        # Convert to NumberRecord list
-        numbers = [
-            NumberRecord(
-                phone_number=num,
-                country=self.country_code,
-                type=self.number_type,
-                capabilities=self.capabilities
-            )
-            for num in self.found_numbers
-        ]
-        
         # Show results menu
         await self.app.push_screen(SearchResultsMenu(numbers=numbers))
 
@@ -161,4 +153,4 @@ class SearchProgressMenu(Screen):
         self.status.update("Cancelling search...")
         self._update_stats()
         await asyncio.sleep(1)
-        await self.app.pop_screen() (Rich progress bar)
+        await self.app.pop_screen()
@@ -70,7 +70,7 @@ class SearchResultsMenu(Screen):
         
         for number in self.numbers[start:end]:
             self.table.add_row(
-                number.phone_number,
+                number.number,
                 number.type,
                 number.region or "N/A",
                 "✓" if number in self.selected_numbers else ""
@@ -137,7 +137,7 @@ class SearchResultsMenu(Screen):
         # Sort numbers
         if column == 0:  # Number
             self.numbers.sort(
-                key=lambda x: x.phone_number,
+                key=lambda x: x.number,
                 reverse=self.sort_reverse
             )
         elif column == 1:  # Type
@@ -202,4 +202,4 @@ class SearchResultsMenu(Screen):
             if number not in self.selected_numbers:
                 self.selected_numbers.append(number)
         
-        self._update_table() (paginated results table)
+        self._update_table()
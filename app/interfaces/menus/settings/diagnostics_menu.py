@@ -5,6 +5,8 @@ from typing import Dict, Callable
 from datetime import datetime, timedelta
 from rich.table import Table
 from ..base_menu import BaseMenu
+from ....core.search_analytics import aggregate_searches, rank_shapes
+from ....gateways.file_logger import FileLogger
 from ....services.diagnostics_service import DiagnosticsService
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,7 @@ class DiagnosticsMenu(BaseMenu):
         """
         super().__init__(parent)
         self.diagnostics_service = DiagnosticsService()
+        self.file_logger = FileLogger()
     
     def show(self) -> None:
         """Display the diagnostics menu."""
@@ -31,7 +34,8 @@ class DiagnosticsMenu(BaseMenu):
             '2': self.show_rate_limits,
             '3': self.show_system_health,
             '4': self.show_api_latency,
-            '5': self.show_error_trends
+            '5': self.show_error_trends,
+            '6': self.show_search_yield
         }
         
         while self.prompt_choice(options):
@@ -272,4 +276,61 @@ class DiagnosticsMenu(BaseMenu):
         except Exception as e:
             logger.exception("Error showing error trends")
             self.console.print(f"[red]Error: {str(e)}[/red]")
-            return True
\ No newline at end of file
+            return True
+    
+    def show_search_yield(self) -> bool:
+        """Show the best and worst performing search query shapes.
+        
+        Returns:
+            True to continue menu loop.
+        """
+        try:
+            searches = self.file_logger.get_search_history(
+                limit=1000,
+                since=datetime.utcnow() - timedelta(days=7)
+            )
+            shapes = aggregate_searches(searches, by=("country", "type", "area_code"))
+            top, bottom = rank_shapes(shapes, limit=5)
+            
+            if not top:
+                self.console.print("[yellow]No searches logged yet![/yellow]")
+                return True
+            
+            for title, style, rows in (
+                ("Top Performers", "bold green", top),
+                ("Bottom Performers", "bold red", bottom)
+            ):
+                if not rows:
+                    continue
+                table = Table(show_header=True, header_style=style)
+                table.add_column("Country")
+                table.add_column("Type")
+                table.add_column("Area Code")
+                table.add_column("Searches")
+                table.add_column("Unique/s")
+                table.add_column("Unique/Page")
+                table.add_column("Duplicates")
+                table.add_column("Throttles")
+                
+                for shape in rows:
+                    table.add_row(
+                        shape.shape["country"] or "",
+                        shape.shape["type"] or "",
+                        str(shape.shape["area_code"] or "All"),
+                        str(shape.searches),
+                        f"{shape.unique_per_second:.1f}",
+                        f"{shape.unique_per_page:.1f}",
+                        f"{shape.duplicate_rate:.0%}",
+                        f"{shape.throttles:.0f}"
+                    )
+                
+                self.console.print(f"\n[{style}]Search Yield: {title}[/{style}]")
+                self.console.print(table)
+            
+            self.console.print("Last 7 days, ranked by unique numbers per second")
+            return True
+            
+        except Exception as e:
+            logger.exception("Error showing search yield")
+            self.console.print(f"[red]Error: {str(e)}[/red]")
+            return True
@@ -1,6 +1,7 @@
 """Data models for account-related information."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Dict, Optional
 
 @dataclass
@@ -10,6 +11,16 @@ class UsageStats:
     cost: float  # Total cost for the period
     projection: float  # Projected monthly cost
 
+@dataclass
+class UsageDay:
+    """Usage and cost of a single day."""
+    date: datetime  # Start of the day (UTC)
+    voice_minutes: float  # Call minutes
+    sms_count: float  # SMS messages
+    total_cost: float  # Total cost in USD
+    moving_average: float  # Trailing average of total daily cost in USD
+    costs: Dict[str, float] = field(default_factory=dict)  # Category -> cost, non-zero only
+
 @dataclass
 class BillingInfo:
     """Account billing information."""
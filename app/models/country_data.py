@@ -221,3 +221,58 @@ def get_regions(country: str) -> dict[str, dict]:
         raise KeyError(f"Country code '{country}' not found")
     
     return COUNTRY_DATA[country]['regions'].copy()
+
+# International dialing prefixes of the supported countries
+DIAL_CODES = {'US': '1', 'CA': '1', 'GB': '44', 'AU': '61'}
+
+# NANP toll-free area codes
+NANP_TOLLFREE_CODES = {800, 833, 844, 855, 866, 877, 888}
+
+def classify_number(number: str) -> tuple[str | None, str]:
+    """Infer the country and number type of an E.164 number.
+    
+    Twilio does not report either for owned numbers, so they are derived
+    from the dialing prefix and COUNTRY_DATA area codes.
+    
+    Args:
+        number: Phone number in E.164 format
+        
+    Returns:
+        Tuple of ISO country code (None if unsupported) and number type
+        (local/mobile/tollfree).
+    """
+    digits = number.lstrip('+')
+    
+    if digits.startswith('1') and len(digits) >= 4:
+        area_code = int(digits[1:4])
+        if area_code in NANP_TOLLFREE_CODES:
+            return 'US', 'tollfree'
+        if area_code in get_area_codes('CA'):
+            return 'CA', 'local'
+        return 'US', 'local'
+    
+    if digits.startswith('44'):
+        national = digits[2:]
+        if national.startswith(('800', '808')):
+            return 'GB', 'tollfree'
+        return 'GB', 'mobile' if national.startswith('7') else 'local'
+    
+    if digits.startswith('61'):
+        national = digits[2:]
+        if national.startswith('180'):
+            return 'AU', 'tollfree'
+        return 'AU', 'mobile' if national.startswith('4') else 'local'
+    
+    return None, 'local'
+
+def get_monthly_price(country: str | None, number_type: str) -> float | None:
+    """Get the monthly price of a number type.
+    
+    Args:
+        country: ISO country code (e.g., 'US', 'CA')
+        number_type: Number type (local/mobile/tollfree)
+        
+    Returns:
+        Monthly price in USD, or None if unknown.
+    """
+    return COUNTRY_DATA.get(country or '', {}).get('number_types', {}).get(number_type)
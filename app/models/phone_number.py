@@ -0,0 +1,16 @@
+"""Data model for exported phone numbers."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+@dataclass
+class PhoneNumber:
+    """Owned phone number as shown in listings and exports."""
+    number: str  # E.164 format phone number
+    friendly_name: Optional[str] = None  # Friendly name set on the account
+    city: Optional[str] = None  # City/locality
+    state: Optional[str] = None  # State/region code
+    country: Optional[str] = None  # ISO country code
+    capabilities: Dict[str, bool] = field(default_factory=dict)  # Capability -> enabled
+    added_at: Optional[datetime] = None  # Time the number was added to the account
@@ -1,7 +1,7 @@
 """Data models for phone number records."""
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 @dataclass
 class NumberRecord:
@@ -16,6 +16,62 @@ class NumberRecord:
     rate_center: Optional[str] = None  # Rate center
     latitude: Optional[float] = None  # Geographic latitude
     longitude: Optional[float] = None  # Geographic longitude
+    sid: Optional[str] = None  # Twilio SID, set for owned numbers
+    friendly_name: Optional[str] = None  # Friendly name, set for owned numbers
+    date_updated: Optional[str] = None  # ISO format last change time, set for owned numbers
+
+@dataclass
+class PurchaseResult:
+    """Outcome of purchasing a single number in a bulk run."""
+    number: str  # E.164 format phone number
+    status: str  # purchasing/purchased/failed/skipped
+    sid: Optional[str] = None  # Twilio SID once purchased
+    error: Optional[str] = None  # Error message if failed
+
+@dataclass
+class PurchaseSummary:
+    """Summary of a bulk purchase run."""
+    purchased: Dict[str, str] = field(default_factory=dict)  # Number -> SID bought in this run
+    failed: Dict[str, str] = field(default_factory=dict)  # Number -> error message
+    skipped: Dict[str, str] = field(default_factory=dict)  # Number -> SID bought by an earlier run
+
+    @property
+    def complete(self) -> bool:
+        """Whether every requested number is now owned."""
+        return not self.failed
+
+@dataclass
+class PurchaseJob:
+    """Queued purchase of a single number."""
+    number: str  # E.164 format phone number, unique per queue
+    status: str  # queued/in_progress/purchased/failed
+    attempts: int = 0  # Times a worker has claimed the job
+    sid: Optional[str] = None  # Twilio SID once purchased
+    error: Optional[str] = None  # Last error message
+    created_at: Optional[str] = None  # ISO format enqueue time
+    updated_at: Optional[str] = None  # ISO format time of the last change
+
+@dataclass
+class ReleasePlan:
+    """Dry-run plan of a bulk release."""
+    numbers: List[NumberRecord] = field(default_factory=list)  # Owned numbers to release
+    missing: List[str] = field(default_factory=list)  # Requested SIDs not on the account
+    monthly_savings: float = 0.0  # Projected monthly savings in USD
+    unpriced: List[str] = field(default_factory=list)  # Numbers with no known price
+
+@dataclass
+class ReleaseSummary:
+    """Summary of a bulk release run."""
+    released: Dict[str, str] = field(default_factory=dict)  # SID -> number
+    failed: Dict[str, str] = field(default_factory=dict)  # SID -> error message
+    monthly_savings: float = 0.0  # Monthly savings of the released numbers in USD
+
+@dataclass
+class ConfigApplySummary:
+    """Summary of applying a configuration to many numbers."""
+    updated: Dict[str, Dict] = field(default_factory=dict)  # SID -> fields changed
+    unchanged: List[str] = field(default_factory=list)  # SIDs already matching
+    failed: Dict[str, str] = field(default_factory=dict)  # SID -> error message
 
 @dataclass
 class SearchSession:
@@ -1,79 +1,263 @@
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
+import base64
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from ..core.export import LOG_FIELDS, export_records
+from ..core.usage_analytics import build_matrix, moving_average, project_cost, rollup
+from ..gateways.log_store import LogStore, to_utc_iso
 from ..gateways.twilio_gateway import TwilioGateway
-from ..models.account_model import UsageStats
+from ..gateways.usage_store import UsageStore
+from ..models.account_model import UsageDay, UsageStats
+from ..shared.cache import cached
 
 logger = logging.getLogger(__name__)
 
+LOG_TYPES = ("calls", "messages")
+
+# List filter selecting each log type's entries newer than a timestamp
+SYNC_FILTERS = {"calls": "start_time_after", "messages": "date_sent_after"}
+
+# Menu and API names of log types, mapped to entry types
+LOG_TYPE_ALIASES = {
+    "call": "call", "calls": "call", "voice": "call",
+    "message": "message", "messages": "message", "messaging": "message", "sms": "message"
+}
+
+def _to_log_entry(type_: str, log: Any) -> Dict:
+    """Convert a call or message resource to an account log entry."""
+    if type_ == "calls":
+        return {
+            "sid": log.sid,
+            "type": "call",
+            "timestamp": log.start_time,
+            "direction": log.direction,
+            "from": log.from_,
+            "to": log.to,
+            "status": log.status,
+            "duration": log.duration,
+            "price": float(log.price or 0)
+        }
+    return {
+        "sid": log.sid,
+        "type": "message",
+        "timestamp": log.date_created,
+        "direction": log.direction,
+        "from": log.from_,
+        "to": log.to,
+        "status": log.status,
+        "body": log.body,
+        "price": float(log.price or 0)
+    }
+
+def _sort_key(entry: Dict) -> float:
+    """Newest-first merge key; entries without a timestamp sort last."""
+    timestamp = entry["timestamp"]
+    return timestamp.timestamp() if timestamp else float("-inf")
+
+class LogCursor:
+    """Lazy cursor over one upstream log listing, newest first.
+
+    The cursor is the URL of the current page and the offset of the next
+    unconsumed entry in it, so it can be saved in a page token and resumed
+    by refetching a single page.
+    """
+
+    def __init__(self, gateway: TwilioGateway, type_: str, page_size: int = 20,
+                 page_url: Optional[str] = None, offset: int = 0,
+                 filters: Optional[Dict] = None):
+        self.gateway = gateway
+        self.type_ = type_
+        self.page_size = page_size
+        self.page_url = page_url
+        self.offset = offset
+        self.filters = filters or {}
+        self.exhausted = False
+        self._items: Optional[List[Dict]] = None
+        self._next_url: Optional[str] = None
+
+    def _load(self) -> None:
+        page = self.gateway.fetch_log_page(
+            self.type_, self.page_size, self.page_url, **self.filters
+        )
+        self._items = [_to_log_entry(self.type_, log) for log in page["items"]]
+        self._next_url = page["next_page_token"]
+
+    def peek(self) -> Optional[Dict]:
+        """Get the next entry without consuming it, fetching a page if needed."""
+        while not self.exhausted:
+            if self._items is None:
+                self._load()
+            if self.offset < len(self._items):
+                return self._items[self.offset]
+            if not self._next_url:
+                self.exhausted = True
+            else:
+                self.page_url, self.offset = self._next_url, 0
+                self._items = None
+        return None
+
+    def pop(self) -> Dict:
+        """Consume the entry returned by peek."""
+        entry = self.peek()
+        self.offset += 1
+        return entry
+
+    @property
+    def state(self) -> Optional[List]:
+        """Resumable [page_url, offset] position, None once exhausted."""
+        if self.exhausted:
+            return None
+        if self._items is not None and self.offset >= len(self._items):
+            # Point at the next page without fetching it yet
+            return [self._next_url, 0] if self._next_url else None
+        return [self.page_url, self.offset]
+
+def merge_logs(cursors: List[LogCursor]) -> Iterator[Dict]:
+    """K-way merge of log cursors into one newest-first stream.
+
+    Each upstream listing is already sorted, so only the head of each
+    cursor is compared and a cursor fetches its next page only when its
+    head is consumed.
+    """
+    while True:
+        heads = [(cursor, cursor.peek()) for cursor in cursors]
+        heads = [(cursor, entry) for cursor, entry in heads if entry is not None]
+        if not heads:
+            return
+        cursor, _ = max(heads, key=lambda head: _sort_key(head[1]))
+        yield cursor.pop()
+
+def _resolve_log_type(log_type: Optional[str]) -> Optional[str]:
+    """Map a log type name to an entry type; None or "all" selects every type."""
+    if not log_type or log_type == "all":
+        return None
+    if log_type not in LOG_TYPE_ALIASES:
+        raise ValueError(f"Unknown log type: {log_type}")
+    return LOG_TYPE_ALIASES[log_type]
+
 class AccountService:
-    def __init__(self, twilio_gateway: TwilioGateway):
+    def __init__(self, twilio_gateway: TwilioGateway,
+                 log_store: Optional[LogStore] = None,
+                 usage_store: Optional[UsageStore] = None):
         self.twilio_gateway = twilio_gateway
+        self.log_store = log_store
+        self.usage_store = usage_store
+
+    def _get_usage_store(self) -> UsageStore:
+        """Get the usage store, creating the default one on first use."""
+        if self.usage_store is None:
+            self.usage_store = UsageStore()
+        return self.usage_store
+
+    def _load_usage(self, start: date, end: date) -> List[Dict]:
+        """Get daily usage records, fetching only days not cached yet."""
+        store = self._get_usage_store()
+        missing = store.missing_days(start, end)
+        
+        # Fetch each run of consecutive missing days in a single request
+        runs: List[List[date]] = []
+        for day in missing:
+            if runs and (day - runs[-1][-1]).days == 1:
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+        for run in runs:
+            records = self.twilio_gateway.list_daily_usage(run[0], run[-1])
+            store.store_days(run[0], run[-1], records)
+        
+        if runs:
+            logger.debug(f"Fetched usage for {len(missing)} day(s) in {len(runs)} request(s)")
+        return store.load(start, end)
+
+    @cached(ttl=300, stale_ttl=3600)
+    def _fetch_usage(self, days: int) -> UsageStats:
+        """Compute usage statistics; results are cached."""
+        # Calculate date range
+        end_date = datetime.utcnow().date()
+        start_date = end_date - timedelta(days=days - 1)
+        
+        matrix = build_matrix(self._load_usage(start_date, end_date), start_date, end_date)
+        daily_cost = matrix.daily_cost()
+        
+        return UsageStats(
+            usage=rollup(matrix),
+            cost=float(daily_cost.sum()),
+            projection=project_cost(daily_cost)
+        )
 
     def get_usage(self, days: int = 30) -> UsageStats:
         """
         Get usage statistics for the specified time period.
         Returns UsageStats with usage metrics and costs.
+        
+        Daily usage is cached locally and only missing days are fetched.
+        The projection extrapolates the recency-weighted trend of daily
+        cost over the next 30 days.
         """
         try:
-            client = self.twilio_gateway.get_client()
-            
-            # Calculate date range
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=days)
-            
-            # Get usage records
-            records = client.usage.records.list(
-                start_date=start_date.date(),
-                end_date=end_date.date()
-            )
+            return self._fetch_usage(days)
+        except Exception as e:
+            logger.error(f"Failed to get usage statistics: {e}")
+            return UsageStats(usage={}, cost=0.0, projection=0.0)
+
+    def get_usage_history(self, start_date: datetime, end_date: datetime,
+                          window: int = 7) -> List[UsageDay]:
+        """
+        Get day-by-day usage for a date range.
+        
+        Args:
+            start_date: First day, inclusive
+            end_date: Last day, inclusive
+            window: Days in the moving average of daily cost
             
-            # Calculate totals
-            total_cost = sum(float(record.price) for record in records)
-            usage_by_category = {
-                record.category: {
-                    "usage": record.usage,
-                    "units": record.usage_unit,
-                    "cost": float(record.price)
-                }
-                for record in records
-            }
+        Returns:
+            One UsageDay per day, oldest first
+        """
+        try:
+            start = start_date.date() if isinstance(start_date, datetime) else start_date
+            end = end_date.date() if isinstance(end_date, datetime) else end_date
             
-            # Project monthly cost based on current usage
-            daily_avg = total_cost / days
-            monthly_projection = daily_avg * 30
+            matrix = build_matrix(self._load_usage(start, end), start, end)
+            daily_cost = matrix.daily_cost()
+            average = moving_average(daily_cost, window)
+            voice = matrix.column("calls")
+            sms = matrix.column("sms")
             
-            return UsageStats(
-                usage=usage_by_category,
-                cost=total_cost,
-                projection=monthly_projection
-            )
+            return [
+                UsageDay(
+                    date=datetime.combine(day, datetime.min.time()),
+                    voice_minutes=float(voice[index]),
+                    sms_count=float(sms[index]),
+                    total_cost=float(daily_cost[index]),
+                    moving_average=float(average[index]),
+                    costs={
+                        category: float(cost)
+                        for category, cost in zip(matrix.categories, matrix.cost[index])
+                        if cost
+                    }
+                )
+                for index, day in enumerate(matrix.days)
+            ]
             
         except Exception as e:
-            logger.error(f"Failed to get usage statistics: {e}")
-            return UsageStats(usage={}, cost=0.0, projection=0.0)
+            logger.error(f"Failed to get usage history: {e}")
+            return []
+
+    @cached(ttl=60, stale_ttl=600)
+    def _fetch_billing(self) -> Dict:
+        """Fetch balance and last month's charges; results are cached."""
+        return self.twilio_gateway.fetch_billing()
 
     def get_billing(self) -> Dict:
         """
         Get billing information including current balance and last payment.
+        
+        Served from cache for a minute, then refreshed in the background
+        while the cached figures are still shown.
         """
         try:
-            client = self.twilio_gateway.get_client()
-            
-            # Get balance
-            balance = client.api.balance.fetch()
-            
-            # Get recent charges
-            charges = client.api.balance.last_month.fetch()
-            
-            return {
-                "balance": float(balance.balance),
-                "currency": balance.currency,
-                "last_month_charges": float(charges.total),
-                "last_month_usage": float(charges.usage_charges),
-                "last_month_fees": float(charges.total_fee)
-            }
-            
+            return self._fetch_billing()
         except Exception as e:
             logger.error(f"Failed to get billing information: {e}")
             return {
@@ -84,44 +268,99 @@ class AccountService:
                 "last_month_fees": 0.0
             }
 
-    def get_account_logs(self, page_token: Optional[str] = None) -> Dict:
+    @staticmethod
+    def _encode_page_token(state: Dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @staticmethod
+    def _decode_page_token(token: str) -> Dict:
+        return json.loads(base64.urlsafe_b64decode(token.encode()))
+
+    def get_account_logs(self, page_token: Optional[str] = None,
+                         page_size: int = 20,
+                         log_type: Optional[str] = None,
+                         status: Optional[str] = None,
+                         start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None,
+                         force_refresh: bool = False) -> Dict:
         """
-        Get account-wide logs (calls and messages).
-        Supports pagination.
+        Get account-wide logs (calls and messages), newest first.
+        
+        With a log store, entries are synced incrementally when the store is
+        stale and then filtered and paged locally; the page token holds the
+        (timestamp, sid) of the last entry returned, so entries synced
+        between pages do not shift the next one. Without one, calls and
+        messages are merged from independent upstream cursors; the page
+        token records where each cursor stopped, so the next page resumes
+        both listings exactly, refetching at most one upstream page of each.
+        
+        Args:
+            page_token: Token from a previous page; the first page if None
+            page_size: Maximum entries per page
+            log_type: "call"/"voice", "message"/"messaging", or None/"all"
+            status: Only entries with this status
+            start_date: Only entries at or after this time
+            end_date: Only entries at or before this time
+            force_refresh: Sync the log store even if it is fresh
+            
+        Returns:
+            Dict with ``items`` and ``next_page_token``, None on the last page
         """
         try:
-            # Get both call and message logs
-            call_logs = self.twilio_gateway.list_logs("calls", page_token=page_token)
-            message_logs = self.twilio_gateway.list_logs("messages", page_token=page_token)
+            entry_type = _resolve_log_type(log_type)
             
-            # Combine and sort by timestamp
-            all_logs = []
-            all_logs.extend([{
-                "type": "call",
-                "timestamp": log.start_time,
-                "from": log.from_,
-                "to": log.to,
-                "status": log.status,
-                "duration": log.duration,
-                "price": float(log.price or 0)
-            } for log in call_logs["items"]])
+            if self.log_store is not None:
+                self._ensure_logs_synced(force_refresh)
+                after = None
+                if page_token:
+                    timestamp, sid = self._decode_page_token(page_token)["after"]
+                    after = (datetime.fromisoformat(timestamp) if timestamp else None, sid)
+                all_logs = self.log_store.query(
+                    type_=entry_type, status=status, start=start_date, end=end_date,
+                    limit=page_size + 1, after=after
+                )
+                items = all_logs[:page_size]
+                next_token = None
+                if len(all_logs) > page_size:
+                    last = items[-1]
+                    next_token = self._encode_page_token(
+                        {"after": [to_utc_iso(last["timestamp"]), last["sid"]]}
+                    )
+                return {
+                    "items": items,
+                    "next_page_token": next_token
+                }
+            
+            state = self._decode_page_token(page_token) if page_token else {
+                type_: [None, 0] for type_ in LOG_TYPES
+                if entry_type in (None, LOG_TYPE_ALIASES[type_])
+            }
+            cursors = [
+                LogCursor(self.twilio_gateway, type_, page_size, *state[type_])
+                for type_ in LOG_TYPES if state.get(type_) is not None
+            ]
             
-            all_logs.extend([{
-                "type": "message",
-                "timestamp": log.date_created,
-                "from": log.from_,
-                "to": log.to,
-                "status": log.status,
-                "body": log.body,
-                "price": float(log.price or 0)
-            } for log in message_logs["items"]])
+            all_logs = []
+            for entry in merge_logs(cursors):
+                timestamp = entry["timestamp"]
+                if end_date and timestamp and to_utc_iso(timestamp) > to_utc_iso(end_date):
+                    continue
+                if start_date and timestamp and to_utc_iso(timestamp) < to_utc_iso(start_date):
+                    # Every listing is newest first, so nothing older can match
+                    cursors = []
+                    break
+                if status and entry["status"] != status:
+                    continue
+                all_logs.append(entry)
+                if len(all_logs) >= page_size:
+                    break
             
-            # Sort by timestamp descending
-            all_logs.sort(key=lambda x: x["timestamp"], reverse=True)
+            next_state = {cursor.type_: cursor.state for cursor in cursors}
+            has_more = any(position is not None for position in next_state.values())
             
             return {
                 "items": all_logs,
-                "next_page_token": call_logs.get("next_page_token") or message_logs.get("next_page_token")
+                "next_page_token": self._encode_page_token(next_state) if has_more else None
             }
             
         except Exception as e:
@@ -130,3 +369,135 @@ class AccountService:
                 "items": [],
                 "next_page_token": None
             }
+
+    def get_logs(self, number: str, log_type: Optional[str] = "all",
+                 page: int = 1, page_size: int = 10,
+                 direction: Optional[str] = None, status: Optional[str] = None,
+                 force_refresh: bool = False) -> List[Dict]:
+        """
+        Get the calls and messages of one number from the log store.
+        
+        Args:
+            number: Phone number the entries are from or to
+            log_type: "call"/"voice", "message"/"messaging", or None/"all"
+            page: 1-based page number
+            page_size: Entries per page
+            direction: Only entries with this direction, e.g. "inbound"
+            status: Only entries with this status
+            force_refresh: Sync the log store even if it is fresh
+            
+        Returns:
+            Log entries, newest first
+        """
+        try:
+            self._ensure_logs_synced(force_refresh)
+            return self._get_log_store().query(
+                number=number, type_=_resolve_log_type(log_type),
+                direction=direction, status=status,
+                limit=page_size, offset=(max(page, 1) - 1) * page_size
+            )
+        except Exception as e:
+            logger.error(f"Failed to get logs for {number}: {e}")
+            return []
+
+    def export_logs(self, filename: str, log_type: Optional[str] = "all",
+                    start_date: Optional[datetime] = None,
+                    end_date: Optional[datetime] = None,
+                    number: Optional[str] = None) -> int:
+        """
+        Export logs from the log store to a file, streaming batch by batch.
+        
+        The format follows the extension: .json, .jsonl, .csv, .parquet, or
+        .json.gz/.jsonl.gz/.csv.gz for gzip-compressed output.
+        
+        Args:
+            filename: Output file
+            log_type: "call"/"voice", "message"/"messaging", or None/"all"
+            start_date: Only entries at or after this time
+            end_date: Only entries at or before this time
+            number: Only entries from or to this number
+            
+        Returns:
+            Number of entries exported
+        """
+        self._ensure_logs_synced()
+        entries = self._get_log_store().iter_query(
+            number=number, type_=_resolve_log_type(log_type),
+            start=start_date, end=end_date
+        )
+        return export_records(entries, filename, LOG_FIELDS)
+
+    def _get_log_store(self) -> LogStore:
+        """Get the log store, creating the default one on first use."""
+        if self.log_store is None:
+            self.log_store = LogStore()
+        return self.log_store
+
+    def _ensure_logs_synced(self, force: bool = False) -> None:
+        """Sync the log store if it is stale or a sync is forced."""
+        if force or not self._get_log_store().is_fresh():
+            self.sync_logs()
+
+    def sync_logs(self, lookback: timedelta = timedelta(hours=1),
+                  page_size: int = 1000) -> Dict[str, int]:
+        """
+        Pull calls and messages newer than the store's high-water marks.
+        
+        The window starts ``lookback`` before each mark, so calls and
+        messages that were still in progress at the last sync get their
+        final status. Entries are upserted by SID, making the overlap free
+        of duplicates. A failed type keeps its mark and is retried in full
+        next time; the store only counts as fresh once every type synced.
+        
+        Args:
+            lookback: Overlap with the previous sync
+            page_size: Entries per upstream page
+            
+        Returns:
+            Number of entries synced per log type
+        """
+        store = self._get_log_store()
+        counts = {}
+        failed = []
+        for type_ in LOG_TYPES:
+            mark = store.high_water_mark(type_)
+            filters = {SYNC_FILTERS[type_]: mark - lookback} if mark else {}
+            cursor = LogCursor(self.twilio_gateway, type_, page_size, filters=filters)
+            
+            try:
+                newest = mark
+                batch: List[Dict] = []
+                counts[type_] = 0
+                for entry in merge_logs([cursor]):
+                    batch.append(entry)
+                    timestamp = entry["timestamp"]
+                    if timestamp and (newest is None or to_utc_iso(timestamp) > to_utc_iso(newest)):
+                        newest = timestamp
+                    if len(batch) >= page_size:
+                        counts[type_] += store.upsert(batch)
+                        batch = []
+                counts[type_] += store.upsert(batch)
+                if newest:
+                    store.set_high_water_mark(type_, newest)
+            except Exception as e:
+                logger.error(f"Failed to sync {type_} logs: {e}")
+                failed.append(type_)
+        
+        if failed:
+            # Leave the store stale so the next read retries the sync
+            logger.warning(f"Account log sync incomplete, failed: {', '.join(failed)}")
+        else:
+            store.mark_synced()
+        logger.info(f"Synced account logs: {counts}")
+        return counts
+
+    def iter_account_logs(self, page_size: int = 50) -> Iterator[Dict]:
+        """
+        Iterate over all account logs, newest first, fetching pages lazily.
+        
+        Args:
+            page_size: Entries per upstream page
+        """
+        return merge_logs([
+            LogCursor(self.twilio_gateway, type_, page_size) for type_ in LOG_TYPES
+        ])
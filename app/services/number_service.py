@@ -1,11 +1,28 @@
 """Service layer for phone number operations."""
 
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Union
+import asyncio
+import json
 import logging
-from ..gateways.twilio_gateway import TwilioGateway
+import os
+import time
+from ..gateways.twilio_gateway import NUMBER_CONFIG_FIELDS, TwilioGateway
 from ..gateways.http_gateway import HTTPGateway
+from ..gateways.async_http_gateway import AsyncHTTPGateway
 from ..gateways.file_logger import FileLogger
-from ..models.phone_number_model import NumberRecord
+from ..gateways.inventory_cache import InventoryCache
+from ..gateways.purchase_queue import PurchaseQueue
+from ..gateways.rate_limiter import SEARCH
+from ..gateways.search_cache import SearchCache, get_search_cache
+from ..gateways.search_engine import plan_search_query, shard_key
+from ..models.country_data import classify_number, get_monthly_price
+from ..shared.cache import cached
+from ..core.query_planner import QueryPlanner
+from ..models.phone_number_model import (
+    ConfigApplySummary, NumberRecord, PurchaseJob, PurchaseResult,
+    PurchaseSummary, ReleasePlan, ReleaseSummary
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,61 +30,136 @@ class NumberService:
     """Service for managing phone numbers."""
 
     def __init__(self, twilio_gateway: TwilioGateway,
-                 http_gateway: HTTPGateway,
-                 file_logger: Optional[FileLogger] = None):
+                 http_gateway: Union[HTTPGateway, AsyncHTTPGateway],
+                 file_logger: Optional[FileLogger] = None,
+                 purchase_queue: Optional[PurchaseQueue] = None,
+                 inventory_cache: Optional[InventoryCache] = None,
+                 search_cache: Optional[SearchCache] = None,
+                 query_planner: Optional[QueryPlanner] = None):
         self.twilio_gateway = twilio_gateway
         self.http_gateway = http_gateway
         self.file_logger = file_logger
+        self.purchase_queue = purchase_queue
+        self.inventory_cache = inventory_cache
+        # An empty SearchCache is falsy, so compare with None
+        self.search_cache = search_cache if search_cache is not None else get_search_cache()
+        self.query_planner = query_planner or QueryPlanner(file_logger)
+        self._queue_workers: List[asyncio.Task] = []
+        self._queue_recovered = False
 
-    async def search_available(self, country: str, type_: str,
-                             capabilities: Optional[Dict] = None,
-                             pattern: Optional[str] = None,
-                             locality: Optional[Dict] = None,
-                             limit: int = 50) -> List[NumberRecord]:
+    async def stream_available(self, country: str, type_: str,
+                               capabilities: Optional[Dict] = None,
+                               pattern: Optional[str] = None,
+                               locality: Optional[Dict] = None,
+                               page_size: int = 50,
+                               concurrency: int = 4,
+                               filters: Optional[Dict] = None) -> AsyncIterator[List[NumberRecord]]:
         """
-        Search for available phone numbers with filtering.
+        Stream available phone numbers page by page as they arrive.
+        
+        Country-wide searches are sharded across the area codes/regions in
+        COUNTRY_DATA and crawled concurrently, following next_page_url;
+        the query planner weights shards by their historical yield.
+        
+        The pattern and filters are pushed down to Twilio as query
+        parameters; several values of one location filter are searched as
+        one shard each. Only predicates Twilio cannot evaluate (a regex
+        pattern, further multi-valued filters) are checked on the results.
+        
+        Results are cached briefly per normalized query. A repeated search
+        first replays the cached results; only if those were cut short and
+        the caller keeps reading is the API searched again, skipping numbers
+        already yielded.
         
         Args:
             country: Country code (e.g., 'US')
             type_: Number type (local/mobile/toll-free)
             capabilities: Required capabilities (voice/sms/mms)
             pattern: Number pattern to match
-            locality: Location filters (city/state)
-            limit: Maximum numbers to return
+            locality: Location filters (city/state/postal_code)
+            page_size: Numbers requested per page
+            concurrency: Maximum concurrent page requests
+            filters: Further search filters (area_code, near_lat_long,
+                distance, exclude_all_address_required, beta)
             
-        Returns:
-            List of available NumberRecord objects
+        Yields:
+            Lists of NumberRecord objects, one list per fetched page
+            
+        Raises:
+            SearchError: If every shard of the search failed. Results of a
+                search where only some shards failed are not cached as
+                complete.
         """
+        predicates = {**(locality or {}), **(filters or {})}
+        query = plan_search_query(pattern, predicates)
+        
+        key = SearchCache.fingerprint(country, type_, capabilities, pattern, predicates)
+        cached = self.search_cache.get(key)
+        records = list(cached.records) if cached else []
+        replayed = len(records)
+        for start in range(0, len(records), page_size):
+            yield records[start:start + page_size]
+        if cached and cached.complete:
+            return
+        
+        seen = {record.number for record in records}
+        complete = False
+        results_count = 0
+        duplicate_count = 0
+        page_depth = 0
+        shard_stats: Dict[str, Dict[str, int]] = {}
+        search_errors: List[Dict] = []
+        plan = self.query_planner.plan(country, type_, query.params, query.shards)
+        throttles = self._search_throttles()
+        # Latency counts only the time spent waiting for the gateway, not
+        # the time the caller takes between pages
+        latency = 0.0
+        waiting_since: Optional[float] = time.monotonic()
         try:
-            # Build search filters
-            filters = {}
-            if pattern:
-                filters["contains"] = pattern
-            if locality:
-                filters.update(locality)
-            
-            # Search using HTTP gateway for better pagination
-            result = self.http_gateway.search_batch(
+            async for page in self.http_gateway.search_stream(
                 country=country,
                 type_=type_,
                 capabilities=capabilities,
-                page_size=limit
-            )
-            
-            # Convert to NumberRecord objects
-            numbers = []
-            for num in result["numbers"]:
-                numbers.append(NumberRecord(
-                    phone_number=num["phone_number"],
-                    country=country,
-                    type=type_,
-                    capabilities=list(capabilities.keys()) if capabilities else [],
-                    region=num.get("region"),
-                    locality=num.get("locality"),
-                    rate_center=num.get("rate_center"),
-                    latitude=num.get("latitude"),
-                    longitude=num.get("longitude")
-                ))
+                page_size=page_size,
+                filters=query.params,
+                shards=plan.shards,
+                concurrency=concurrency,
+                weights=plan.weights,
+                errors=search_errors
+            ):
+                latency += time.monotonic() - waiting_since
+                waiting_since = None
+                results_count += len(page["numbers"])
+                page_depth = max(page_depth, page.get("page", 1))
+                matched = [
+                    self._to_number_record(num, country, type_, capabilities)
+                    for num in page["numbers"] if query.matches(num)
+                ]
+                numbers = [record for record in matched if record.number not in seen]
+                duplicate_count += len(matched) - len(numbers)
+                seen.update(record.number for record in numbers)
+                records.extend(numbers)
+                
+                stats = shard_stats.setdefault(shard_key(page.get("shard", {})), {
+                    "pages": 0, "results": 0, "unique": 0, "duplicates": 0
+                })
+                stats["pages"] += 1
+                stats["results"] += len(page["numbers"])
+                stats["unique"] += len(numbers)
+                stats["duplicates"] += len(matched) - len(numbers)
+                yield numbers
+                waiting_since = time.monotonic()
+            # Failed shards may hold numbers a repeated search should find
+            complete = not search_errors
+        
+        except Exception as e:
+            logger.error(f"Failed to search numbers: {e}")
+            raise
+        
+        finally:
+            if waiting_since is not None:
+                latency += time.monotonic() - waiting_since
+            self.search_cache.put(key, records, complete)
             
             # Log search
             if self.file_logger:
@@ -75,69 +167,454 @@ class NumberService:
                     country=country,
                     type_=type_,
                     capabilities=capabilities,
-                    results_count=len(numbers)
+                    results_count=results_count,
+                    shards=shard_stats or None,
+                    filters=query.params or None,
+                    latency=round(latency, 3),
+                    unique_count=len(records) - replayed,
+                    duplicate_count=duplicate_count,
+                    page_depth=page_depth,
+                    throttles=self._search_throttles() - throttles
                 )
+
+    async def search_available(self, country: str, type_: str,
+                             capabilities: Optional[Dict] = None,
+                             pattern: Optional[str] = None,
+                             locality: Optional[Dict] = None,
+                             limit: int = 50,
+                             filters: Optional[Dict] = None) -> List[NumberRecord]:
+        """
+        Search for available phone numbers with filtering.
+        
+        Args:
+            country: Country code (e.g., 'US')
+            type_: Number type (local/mobile/toll-free)
+            capabilities: Required capabilities (voice/sms/mms)
+            pattern: Number pattern to match
+            locality: Location filters (city/state/postal_code)
+            limit: Maximum numbers to return
+            filters: Further search filters, see stream_available
             
-            return numbers
-            
-        except Exception as e:
-            logger.error(f"Failed to search numbers: {e}")
-            return []
+        Returns:
+            List of available NumberRecord objects
+        """
+        numbers: Dict[str, NumberRecord] = {}
+        pages = self.stream_available(
+            country=country,
+            type_=type_,
+            capabilities=capabilities,
+            pattern=pattern,
+            locality=locality,
+            page_size=min(limit, 50),
+            filters=filters
+        )
+        try:
+            async for page in pages:
+                for record in page:
+                    numbers.setdefault(record.number, record)
+                if len(numbers) >= limit:
+                    break
+        finally:
+            await pages.aclose()
+        
+        return list(numbers.values())[:limit]
+
+    def _search_throttles(self) -> int:
+        """Get the number of throttled search requests so far."""
+        try:
+            return int(self.http_gateway.rate_limiter.bucket(SEARCH).throttles)
+        except (AttributeError, KeyError):
+            return 0
+
+    @staticmethod
+    def _to_number_record(num: Dict, country: str, type_: str,
+                          capabilities: Optional[Dict] = None) -> NumberRecord:
+        """Convert an AvailablePhoneNumbers API entry to a NumberRecord."""
+        return NumberRecord(
+            number=num["phone_number"],
+            country=country,
+            type=type_,
+            capabilities=list(capabilities.keys()) if capabilities else [],
+            region=num.get("region"),
+            locality=num.get("locality"),
+            rate_center=num.get("rate_center"),
+            latitude=num.get("latitude"),
+            longitude=num.get("longitude")
+        )
+
+    async def _purchase(self, number: str) -> Optional[str]:
+        """Purchase one number without blocking the event loop."""
+        if isinstance(self.http_gateway, AsyncHTTPGateway):
+            sid = await self.http_gateway.purchase_number(number)
+        else:
+            sid = await asyncio.to_thread(self.twilio_gateway.purchase_number, number)
+        self._cache_purchased(number, sid)
+        return sid
+
+    async def _find_owned_sid(self, number: str) -> Optional[str]:
+        """Get the SID of a number already on the account, if any."""
+        if isinstance(self.http_gateway, AsyncHTTPGateway):
+            owned = await self.http_gateway.find_owned_number(number)
+            return owned.get("sid") if owned else None
+        owned = await asyncio.to_thread(self.twilio_gateway.find_owned_number, number)
+        return owned.sid if owned else None
 
-    async def purchase_numbers(self, numbers: List[str]) -> Dict[str, str]:
+    async def purchase_numbers(self, numbers: List[str],
+                               concurrency: int = 5,
+                               progress: Optional[Callable[[PurchaseResult], None]] = None,
+                               checkpoint_path: Optional[Union[str, Path]] = None) -> PurchaseSummary:
         """
-        Purchase multiple phone numbers.
+        Purchase multiple phone numbers concurrently.
+        
+        Purchases run with bounded concurrency; pacing is left to the shared
+        rate limiter in the gateways. A failed purchase does not stop the
+        others. With a checkpoint file, every outcome is recorded as it
+        happens and numbers already purchased by an earlier run are skipped,
+        so an interrupted run can be resumed with the same arguments.
         
         Args:
             numbers: List of phone numbers to purchase
+            concurrency: Maximum number of purchases in flight
+            progress: Optional callback receiving a PurchaseResult each time
+                a number changes state
+            checkpoint_path: Optional JSON file to resume from and record to
             
         Returns:
-            Dict mapping phone numbers to their SIDs or error messages
+            PurchaseSummary of purchased, failed and skipped numbers
         """
-        results = {}
+        summary = PurchaseSummary()
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        checkpoint_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
         
-        for number in numbers:
-            try:
-                sid = self.twilio_gateway.purchase_number(number)
-                results[number] = sid
-                
-                if self.file_logger:
-                    self.file_logger.log_operation(
-                        operation="purchase",
-                        number=number,
-                        details={"sid": sid}
-                    )
+        def report(result: PurchaseResult) -> None:
+            if progress:
+                try:
+                    progress(result)
+                except Exception as e:
+                    logger.error(f"Purchase progress callback failed: {e}")
+        
+        async def record(result: PurchaseResult) -> None:
+            if checkpoint_path is None:
+                return
+            async with checkpoint_lock:
+                if result.status == "purchased":
+                    checkpoint["purchased"][result.number] = result.sid
+                    checkpoint["failed"].pop(result.number, None)
+                else:
+                    checkpoint["failed"][result.number] = result.error
+                self._save_checkpoint(checkpoint_path, checkpoint)
+        
+        async def purchase_one(number: str) -> None:
+            async with semaphore:
+                report(PurchaseResult(number=number, status="purchasing"))
+                try:
+                    sid = await self._purchase(number)
+                    result = PurchaseResult(number=number, status="purchased", sid=sid)
+                    summary.purchased[number] = sid
                     
-            except Exception as e:
-                logger.error(f"Failed to purchase {number}: {e}")
-                results[number] = f"Error: {str(e)}"
+                    if self.file_logger:
+                        self.file_logger.log_operation(
+                            operation="purchase",
+                            number=number,
+                            details={"sid": sid}
+                        )
+                        
+                except Exception as e:
+                    logger.error(f"Failed to purchase {number}: {e}")
+                    result = PurchaseResult(number=number, status="failed", error=str(e))
+                    summary.failed[number] = str(e)
+                    
+                    if self.file_logger:
+                        self.file_logger.log_operation(
+                            operation="purchase",
+                            number=number,
+                            status="failed",
+                            details={"error": str(e)}
+                        )
                 
-                if self.file_logger:
-                    self.file_logger.log_operation(
-                        operation="purchase",
-                        number=number,
-                        status="failed",
-                        details={"error": str(e)}
-                    )
+                await record(result)
+                report(result)
+        
+        pending = []
+        for number in dict.fromkeys(numbers):
+            if number in checkpoint["purchased"]:
+                summary.skipped[number] = checkpoint["purchased"][number]
+                report(PurchaseResult(
+                    number=number,
+                    status="skipped",
+                    sid=checkpoint["purchased"][number]
+                ))
+            else:
+                pending.append(number)
+        
+        await asyncio.gather(*(purchase_one(number) for number in pending))
+        
+        logger.info(
+            f"Bulk purchase finished: {len(summary.purchased)} purchased, "
+            f"{len(summary.failed)} failed, {len(summary.skipped)} skipped"
+        )
+        return summary
+
+    @staticmethod
+    def _load_checkpoint(path: Optional[Union[str, Path]]) -> Dict[str, Dict[str, str]]:
+        """Load a purchase checkpoint, or start an empty one."""
+        checkpoint = {"purchased": {}, "failed": {}}
+        if path is None or not Path(path).exists():
+            return checkpoint
+        try:
+            data = json.loads(Path(path).read_text())
+            checkpoint["purchased"].update(data.get("purchased", {}))
+            checkpoint["failed"].update(data.get("failed", {}))
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable purchase checkpoint {path}: {e}")
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(path: Union[str, Path], checkpoint: Dict[str, Dict[str, str]]) -> None:
+        """Atomically rewrite a purchase checkpoint."""
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(checkpoint, indent=2))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write purchase checkpoint {path}: {e}")
+
+    def _get_purchase_queue(self) -> PurchaseQueue:
+        """Get the purchase queue, opening the default one on first use."""
+        if self.purchase_queue is None:
+            self.purchase_queue = PurchaseQueue()
+        return self.purchase_queue
+
+    async def queue_purchase(self, numbers: List[str], concurrency: int = 5) -> Optional[int]:
+        """
+        Queue numbers for purchase and drain the queue in the background.
+        
+        Jobs are persisted before this returns, so they survive a crash or
+        restart. A number already in the queue, or already purchased through
+        it, is not purchased again; a number whose purchase failed is
+        queued again.
+        
+        Args:
+            numbers: List of phone numbers to purchase
+            concurrency: Number of background purchase workers
+            
+        Returns:
+            Number of jobs added or requeued, or None if queueing failed
+        """
+        try:
+            queue = self._get_purchase_queue()
+            added = await asyncio.to_thread(queue.enqueue, numbers)
+        except Exception as e:
+            logger.error(f"Failed to queue purchase of {len(numbers)} numbers: {e}")
+            return None
+        
+        logger.info(f"Queued {added} of {len(numbers)} numbers for purchase")
+        self.start_purchase_workers(concurrency)
+        return added
+
+    def start_purchase_workers(self, concurrency: int = 5) -> None:
+        """
+        Start background workers draining the purchase queue.
+        
+        On the first start, jobs interrupted by an earlier crash are put back
+        in the queue. Workers exit once the queue is empty and are started
+        again by the next queue_purchase call. Must be called from a running
+        event loop.
+        
+        Args:
+            concurrency: Number of workers to keep running
+        """
+        queue = self._get_purchase_queue()
+        self._queue_workers = [task for task in self._queue_workers if not task.done()]
+        
+        if not self._queue_recovered and not self._queue_workers:
+            queue.recover()
+            self._queue_recovered = True
         
-        return results
+        for _ in range(max(0, concurrency - len(self._queue_workers))):
+            self._queue_workers.append(asyncio.create_task(self._purchase_worker(queue)))
+
+    async def wait_for_purchases(self) -> None:
+        """Wait until the background workers have drained the queue."""
+        while self._queue_workers:
+            workers, self._queue_workers = self._queue_workers, []
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def stop_purchase_workers(self) -> None:
+        """Stop background workers; interrupted jobs resume on the next start."""
+        workers, self._queue_workers = self._queue_workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Jobs cancelled mid-purchase are still in progress; requeue them
+        self._queue_recovered = False
+
+    def get_purchase_status(self) -> Dict[str, int]:
+        """Get the number of queued purchase jobs per status."""
+        try:
+            return self._get_purchase_queue().counts()
+        except Exception as e:
+            logger.error(f"Failed to get purchase queue status: {e}")
+            return {}
+
+    def get_purchase_jobs(self, status: Optional[str] = None) -> List[PurchaseJob]:
+        """
+        List queued purchase jobs.
+        
+        Args:
+            status: Optional status to filter by (queued/in_progress/purchased/failed)
+            
+        Returns:
+            List of PurchaseJob objects, oldest first
+        """
+        try:
+            return self._get_purchase_queue().list_jobs(status)
+        except Exception as e:
+            logger.error(f"Failed to list purchase jobs: {e}")
+            return []
+
+    async def _purchase_worker(self, queue: PurchaseQueue) -> None:
+        """Claim and run purchase jobs until the queue is empty."""
+        while True:
+            job = await asyncio.to_thread(queue.claim)
+            if job is None:
+                return
+            await self._run_purchase_job(queue, job)
 
-    def list_active_numbers(self, filters: Optional[Dict] = None) -> List[NumberRecord]:
+    async def _run_purchase_job(self, queue: PurchaseQueue, job: PurchaseJob) -> None:
+        """Purchase the number of a claimed job and record the outcome."""
+        try:
+            sid = None
+            if job.attempts > 1:
+                # An earlier attempt was interrupted and may have gone through
+                sid = await self._find_owned_sid(job.number)
+            if sid is None:
+                sid = await self._purchase(job.number)
+            await asyncio.to_thread(queue.complete, job.number, sid)
+            
+            if self.file_logger:
+                self.file_logger.log_operation(
+                    operation="purchase",
+                    number=job.number,
+                    details={"sid": sid, "queued": True}
+                )
+                
+        except Exception as e:
+            logger.error(f"Queued purchase of {job.number} failed: {e}")
+            await asyncio.to_thread(queue.fail, job.number, str(e))
+            
+            if self.file_logger:
+                self.file_logger.log_operation(
+                    operation="purchase",
+                    number=job.number,
+                    status="failed",
+                    details={"error": str(e), "queued": True}
+                )
+
+    def list_active_numbers(self, filters: Optional[Dict] = None,
+                            force_refresh: bool = False) -> List[NumberRecord]:
         """
         List all active phone numbers with optional filtering.
         
+        Unfiltered listings are served from the inventory cache when one is
+        configured, refreshing it first if it is stale or a refresh is forced.
+        If a refresh fails, the cached inventory is returned as is.
+        
         Args:
             filters: Optional filters for the query
+            force_refresh: Refresh the inventory cache even if it is fresh
             
         Returns:
             List of active NumberRecord objects
         """
+        if self.inventory_cache is not None and not filters:
+            if force_refresh or not self.inventory_cache.is_fresh():
+                self.refresh_inventory()
+            return self.inventory_cache.list_records()
+        
         try:
             return self.twilio_gateway.list_numbers(filters)
         except Exception as e:
             logger.error(f"Failed to list active numbers: {e}")
             return []
 
+    async def stream_active_numbers(self, filters: Optional[Dict] = None,
+                                    page_size: int = 50) -> AsyncIterator[NumberRecord]:
+        """
+        Stream active phone numbers page by page.
+        
+        Pages are fetched off the event loop one at a time, so callers can
+        render the first page while the rest of the account is still loading.
+        
+        Args:
+            filters: Optional filters for the query
+            page_size: Numbers per API page
+            
+        Yields:
+            Active NumberRecord objects
+        """
+        pages = self.twilio_gateway.iter_number_pages(filters, page_size)
+        while True:
+            try:
+                records = await asyncio.to_thread(next, pages, None)
+            except Exception as e:
+                logger.error(f"Failed to stream active numbers: {e}")
+                return
+            if records is None:
+                return
+            for record in records:
+                yield record
+
+    def refresh_inventory(self) -> Optional[Dict[str, int]]:
+        """
+        Sync the inventory cache with the account.
+        
+        Only records whose date_updated changed are rewritten, and numbers
+        no longer on the account are dropped.
+        
+        Returns:
+            Counts of added, updated, removed and unchanged records, or
+            None if there is no cache or the listing failed
+        """
+        if self.inventory_cache is None:
+            return None
+        try:
+            counts = self.inventory_cache.sync(self.twilio_gateway.stream_numbers())
+            logger.info(f"Inventory refreshed: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"Failed to refresh inventory: {e}")
+            return None
+
+    def _cache_purchased(self, number: str, sid: Optional[str]) -> None:
+        """Add a number we just bought to the inventory cache and drop it from search results."""
+        self.search_cache.evict_number(number)
+        if self.inventory_cache is None or not sid:
+            return
+        country, type_ = classify_number(number)
+        self.inventory_cache.upsert(NumberRecord(
+            number=number,
+            country=country,
+            type=type_,
+            capabilities=[],
+            price=get_monthly_price(country, type_),
+            sid=sid
+        ))
+
+    def _cache_released(self, sid: str) -> None:
+        """Drop a number we just released from the caches."""
+        self._fetch_number_config.invalidate(sid)
+        if self.inventory_cache is not None:
+            self.inventory_cache.remove(sid)
+
+    def _cache_updated(self, sid: str, config: Dict) -> None:
+        """Apply a configuration change we just made to the caches."""
+        self._fetch_number_config.invalidate(sid)
+        if self.inventory_cache is not None:
+            self.inventory_cache.update_fields(sid, **config)
+
     def release_number(self, sid: str) -> bool:
         """
         Release a phone number.
@@ -150,6 +627,8 @@ class NumberService:
         """
         try:
             result = self.twilio_gateway.release_number(sid)
+            if result:
+                self._cache_released(sid)
             
             if self.file_logger:
                 self.file_logger.log_operation(
@@ -173,10 +652,150 @@ class NumberService:
             
             return False
 
+    def plan_release(self, sids: Optional[List[str]] = None,
+                     filters: Optional[Dict] = None) -> ReleasePlan:
+        """
+        Plan a bulk release without releasing anything.
+        
+        Args:
+            sids: SIDs of the numbers to release
+            filters: Match active numbers on NumberRecord fields instead,
+                e.g. {"country": "US", "type": ["local", "mobile"]}; a list
+                value matches any of its items
+            
+        Returns:
+            ReleasePlan with the matched numbers and projected monthly savings
+            
+        Raises:
+            ValueError: If neither sids nor filters is given.
+        """
+        if sids is None and not filters:
+            raise ValueError("A bulk release needs SIDs or filters")
+        
+        active = self.list_active_numbers()
+        plan = ReleasePlan()
+        
+        if sids is not None:
+            by_sid = {record.sid: record for record in active}
+            plan.numbers = [by_sid[sid] for sid in dict.fromkeys(sids) if sid in by_sid]
+            plan.missing = [sid for sid in dict.fromkeys(sids) if sid not in by_sid]
+        else:
+            plan.numbers = [
+                record for record in active
+                if self._matches(record, filters)
+            ]
+        
+        for record in plan.numbers:
+            price = self._monthly_price(record)
+            if price is None:
+                plan.unpriced.append(record.number)
+            else:
+                plan.monthly_savings += price
+        
+        return plan
+
+    @staticmethod
+    def _matches(record: NumberRecord, filters: Dict) -> bool:
+        """Check a record against release filters."""
+        for field_name, expected in filters.items():
+            value = getattr(record, field_name, None)
+            if isinstance(expected, (list, tuple, set)):
+                if value not in expected:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    @staticmethod
+    def _monthly_price(record: NumberRecord) -> Optional[float]:
+        """Get a record's monthly price, falling back to COUNTRY_DATA."""
+        if record.price is not None:
+            return record.price
+        return get_monthly_price(record.country, record.type)
+
+    async def _release(self, sid: str) -> bool:
+        """Release one number without blocking the event loop."""
+        if isinstance(self.http_gateway, AsyncHTTPGateway):
+            result = await self.http_gateway.release_number(sid)
+        else:
+            result = await asyncio.to_thread(self.twilio_gateway.release_number, sid)
+        if result:
+            self._cache_released(sid)
+        return result
+
+    async def release_numbers(self, plan: ReleasePlan, concurrency: int = 5,
+                              progress: Optional[Callable[[str, str], None]] = None) -> ReleaseSummary:
+        """
+        Release the numbers of a plan concurrently.
+        
+        Releases are paced by the shared rate limiter in the gateways; a
+        failed release does not stop the others. Every outcome is logged.
+        
+        Args:
+            plan: Plan from plan_release
+            concurrency: Maximum number of releases in flight
+            progress: Optional callback receiving (sid, status) as each
+                release finishes, status being "released" or "failed"
+            
+        Returns:
+            ReleaseSummary of released and failed numbers
+        """
+        summary = ReleaseSummary()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def release_one(record: NumberRecord) -> None:
+            async with semaphore:
+                try:
+                    await self._release(record.sid)
+                    summary.released[record.sid] = record.number
+                    summary.monthly_savings += self._monthly_price(record) or 0.0
+                    status = "released"
+                    
+                    if self.file_logger:
+                        self.file_logger.log_operation(
+                            operation="release",
+                            number=record.number,
+                            details={"sid": record.sid}
+                        )
+                        
+                except Exception as e:
+                    logger.error(f"Failed to release {record.number} ({record.sid}): {e}")
+                    summary.failed[record.sid] = str(e)
+                    status = "failed"
+                    
+                    if self.file_logger:
+                        self.file_logger.log_operation(
+                            operation="release",
+                            number=record.number,
+                            status="failed",
+                            details={"sid": record.sid, "error": str(e)}
+                        )
+                
+                if progress:
+                    try:
+                        progress(record.sid, status)
+                    except Exception as e:
+                        logger.error(f"Release progress callback failed: {e}")
+        
+        await asyncio.gather(*(release_one(record) for record in plan.numbers))
+        
+        logger.info(
+            f"Bulk release finished: {len(summary.released)} released, "
+            f"{len(summary.failed)} failed, ${summary.monthly_savings:.2f}/month saved"
+        )
+        return summary
+
+    @cached(ttl=60, stale_ttl=300)
+    def _fetch_number_config(self, sid: str) -> Dict:
+        """Fetch a number's configuration; results are cached per SID."""
+        return self.twilio_gateway.get_number_config(sid)
+
     def get_number_config(self, sid: str) -> Optional[Dict]:
         """
         Get configuration for a phone number.
         
+        Cached per SID and invalidated by our own updates and releases.
+        
         Args:
             sid: The Twilio SID of the number
             
@@ -184,19 +803,128 @@ class NumberService:
             Dict with number configuration or None if failed
         """
         try:
-            number = self.twilio_gateway.get_client().incoming_phone_numbers(sid).fetch()
-            return {
-                "voice_url": number.voice_url,
-                "sms_url": number.sms_url,
-                "status_callback": number.status_callback,
-                "voice_method": number.voice_method,
-                "sms_method": number.sms_method,
-                "status_callback_method": number.status_callback_method
-            }
+            return dict(self._fetch_number_config(sid))
         except Exception as e:
             logger.error(f"Failed to get config for {sid}: {e}")
             return None
 
+    @staticmethod
+    def diff_number_config(current: Dict, desired: Dict) -> Dict:
+        """
+        Get the fields of a desired configuration that differ from the current one.
+        
+        Empty strings and None are treated alike, and HTTP methods are
+        compared case-insensitively, as Twilio normalizes both. A field
+        cleared with None (e.g. voice_application_sid) is returned as an
+        empty string, which is how Twilio clears it.
+        
+        Args:
+            current: Current configuration from get_number_config
+            desired: Desired configuration
+            
+        Returns:
+            Dict of the desired fields that need to change
+        """
+        def normalize(field_name: str, value):
+            if value is None or value == "":
+                return None
+            if field_name.endswith("_method") and isinstance(value, str):
+                return value.upper()
+            return value
+        
+        return {
+            field_name: "" if value is None else value
+            for field_name, value in desired.items()
+            if normalize(field_name, value) != normalize(field_name, current.get(field_name))
+        }
+
+    async def _get_config(self, sid: str) -> Dict:
+        """Fetch one number's configuration without blocking the event loop."""
+        if isinstance(self.http_gateway, AsyncHTTPGateway):
+            number = await self.http_gateway.get_number(sid)
+            return {field_name: number.get(field_name) for field_name in NUMBER_CONFIG_FIELDS}
+        return await asyncio.to_thread(self.twilio_gateway.get_number_config, sid)
+
+    async def _update_config(self, sid: str, config: Dict) -> bool:
+        """Update one number's configuration without blocking the event loop."""
+        if isinstance(self.http_gateway, AsyncHTTPGateway):
+            result = await self.http_gateway.update_number_config(sid, config)
+        else:
+            result = await asyncio.to_thread(self.twilio_gateway.update_number_config, sid, config)
+        if result:
+            self._cache_updated(sid, config)
+        return result
+
+    async def apply_config_bulk(self, sids: List[str], desired: Dict,
+                                concurrency: int = 5,
+                                progress: Optional[Callable[[str, str], None]] = None) -> ConfigApplySummary:
+        """
+        Apply a configuration to many numbers, pushing only what changed.
+        
+        Each number's current configuration is fetched and diffed against
+        the desired one; numbers that already match are skipped and the
+        others are updated with only their differing fields. Numbers are
+        processed concurrently, paced by the shared rate limiter.
+        
+        Args:
+            sids: SIDs of the numbers to configure
+            desired: Desired configuration fields (e.g. voice_url, sms_url)
+            concurrency: Maximum number of numbers processed at once
+            progress: Optional callback receiving (sid, status) as each
+                number finishes, status being "updated", "unchanged" or "failed"
+            
+        Returns:
+            ConfigApplySummary of updated, unchanged and failed numbers
+        """
+        summary = ConfigApplySummary()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def apply_one(sid: str) -> None:
+            async with semaphore:
+                try:
+                    changes = self.diff_number_config(await self._get_config(sid), desired)
+                    if changes:
+                        await self._update_config(sid, changes)
+                        summary.updated[sid] = changes
+                        status = "updated"
+                        
+                        if self.file_logger:
+                            self.file_logger.log_operation(
+                                operation="update_config",
+                                number=sid,
+                                details={"config": changes}
+                            )
+                    else:
+                        summary.unchanged.append(sid)
+                        status = "unchanged"
+                        
+                except Exception as e:
+                    logger.error(f"Failed to apply config to {sid}: {e}")
+                    summary.failed[sid] = str(e)
+                    status = "failed"
+                    
+                    if self.file_logger:
+                        self.file_logger.log_operation(
+                            operation="update_config",
+                            number=sid,
+                            status="failed",
+                            details={"config": desired, "error": str(e)}
+                        )
+                
+                if progress:
+                    try:
+                        progress(sid, status)
+                    except Exception as e:
+                        logger.error(f"Config progress callback failed: {e}")
+        
+        await asyncio.gather(*(apply_one(sid) for sid in dict.fromkeys(sids)))
+        
+        logger.info(
+            f"Bulk config finished: {len(summary.updated)} updated, "
+            f"{len(summary.unchanged)} unchanged, {len(summary.failed)} failed"
+        )
+        return summary
+
     def update_number_config(self, sid: str, config: Dict) -> bool:
         """
         Update configuration for a phone number.
@@ -210,6 +938,8 @@ class NumberService:
         """
         try:
             result = self.twilio_gateway.update_number_config(sid, config)
+            if result:
+                self._cache_updated(sid, config)
             
             if self.file_logger:
                 self.file_logger.log_operation(
@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Any, List, Optional
 import logging
 from ..gateways.twilio_gateway import TwilioGateway
 from ..gateways.file_logger import FileLogger
+from ..shared.cache import cached
 
 logger = logging.getLogger(__name__)
 
@@ -46,3 +47,35 @@ class VoiceService:
                 )
             
             return None
+
+    @cached(ttl=300, stale_ttl=1800)
+    def _fetch_applications(self) -> List[Any]:
+        """Fetch TwiML applications; results are cached."""
+        return self.twilio_gateway.list_applications()
+
+    def list_applications(self) -> List[Any]:
+        """
+        List the account's TwiML applications.
+        Returns an empty list if the listing failed.
+        """
+        try:
+            return list(self._fetch_applications())
+        except Exception as e:
+            logger.error(f"Failed to list applications: {e}")
+            return []
+
+    @cached(ttl=300, stale_ttl=1800)
+    def _fetch_sip_trunks(self) -> List[Any]:
+        """Fetch Elastic SIP trunks; results are cached."""
+        return self.twilio_gateway.list_sip_trunks()
+
+    def list_sip_trunks(self) -> List[Any]:
+        """
+        List the account's Elastic SIP trunks.
+        Returns an empty list if the listing failed.
+        """
+        try:
+            return list(self._fetch_sip_trunks())
+        except Exception as e:
+            logger.error(f"Failed to list SIP trunks: {e}")
+            return []
@@ -0,0 +1,188 @@
+"""TTL and stale-while-revalidate caching for read-only service calls.
+
+Decorate a method with ``cached`` to keep its results per instance and
+arguments. A result younger than ``ttl`` is returned as is. An older one,
+still within ``stale_ttl`` beyond that, is returned immediately while a
+background refresh replaces it, so screens redraw without waiting on the
+API. Past both windows the call blocks on a fresh fetch.
+
+Only successful results are cached: an exception reaches the caller on a
+miss, and a failed background refresh leaves the stale value in place.
+Writes invalidate through the bound method, e.g.
+``self.get_number_config.invalidate(sid)``; a fetch already running when
+its entry is invalidated returns its result but does not cache it, since
+it may predate the write. Hit/miss counts per method are available from
+``cache_stats``.
+"""
+
+import functools
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CacheStats:
+    """Counters for one cached method."""
+    hits: int = 0  # Fresh results served from cache
+    stale_hits: int = 0  # Stale results served while refreshing
+    misses: int = 0  # Calls that had to wait for a fetch
+    refreshes: int = 0  # Background refreshes completed
+    refresh_errors: int = 0  # Background refreshes that failed
+    invalidations: int = 0  # Entries dropped by writes
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    refreshing: bool = False
+
+_lock = threading.RLock()
+_stats: Dict[str, CacheStats] = {}
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Get the counters of every cached method, keyed by qualified name."""
+    with _lock:
+        return {name: asdict(stats) for name, stats in _stats.items()}
+
+def reset_cache_stats() -> None:
+    """Zero all cache counters."""
+    with _lock:
+        _stats.clear()
+
+def _run_in_thread(refresh: Callable[[], None]) -> None:
+    threading.Thread(target=refresh, daemon=True).start()
+
+class CachedMethod:
+    """Descriptor caching a method's results per instance and arguments."""
+
+    def __init__(self, func: Callable, ttl: float, stale_ttl: float,
+                 clock: Callable[[], float],
+                 executor: Callable[[Callable[[], None]], None]):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.executor = executor
+        self.name = func.__qualname__
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        return _BoundCachedMethod(self, instance)
+
+    def _stats(self) -> CacheStats:
+        return _stats.setdefault(self.name, CacheStats())
+
+    def _entries(self, instance: Any) -> Dict[Tuple, _Entry]:
+        # Kept on the instance so entries go away with it
+        return instance.__dict__.setdefault("_cached_results", {})
+
+    def _generation(self, instance: Any, key: Tuple) -> Tuple[int, int]:
+        # Invalidations so far of the whole method and of this key
+        generations = instance.__dict__.setdefault("_cached_generations", {})
+        return generations.get(self.name, 0), generations.get(key, 0)
+
+    @staticmethod
+    def _key(args: tuple, kwargs: dict) -> Hashable:
+        return args, tuple(sorted(kwargs.items()))
+
+    def call(self, instance: Any, *args, **kwargs) -> Any:
+        key = (self.name, self._key(args, kwargs))
+        now = self.clock()
+        with _lock:
+            entries = self._entries(instance)
+            entry = entries.get(key)
+            if entry is not None:
+                age = now - entry.stored_at
+                if age < self.ttl:
+                    self._stats().hits += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._stats().stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        generation = self._generation(instance, key)
+                        self.executor(
+                            lambda: self._refresh(instance, key, args, kwargs, generation)
+                        )
+                    return entry.value
+            self._stats().misses += 1
+            generation = self._generation(instance, key)
+
+        value = self.func(instance, *args, **kwargs)
+        with _lock:
+            # An invalidation during the fetch wins over its result
+            if self._generation(instance, key) == generation:
+                self._entries(instance)[key] = _Entry(value, self.clock())
+        return value
+
+    def _refresh(self, instance: Any, key: Tuple, args: tuple, kwargs: dict,
+                 generation: Tuple[int, int]) -> None:
+        try:
+            value = self.func(instance, *args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.name} failed: {e}")
+            with _lock:
+                self._stats().refresh_errors += 1
+                entry = self._entries(instance).get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        with _lock:
+            entries = self._entries(instance)
+            # An invalidation during the refresh wins over its result
+            if key in entries and self._generation(instance, key) == generation:
+                entries[key] = _Entry(value, self.clock())
+            self._stats().refreshes += 1
+
+    def invalidate(self, instance: Any, *args, **kwargs) -> None:
+        with _lock:
+            entries = self._entries(instance)
+            generations = instance.__dict__.setdefault("_cached_generations", {})
+            if args or kwargs:
+                keys = [(self.name, self._key(args, kwargs))]
+                generations[keys[0]] = generations.get(keys[0], 0) + 1
+            else:
+                keys = [key for key in entries if key[0] == self.name]
+                generations[self.name] = generations.get(self.name, 0) + 1
+            for key in keys:
+                if entries.pop(key, None) is not None:
+                    self._stats().invalidations += 1
+
+class _BoundCachedMethod:
+    """Cached method bound to an instance."""
+
+    def __init__(self, method: CachedMethod, instance: Any):
+        self._method = method
+        self._instance = instance
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._method.call(self._instance, *args, **kwargs)
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """Drop the cached result for these arguments, or all results if none are given."""
+        self._method.invalidate(self._instance, *args, **kwargs)
+
+def cached(ttl: float, stale_ttl: float = 0.0,
+           clock: Callable[[], float] = time.monotonic,
+           executor: Optional[Callable[[Callable[[], None]], None]] = None) -> Callable[[Callable], CachedMethod]:
+    """Cache a read-only method's results.
+
+    Args:
+        ttl: Seconds a result is served without refreshing
+        stale_ttl: Further seconds a result is served while it is refreshed
+            in the background; 0 disables stale-while-revalidate
+        clock: Monotonic time source
+        executor: Runs background refreshes; a daemon thread per refresh if None
+
+    Returns:
+        Decorator turning the method into a CachedMethod
+    """
+    def decorator(func: Callable) -> CachedMethod:
+        return CachedMethod(func, ttl, stale_ttl, clock, executor or _run_in_thread)
+    return decorator
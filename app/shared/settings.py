@@ -33,6 +33,12 @@ class Settings:
     search_rate_limit: float = 1.0  # seconds between requests
     search_empty_limit: int = 3  # stop after N empty results
     
+    # Rate limiting (starting rates, adapted on 429 responses)
+    purchase_rate_limit: float = 0.5  # seconds between requests
+    messages_rate_limit: float = 0.2  # seconds between requests
+    calls_rate_limit: float = 1.0  # seconds between requests
+    account_rate_limit: float = 0.5  # seconds between requests
+    
     def __post_init__(self):
         """Ensure log directory exists."""
         self.log_dir.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
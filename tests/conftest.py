@@ -0,0 +1,41 @@
+"""Shared fixtures for the test suite."""
+
+import importlib
+import pytest
+
+# Credentials the gateways are built with in tests
+TEST_CREDENTIALS = {
+    "TWILIO_ACCOUNT_SID": "AC123",
+    "TWILIO_AUTH_TOKEN": "token",
+}
+
+def pytest_configure(config):
+    """Set the test credentials before any test module is collected.
+
+    The gateways bind the credentials when they are first imported, so they
+    have to be in place before any test, or test module, imports them.
+    """
+    gateway_config = importlib.import_module("app.gateways.config")
+    for name, value in TEST_CREDENTIALS.items():
+        if not hasattr(gateway_config, name):
+            setattr(gateway_config, name, value)
+
+@pytest.fixture
+def twilio_gateway_module():
+    """The Twilio gateway module, with test credentials configured."""
+    return importlib.import_module("app.gateways.twilio_gateway")
+
+@pytest.fixture
+def async_http_gateway_module():
+    """The async HTTP gateway module, with test credentials configured."""
+    return importlib.import_module("app.gateways.async_http_gateway")
+
+@pytest.fixture
+def number_service_module():
+    """The number service module, with test credentials configured."""
+    return importlib.import_module("app.services.number_service")
+
+@pytest.fixture
+def account_service_module():
+    """The account service module, with test credentials configured."""
+    return importlib.import_module("app.services.account_service")
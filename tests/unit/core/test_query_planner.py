@@ -0,0 +1,73 @@
+"""Tests for the QueryPlanner class."""
+
+import asyncio
+import pytest
+from app.core.query_planner import ROUND_ROBIN, WEIGHTED, QueryPlanner
+from app.gateways.file_logger import FileLogger
+from app.gateways.search_engine import SearchEngine
+
+@pytest.mark.core
+class TestQueryPlanner:
+    """Test suite for QueryPlanner and weighted shard scheduling."""
+
+    def test_round_robin_without_history(self, tmp_path):
+        """Test that shards come from COUNTRY_DATA with equal weights."""
+        # Setup
+        planner = QueryPlanner(FileLogger(log_dir=str(tmp_path)))
+
+        # Execute
+        plan = planner.plan("US", "local")
+        located = planner.plan("US", "local", filters={"InRegion": "CA"})
+
+        # Verify
+        assert plan.mode == ROUND_ROBIN
+        assert {"AreaCode": 212} in plan.shards
+        assert set(plan.weights) == {1.0}
+        assert located.shards == [{}]
+
+    def test_weighted_by_historical_yield(self, tmp_path):
+        """Test that high-yield shards are weighted up and scheduled first."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        file_logger.log_search("US", "local", results_count=60, shards={
+            "AreaCode=415": {"pages": 2, "results": 40, "unique": 40},
+            "AreaCode=212": {"pages": 2, "results": 20, "unique": 0}
+        })
+        file_logger.log_search("US", "tollfree", results_count=50, shards={
+            "AreaCode=212": {"pages": 1, "results": 50, "unique": 50}
+        })
+        planner = QueryPlanner(file_logger, mode=WEIGHTED)
+        shards = [{"AreaCode": 212}, {"AreaCode": 305}, {"AreaCode": 415}]
+
+        # Execute
+        plan = planner.plan("US", "local", shards=shards)
+
+        # Verify
+        assert plan.mode == WEIGHTED
+        assert plan.known == 2
+        assert plan.shards == [{"AreaCode": 415}, {"AreaCode": 305}, {"AreaCode": 212}]
+        # Average yield is 10/page; 415 is smoothed to 15, 305 to the average, 212 to 5
+        assert plan.weights == pytest.approx([1.5, 1.0, 0.5])
+
+    def test_engine_pages_shards_by_weight(self):
+        """Test that a shard weighted 4 is paged four times as often."""
+        # Setup
+        order = []
+
+        async def fetch(shard, page_url):
+            order.append(shard["AreaCode"])
+            page = int(page_url) if page_url else 0
+            return {"numbers": [{"phone_number": f"+1{shard['AreaCode']}{page:07d}"}],
+                    "next_page_url": str(page + 1)}
+
+        engine = SearchEngine(fetch, concurrency=1, max_pages_per_shard=10)
+
+        # Execute
+        async def run():
+            async for _ in engine.stream([{"AreaCode": 212}, {"AreaCode": 415}], [1.0, 4.0]):
+                pass
+        asyncio.run(run())
+
+        # Verify
+        # Passes tie at 1.0 and 2.0, where the earlier shard goes first
+        assert order[:10] == [415, 415, 415, 212, 415, 415, 415, 415, 212, 415]
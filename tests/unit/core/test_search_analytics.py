@@ -0,0 +1,162 @@
+"""Tests for search yield analytics."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.core.search_analytics import aggregate_searches, rank_shapes
+from app.gateways.file_logger import FileLogger
+from app.gateways.search_cache import SearchCache
+
+def search_entry(timestamp, shards, latency, throttles=0, filters=None):
+    """Build a search log entry as log_search writes it."""
+    return {
+        "operation": "search",
+        "timestamp": timestamp,
+        "country": "US",
+        "type": "local",
+        "results_count": sum(stats["results"] for stats in shards.values()),
+        "unique_count": sum(stats["unique"] for stats in shards.values()),
+        "duplicate_count": sum(stats["duplicates"] for stats in shards.values()),
+        "shards": shards,
+        "filters": filters or {},
+        "latency": latency,
+        "throttles": throttles
+    }
+
+@pytest.mark.core
+class TestSearchAnalytics:
+    """Test suite for aggregate_searches and rank_shapes."""
+
+    def test_aggregates_by_area_code_and_hour(self):
+        # Setup
+        entries = [
+            search_entry("2024-05-01T09:15:00", {
+                "AreaCode=415": {"pages": 3, "results": 30, "unique": 24, "duplicates": 6},
+                "AreaCode=212": {"pages": 1, "results": 10, "unique": 2, "duplicates": 8}
+            }, latency=4.0, throttles=2),
+            search_entry("2024-05-01T17:40:00", {
+                "": {"pages": 2, "results": 20, "unique": 20, "duplicates": 0}
+            }, latency=1.0, filters={"AreaCode": "415"})
+        ]
+
+        # Execute
+        by_code = {stats.shape["area_code"]: stats for stats in
+                   aggregate_searches(entries, by=("area_code",))}
+        by_hour = {stats.shape["hour"]: stats for stats in
+                   aggregate_searches(entries, by=("hour",))}
+
+        # Verify
+        assert set(by_code) == {"415", "212"}
+        assert by_code["415"].searches == 2
+        assert by_code["415"].unique == 44
+        assert by_code["415"].latency == pytest.approx(4.0)  # 3 of 4 pages, plus 1.0
+        assert by_code["212"].throttles == pytest.approx(0.5)
+        assert by_code["212"].duplicate_rate == pytest.approx(0.8)
+        assert by_hour[9].unique == 26 and by_hour[9].pages == 4
+        assert by_hour[17].unique_per_second == pytest.approx(20.0)
+        with pytest.raises(ValueError):
+            aggregate_searches(entries, by=("city",))
+
+    def test_rank_top_and_bottom(self):
+        # Setup
+        entries = [
+            search_entry("2024-05-01T09:00:00", {
+                f"AreaCode={code}": {"pages": 1, "results": 10, "unique": unique, "duplicates": 10 - unique}
+            }, latency=1.0)
+            for code, unique in [(205, 9), (212, 1), (305, 5), (415, 7)]
+        ]
+        shapes = aggregate_searches(entries, by=("area_code",))
+
+        # Execute
+        top, bottom = rank_shapes(shapes, limit=2)
+        few_top, few_bottom = rank_shapes(shapes[:3], limit=2)
+
+        # Verify
+        assert [shape.shape["area_code"] for shape in top] == ["205", "415"]
+        assert [shape.shape["area_code"] for shape in bottom] == ["212", "305"]
+        assert [shape.shape["area_code"] for shape in few_bottom] == ["212"]
+
+    def test_stream_available_logs_yield_stats(self, tmp_path, number_service_module):
+        # Setup
+        module = number_service_module
+
+        async def search_stream(**kwargs):
+            for shard, page, numbers in [
+                ({"AreaCode": "415"}, 1, ["+14155550001", "+14155550002"]),
+                ({"AreaCode": "415"}, 2, ["+14155550002", "+14155550003"]),
+                ({"AreaCode": "212"}, 1, ["+14155550001"])
+            ]:
+                gateway.rate_limiter.bucket.return_value.throttles += 1
+                yield {"numbers": [{"phone_number": n} for n in numbers], "shard": shard, "page": page}
+
+        gateway = MagicMock()
+        gateway.search_stream = search_stream
+        gateway.rate_limiter.bucket.return_value.throttles = 0
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        service = module.NumberService(MagicMock(), gateway, file_logger=file_logger,
+                                       search_cache=SearchCache())
+
+        # Execute
+        asyncio.run(service.search_available("US", "local", limit=10))
+
+        # Verify
+        entry = file_logger.get_search_history()[-1]
+        assert entry["results_count"] == 5
+        assert entry["unique_count"] == 3
+        assert entry["duplicate_count"] == 2
+        assert entry["page_depth"] == 2
+        assert entry["throttles"] == 3
+        assert entry["latency"] >= 0
+        assert entry["shards"]["AreaCode=212"] == {"pages": 1, "results": 1, "unique": 0, "duplicates": 1}
+
+    def test_resumed_search_logs_new_numbers(self, tmp_path, number_service_module):
+        # Setup
+        module = number_service_module
+
+        async def search_stream(**kwargs):
+            for numbers in [["+14155550001", "+14155550002"], ["+14155550003"]]:
+                yield {"numbers": [{"phone_number": n} for n in numbers]}
+
+        gateway = MagicMock()
+        gateway.search_stream = search_stream
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        service = module.NumberService(MagicMock(), gateway, file_logger=file_logger,
+                                       search_cache=SearchCache())
+
+        # Execute
+        asyncio.run(service.search_available("US", "local", limit=2))
+        asyncio.run(service.search_available("US", "local", limit=10))
+
+        # Verify
+        partial, resumed = file_logger.get_search_history()[-2:]
+        assert partial["unique_count"] == 2
+        assert resumed["unique_count"] == 1
+        assert resumed["duplicate_count"] == 2
+
+
+    def test_stream_latency_excludes_consumer_time(self, tmp_path, number_service_module):
+        # Setup
+        module = number_service_module
+
+        async def search_stream(**kwargs):
+            for numbers in [["+14155550001"], ["+14155550002"]]:
+                await asyncio.sleep(0.01)
+                yield {"numbers": [{"phone_number": n} for n in numbers]}
+
+        gateway = MagicMock()
+        gateway.search_stream = search_stream
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        service = module.NumberService(MagicMock(), gateway, file_logger=file_logger,
+                                       search_cache=SearchCache())
+
+        async def slow_consumer():
+            async for _ in service.stream_available("US", "local"):
+                await asyncio.sleep(0.2)
+
+        # Execute
+        asyncio.run(slow_consumer())
+
+        # Verify
+        entry = file_logger.get_search_history()[-1]
+        assert entry["unique_count"] == 2
+        assert 0.02 <= entry["latency"] < 0.2
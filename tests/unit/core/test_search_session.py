@@ -2,7 +2,9 @@
 
 import pytest
 from datetime import datetime
-from app.core.search_session import SearchSession
+from app.core.search_session import (
+    AREA_CODE, REGION, SearchSession, search_strategies, strategy_filters
+)
 from app.models.phone_number import PhoneNumber
 
 @pytest.mark.core
@@ -135,4 +137,58 @@ class TestSearchSession:
         
         session.add_batch(batch3)
         assert session.total_batches == 3
-        assert session.total_numbers == 10
\ No newline at end of file
+        assert session.total_numbers == 10
+    
+    def test_saturation_switches_strategy(self):
+        """Test that a low-yield pool moves the session to the next strategy."""
+        session = SearchSession(min_yield=0.2, window=2, strategies=[AREA_CODE, REGION])
+        first = [PhoneNumber(number=f"+1555000{i:04d}") for i in range(10)]
+        
+        session.add_batch(first)
+        session.add_batch(first[:9] + [PhoneNumber(number="+15550009999")])
+        assert session.strategy == AREA_CODE
+        
+        # Yield over the window is 11/20, then 1/20 once the pool repeats
+        stats = session.add_batch(first)
+        assert stats.saturation == pytest.approx(0.95)
+        assert session.strategy == REGION
+        assert session.switches[0].from_strategy == AREA_CODE
+        assert session.switches[0].batch == 3
+        assert not session.should_stop()
+        
+        # The last strategy saturating ends the search
+        session.add_batch(first)
+        session.add_batch(first)
+        assert session.should_stop()
+        assert session.stop_reason == "saturated"
+        assert session.total_numbers == 11
+    
+    def test_search_strategies(self):
+        """Test that strategies apply only to country-wide searches."""
+        assert search_strategies("US") == [AREA_CODE, REGION]
+        assert search_strategies("US", {"region": "CA"}) == []
+        assert search_strategies("US", {"region": ""}) == [AREA_CODE, REGION]
+        assert 415 in strategy_filters(AREA_CODE, "US")["area_code"]
+        assert "CA" in strategy_filters(REGION, "US")["region"]
+        assert strategy_filters(None, "US") == {}
+    
+    def test_empty_shards_do_not_saturate_strategy(self):
+        """Test that shards returning nothing don't abandon a strategy."""
+        session = SearchSession(window=2, strategies=[AREA_CODE, REGION])
+        session.add_batch([PhoneNumber(number="+15550000001")])
+        
+        for _ in range(5):
+            stats = session.add_batch([])
+            assert stats.saturation == 0.0
+        
+        assert session.strategy == AREA_CODE
+        assert session.switches == []
+        assert session.empty_streak == 0
+        
+        # Batches of duplicates still count
+        duplicate = [PhoneNumber(number="+15550000001")]
+        for _ in range(3):
+            session.add_batch(duplicate)
+        assert session.strategy == REGION
+        assert session.switches[0].saturation == 1.0
+
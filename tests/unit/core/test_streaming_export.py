@@ -0,0 +1,106 @@
+"""Tests for streaming and compressed exports."""
+
+import csv
+import gzip
+import json
+import pytest
+from datetime import datetime
+from app.core.export import LOG_FIELDS, export_records, export_to_parquet
+from app.models.phone_number import PhoneNumber
+
+def generate_entries(count):
+    """Lazily generate account log entries."""
+    for i in range(count):
+        yield {"sid": f"SM{i}", "type": "message", "timestamp": datetime(2024, 1, 1, 0, i % 60),
+               "from": "+15550001", "to": "+15550002", "status": "delivered",
+               "body": f"Message {i}", "price": 0.0079}
+
+@pytest.mark.core
+class TestStreamingExport:
+    """Test suite for export_records and Parquet export."""
+
+    def test_gzip_csv_from_generator(self, tmp_path):
+        """Test streaming a generator into a gzip-compressed CSV."""
+        # Setup
+        path = tmp_path / "logs.csv.gz"
+
+        # Execute
+        count = export_records(generate_entries(250), path, LOG_FIELDS)
+
+        # Verify
+        with gzip.open(path, "rt", newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        assert count == 250
+        assert reader.fieldnames == LOG_FIELDS
+        assert rows[1]["sid"] == "SM1"
+        assert rows[1]["timestamp"] == "2024-01-01T00:01:00"
+        assert rows[1]["duration"] == ""
+
+    def test_gzip_json_and_unknown_format(self, tmp_path):
+        """Test gzip JSON output and rejecting unknown extensions."""
+        # Setup
+        numbers = (PhoneNumber(number=f"+1555000{i:04d}", capabilities={"voice": True})
+                   for i in range(3))
+
+        # Execute
+        count = export_records(numbers, tmp_path / "numbers.json.gz")
+
+        # Verify
+        with gzip.open(tmp_path / "numbers.json.gz", "rt") as f:
+            data = json.load(f)
+        assert count == 3
+        assert [item["number"] for item in data] == ["+15550000000", "+15550000001", "+15550000002"]
+        with pytest.raises(ValueError):
+            export_records([], tmp_path / "numbers.xml")
+
+    def test_gzip_jsonl_from_generator(self, tmp_path):
+        """Test streaming a generator into gzip-compressed JSON Lines."""
+        # Setup
+        path = tmp_path / "logs.jsonl.gz"
+
+        # Execute
+        count = export_records(generate_entries(5), path)
+
+        # Verify
+        with gzip.open(path, "rt") as f:
+            rows = [json.loads(line) for line in f]
+        assert count == len(rows) == 5
+        assert rows[1]["sid"] == "SM1"
+        assert rows[1]["timestamp"] == "2024-01-01T00:01:00"
+
+    def test_parquet_row_groups(self, tmp_path):
+        """Test writing Parquet in row groups of batch_size records."""
+        # Setup
+        parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "logs.parquet"
+
+        # Execute
+        count = export_to_parquet(generate_entries(25), path, batch_size=10)
+
+        # Verify
+        table = parquet.read_table(path)
+        assert count == table.num_rows == 25
+        assert parquet.ParquetFile(path).num_row_groups == 3
+        assert table.column("sid").to_pylist()[-1] == "SM24"
+
+    def test_parquet_schema_from_fieldnames(self, tmp_path):
+        """Test that mixed calls and messages keep every column."""
+        # Setup
+        parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "logs.parquet"
+        calls = ({"sid": f"CA{i}", "type": "call", "timestamp": datetime(2024, 1, 1),
+                  "duration": str(i), "price": "0.013"} for i in range(3))
+        entries = list(generate_entries(3)) + list(calls)
+
+        # Execute
+        count = export_to_parquet(iter(entries), path, batch_size=3, fieldnames=LOG_FIELDS)
+        empty = export_to_parquet([], tmp_path / "empty.parquet", fieldnames=LOG_FIELDS)
+
+        # Verify
+        table = parquet.read_table(path)
+        assert count == 6 and empty == 0
+        assert table.column_names == LOG_FIELDS
+        assert table.column("duration").to_pylist() == [None, None, None, "0", "1", "2"]
+        assert table.column("price").to_pylist()[-1] == pytest.approx(0.013)
+        assert parquet.read_table(tmp_path / "empty.parquet").column_names == LOG_FIELDS
@@ -0,0 +1,65 @@
+"""Tests for vectorized usage analytics."""
+
+import numpy as np
+import pytest
+from datetime import date
+from app.core.usage_analytics import build_matrix, moving_average, project_cost, rollup
+
+def make_record(day, category, usage, cost, units="minutes"):
+    """Build a daily usage record."""
+    return {"day": date(2024, 1, day), "category": category, "usage": usage,
+            "units": units, "cost": cost}
+
+@pytest.mark.core
+class TestUsageAnalytics:
+    """Test suite for usage rollups, moving averages and projections."""
+
+    def test_matrix_and_rollup(self):
+        """Test laying out records and rolling them up per category."""
+        # Setup
+        records = [
+            make_record(1, "calls", 10, 0.14), make_record(1, "totalprice", 0, 0.22),
+            make_record(1, "sms", 10, 0.08, "segments"),
+            make_record(3, "calls", 20, 0.28), make_record(3, "totalprice", 0, 0.28),
+        ]
+
+        # Execute
+        matrix = build_matrix(records, date(2024, 1, 1), date(2024, 1, 3))
+        totals = rollup(matrix)
+
+        # Verify
+        assert matrix.categories == ["calls", "sms", "totalprice"]
+        assert matrix.usage.shape == (3, 3)
+        assert matrix.column("calls").tolist() == [10, 0, 20]
+        assert matrix.column("mms").tolist() == [0, 0, 0]
+        assert matrix.daily_cost() == pytest.approx([0.22, 0.0, 0.28])
+        assert totals["calls"] == {"usage": 30, "units": "minutes", "cost": pytest.approx(0.42)}
+        assert totals["sms"]["units"] == "segments"
+
+    def test_moving_average(self):
+        """Test the trailing average over partial and full windows."""
+        # Execute
+        average = moving_average(np.array([1.0, 2.0, 3.0, 4.0, 5.0]), window=3)
+
+        # Verify
+        assert average.tolist() == [1.0, 1.5, 2.0, 3.0, 4.0]
+        assert moving_average(np.array([])).size == 0
+
+    def test_projection_follows_trend(self):
+        """Test that the projection tracks recent growth, unlike a flat average."""
+        # Setup
+        flat = np.full(30, 2.0)
+        rising = np.concatenate([np.full(20, 1.0), np.linspace(1.0, 5.0, 10)])
+        falling = np.linspace(3.0, 0.0, 30)
+
+        # Execute
+        flat_projection = project_cost(flat)
+        rising_projection = project_cost(rising)
+        falling_projection = project_cost(falling)
+
+        # Verify
+        assert flat_projection == pytest.approx(60.0)
+        assert rising_projection > rising.mean() * 30
+        assert rising_projection > rising[-1] * 30
+        assert falling_projection == 0.0
+        assert project_cost(np.array([])) == 0.0
@@ -0,0 +1,84 @@
+"""Tests for merging call and message logs in AccountService."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def make_gateway(call_minutes, message_minutes, page_size):
+    """Build a gateway serving newest-first pages of calls and messages."""
+    def resources(type_, minutes):
+        for minute in sorted(minutes, reverse=True):
+            timestamp = START + timedelta(minutes=minute)
+            yield SimpleNamespace(
+                sid=f"{type_[:2].upper()}{minute}", start_time=timestamp,
+                date_created=timestamp, from_="+15550001", to="+15550002",
+                status="completed", duration="10", body="hi", price=None,
+                direction="outbound-api"
+            )
+
+    pages = {}
+    for type_, minutes in (("calls", call_minutes), ("messages", message_minutes)):
+        items = list(resources(type_, minutes))
+        for index in range(0, max(len(items), 1), page_size):
+            has_next = index + page_size < len(items)
+            pages[(type_, index)] = {
+                "items": items[index:index + page_size],
+                "next_page_token": f"{type_}:{index + page_size}" if has_next else None
+            }
+
+    gateway = MagicMock()
+    gateway.fetches = []
+
+    def fetch_log_page(type_, size, page_url=None, **filters):
+        index = int(page_url.split(":")[1]) if page_url else 0
+        gateway.fetches.append((type_, index))
+        return pages[(type_, index)]
+
+    gateway.fetch_log_page.side_effect = fetch_log_page
+    return gateway
+
+@pytest.mark.services
+class TestAccountLogMerge:
+    """Test suite for AccountService.get_account_logs."""
+
+    def test_deep_paging_is_ordered_and_complete(self, account_service_module):
+        """Test that paging through the merged logs sees every entry once, newest first."""
+        # Setup
+        calls = [1, 2, 3, 10, 11, 12, 13, 14]
+        messages = [4, 5, 20, 21]
+        service = account_service_module.AccountService(make_gateway(calls, messages, page_size=3))
+
+        # Execute
+        seen = []
+        token = None
+        while True:
+            page = service.get_account_logs(page_token=token, page_size=3)
+            seen.extend(page["items"])
+            token = page["next_page_token"]
+            if token is None:
+                break
+
+        # Verify
+        minutes = [int((entry["timestamp"] - START).total_seconds() // 60) for entry in seen]
+        assert minutes == sorted(calls + messages, reverse=True)
+        assert [entry["type"] for entry in seen[:2]] == ["message", "message"]
+
+    def test_fetches_only_needed_pages(self, account_service_module):
+        """Test that the first page does not pull more upstream pages than it shows."""
+        # Setup
+        gateway = make_gateway(range(100), range(100, 103), page_size=20)
+        service = account_service_module.AccountService(gateway)
+
+        # Execute
+        first = service.get_account_logs(page_size=5)
+        fetches_first = list(gateway.fetches)
+        merged = list(service.iter_account_logs(page_size=20))
+
+        # Verify
+        assert [entry["type"] for entry in first["items"]] == ["message"] * 3 + ["call"] * 2
+        assert fetches_first == [("calls", 0), ("messages", 0)]
+        assert len(merged) == 103
+        assert len(gateway.fetches) == 2 + 5 + 1
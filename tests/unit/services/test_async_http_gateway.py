@@ -0,0 +1,164 @@
+"""Tests for the asyncio HTTP gateway."""
+
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from twilio.base.exceptions import TwilioRestException
+from app.gateways.rate_limiter import EndpointLimit, RateLimiter
+from app.gateways.retry import Retrier, RetryPolicy
+
+ACCOUNT_SID = "AC123"
+
+def make_app(requests_seen):
+    """Build a fake Twilio API serving paged searches and REST writes."""
+    base = f"/2010-04-01/Accounts/{ACCOUNT_SID}"
+
+    async def search(request):
+        requests_seen.append(("GET", dict(request.query)))
+        page = int(request.query.get("Page", 0))
+        area = request.query.get("AreaCode", "000")
+        has_next = page < 1
+        return web.json_response({
+            "available_phone_numbers": [
+                {"phone_number": f"+1{area}55500{page}{i}"} for i in range(2)
+            ],
+            "next_page_url": f"{base}/AvailablePhoneNumbers/US/Local.json?AreaCode={area}&Page={page + 1}" if has_next else None,
+            "uri": request.path_qs
+        })
+
+    async def purchase(request):
+        form = await request.post()
+        requests_seen.append(("POST", dict(form)))
+        if form["PhoneNumber"] == "+15550000000":
+            return web.json_response(
+                {"code": 21422, "message": "Number not available"}, status=400
+            )
+        return web.json_response({"sid": "PN1", "phone_number": form["PhoneNumber"]}, status=201)
+
+    async def update(request):
+        requests_seen.append(("POST", dict(await request.post())))
+        return web.json_response({"sid": request.match_info["sid"]})
+
+    async def release(request):
+        sid = request.match_info["sid"]
+        requests_seen.append(("DELETE", sid))
+        if sid == "PNLOST" and len(requests_seen) == 1:
+            # Released, but the response was lost on the way back
+            return web.json_response({"message": "Service unavailable"}, status=503)
+        if sid in ("PNLOST", "PNGONE"):
+            return web.json_response({"code": 20404, "message": "Not found"}, status=404)
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get(f"{base}/AvailablePhoneNumbers/US/Local.json", search)
+    app.router.add_post(f"{base}/IncomingPhoneNumbers.json", purchase)
+    app.router.add_post(f"{base}/IncomingPhoneNumbers/{{sid}}.json", update)
+    app.router.add_delete(f"{base}/IncomingPhoneNumbers/{{sid}}.json", release)
+    return app
+
+async def run_against_server(module, scenario):
+    """Run a scenario with the gateway pointed at a local fake API."""
+    requests_seen = []
+    server = TestServer(make_app(requests_seen))
+    await server.start_server()
+    host = str(server.make_url("")).rstrip("/")
+
+    limiter = RateLimiter({
+        endpoint: EndpointLimit(rate=100.0, burst=10)
+        for endpoint in ("search", "purchase", "account")
+    })
+    retrier = Retrier(RetryPolicy(base_delay=0.0))
+    gateway = module.AsyncHTTPGateway(pool_size=4, rate_limiter=limiter, retrier=retrier)
+    gateway.API_HOST = host
+    gateway.BASE_URL = f"{host}/2010-04-01"
+    try:
+        result = await scenario(gateway)
+    finally:
+        await gateway.close()
+        await server.close()
+    return result, requests_seen
+
+@pytest.mark.services
+class TestAsyncHTTPGateway:
+    """Test suite for AsyncHTTPGateway."""
+
+    def test_search_stream_follows_pages(self, async_http_gateway_module):
+        """Test sharded streaming over the pooled session."""
+        # Setup
+        async def scenario(gateway):
+            pages = []
+            async for page in gateway.search_stream(
+                "US", "Local",
+                capabilities={"sms": True},
+                shards=[{"AreaCode": "212"}, {"AreaCode": "415"}]
+            ):
+                pages.append(page)
+            return pages
+
+        # Execute
+        pages, seen = asyncio.run(run_against_server(async_http_gateway_module, scenario))
+
+        # Verify
+        assert len(pages) == 4
+        assert {(p["shard"]["AreaCode"], p["page"]) for p in pages} == {
+            ("212", 1), ("212", 2), ("415", 1), ("415", 2)
+        }
+        first_queries = [q for method, q in seen if method == "GET" and "Page" not in q]
+        assert all(q["SmsEnabled"] == "true" and q["PageSize"] == "50" for q in first_queries)
+
+    def test_rest_operations(self, async_http_gateway_module):
+        """Test purchase, config update and release requests."""
+        # Setup
+        async def scenario(gateway):
+            sid = await gateway.purchase_number("+15551234567")
+            updated = await gateway.update_number_config(
+                sid, {"friendly_name": "Sales", "voice_url": "https://example.com/voice"}
+            )
+            released = await gateway.release_number(sid)
+            return sid, updated, released
+
+        # Execute
+        (sid, updated, released), seen = asyncio.run(
+            run_against_server(async_http_gateway_module, scenario)
+        )
+
+        # Verify
+        assert (sid, updated, released) == ("PN1", True, True)
+        assert seen == [
+            ("POST", {"PhoneNumber": "+15551234567"}),
+            ("POST", {"FriendlyName": "Sales", "VoiceUrl": "https://example.com/voice"}),
+            ("DELETE", "PN1")
+        ]
+
+    def test_error_response_raises_twilio_exception(self, async_http_gateway_module):
+        """Test that API errors surface like the twilio client's errors."""
+        # Setup
+        async def scenario(gateway):
+            with pytest.raises(TwilioRestException) as exc_info:
+                await gateway.purchase_number("+15550000000")
+            return exc_info.value
+
+        # Execute
+        error, _ = asyncio.run(run_against_server(async_http_gateway_module, scenario))
+
+        # Verify
+        assert error.status == 400
+        assert error.code == 21422
+
+    def test_retried_release_of_gone_number_succeeds(self, async_http_gateway_module):
+        """Test that a 404 only counts as released after a lost response."""
+        # Setup
+        async def scenario(gateway):
+            released = await gateway.release_number("PNLOST")
+            with pytest.raises(TwilioRestException) as exc_info:
+                await gateway.release_number("PNGONE")
+            return released, exc_info.value
+
+        # Execute
+        (released, error), seen = asyncio.run(run_against_server(async_http_gateway_module, scenario))
+
+        # Verify
+        assert released is True
+        assert error.status == 404
+        assert seen == [("DELETE", "PNLOST"), ("DELETE", "PNLOST"), ("DELETE", "PNGONE")]
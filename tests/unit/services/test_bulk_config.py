@@ -0,0 +1,122 @@
+"""Tests for NumberService bulk configuration."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+TEMPLATE = {
+    "voice_url": "https://example.com/voice",
+    "voice_method": "post",
+    "sms_url": "https://example.com/sms"
+}
+
+def make_gateway(configs, failing=()):
+    """Build a gateway mock serving and recording number configs."""
+    gateway = MagicMock()
+    gateway.updates = {}
+
+    def get_config(sid):
+        if sid in failing:
+            raise RuntimeError("Number not found")
+        return dict(configs[sid])
+
+    def update(sid, config):
+        gateway.updates[sid] = config
+        return True
+
+    gateway.get_number_config.side_effect = get_config
+    gateway.update_number_config.side_effect = update
+    return gateway
+
+@pytest.mark.services
+class TestBulkConfig:
+    """Test suite for diff_number_config and apply_config_bulk."""
+
+    def test_diff_normalizes_values(self, number_service_module):
+        """Test that only real differences are reported."""
+        # Setup
+        current = {"voice_url": "https://example.com/voice", "voice_method": "POST",
+                   "sms_url": "", "status_callback": None}
+        desired = {"voice_url": "https://example.com/voice", "voice_method": "post",
+                   "sms_url": None, "status_callback": "https://example.com/status"}
+
+        # Execute
+        changes = number_service_module.NumberService.diff_number_config(current, desired)
+
+        # Verify
+        assert changes == {"status_callback": "https://example.com/status"}
+
+    def test_diff_covers_application_fields(self, number_service_module):
+        """Test that application, trunk and name fields are fetched and diffed."""
+        # Setup
+        number = MagicMock(voice_application_sid="AP1", sms_application_sid="AP2",
+                           trunk_sid=None, friendly_name="Main line")
+        gateway = number_service_module.TwilioGateway(rate_limiter=MagicMock(), retrier=MagicMock())
+        gateway.retrier.call.side_effect = lambda operation, attempt, **kwargs: attempt()
+        gateway._client = MagicMock()
+        gateway._client.incoming_phone_numbers.return_value.fetch.return_value = number
+
+        # Execute
+        current = gateway.get_number_config("PN1")
+        changes = number_service_module.NumberService.diff_number_config(current, {
+            "voice_application_sid": None,
+            "sms_application_sid": "AP2",
+            "trunk_sid": "TK1",
+            "friendly_name": "Main line"
+        })
+
+        # Verify
+        assert current["voice_application_sid"] == "AP1"
+        assert changes == {"voice_application_sid": "", "trunk_sid": "TK1"}
+
+    def test_reads_use_account_rate_limit(self, number_service_module):
+        """Test that only writes are charged to the purchase rate limit."""
+        # Setup
+        limiter = MagicMock()
+        gateway = number_service_module.TwilioGateway(rate_limiter=limiter, retrier=MagicMock())
+        gateway.retrier.call.side_effect = lambda operation, attempt, **kwargs: attempt()
+        gateway._client = MagicMock()
+        gateway._client.incoming_phone_numbers.list.return_value = []
+
+        # Execute
+        gateway.list_numbers()
+        gateway.get_number_config("PN1")
+        gateway.find_owned_number("+15550001")
+        gateway.update_number_config("PN1", {"voice_url": "https://example.com/voice"})
+
+        # Verify
+        assert [call.args[0] for call in limiter.acquire.call_args_list] == [
+            "account", "account", "account", "purchase"
+        ]
+
+    def test_apply_pushes_only_deltas(self, number_service_module):
+        """Test skipping matching numbers and sending changed fields only."""
+        # Setup
+        configs = {
+            "PN1": {"voice_url": "https://example.com/voice", "voice_method": "POST",
+                    "sms_url": "https://example.com/sms"},
+            "PN2": {"voice_url": "https://old.example.com/voice", "voice_method": "POST",
+                    "sms_url": "https://example.com/sms"},
+            "PN3": {"voice_url": None, "voice_method": "GET", "sms_url": None},
+        }
+        gateway = make_gateway(configs, failing={"PN4"})
+        service = number_service_module.NumberService(gateway, MagicMock())
+        events = []
+
+        # Execute
+        summary = asyncio.run(service.apply_config_bulk(
+            ["PN1", "PN2", "PN3", "PN4"], TEMPLATE, concurrency=2,
+            progress=lambda sid, status: events.append((sid, status))
+        ))
+
+        # Verify
+        assert summary.unchanged == ["PN1"]
+        assert gateway.updates == {
+            "PN2": {"voice_url": "https://example.com/voice"},
+            "PN3": TEMPLATE
+        }
+        assert summary.updated == gateway.updates
+        assert summary.failed == {"PN4": "Number not found"}
+        assert sorted(events) == [
+            ("PN1", "unchanged"), ("PN2", "updated"), ("PN3", "updated"), ("PN4", "failed")
+        ]
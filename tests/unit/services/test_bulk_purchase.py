@@ -0,0 +1,96 @@
+"""Tests for the NumberService bulk purchase pipeline."""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+class FakeTwilioGateway:
+    """Blocking purchase gateway tracking concurrent calls."""
+
+    def __init__(self, failing=(), delay=0.05):
+        self.failing = set(failing)
+        self.delay = delay
+        self.purchased = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def purchase_number(self, phone_number):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if phone_number in self.failing:
+                raise RuntimeError("Number not available")
+            with self._lock:
+                self.purchased.append(phone_number)
+            return f"PN{phone_number[-4:]}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+NUMBERS = [f"+1555000{i:04d}" for i in range(10)]
+
+@pytest.mark.services
+class TestBulkPurchase:
+    """Test suite for NumberService.purchase_numbers."""
+
+    def test_concurrent_purchase_with_partial_failure(self, number_service_module):
+        """Test bounded concurrency, progress events and the summary."""
+        # Setup
+        gateway = FakeTwilioGateway(failing={NUMBERS[3]})
+        file_logger = MagicMock()
+        service = number_service_module.NumberService(gateway, MagicMock(), file_logger)
+        events = []
+
+        # Execute
+        started = time.monotonic()
+        summary = asyncio.run(service.purchase_numbers(
+            NUMBERS, concurrency=4, progress=events.append
+        ))
+        elapsed = time.monotonic() - started
+
+        # Verify
+        assert gateway.max_active == 4
+        assert elapsed < len(NUMBERS) * gateway.delay
+        assert set(summary.purchased) == set(NUMBERS) - {NUMBERS[3]}
+        assert summary.purchased[NUMBERS[0]] == "PN0000"
+        assert summary.failed == {NUMBERS[3]: "Number not available"}
+        assert not summary.complete
+
+        statuses = [(e.number, e.status) for e in events]
+        assert statuses.count((NUMBERS[3], "failed")) == 1
+        assert all((n, "purchasing") in statuses for n in NUMBERS)
+        assert file_logger.log_operation.call_count == len(NUMBERS)
+
+    def test_checkpoint_resume(self, number_service_module, tmp_path):
+        """Test that a rerun skips numbers purchased by an earlier run."""
+        # Setup
+        checkpoint = tmp_path / "purchase.json"
+        first = FakeTwilioGateway(failing={NUMBERS[1], NUMBERS[2]}, delay=0)
+        service = number_service_module.NumberService(first, MagicMock())
+        asyncio.run(service.purchase_numbers(NUMBERS[:5], checkpoint_path=checkpoint))
+
+        # Execute
+        second = FakeTwilioGateway(delay=0)
+        service.twilio_gateway = second
+        events = []
+        summary = asyncio.run(service.purchase_numbers(
+            NUMBERS[:5], progress=events.append, checkpoint_path=checkpoint
+        ))
+
+        # Verify
+        assert sorted(second.purchased) == [NUMBERS[1], NUMBERS[2]]
+        assert set(summary.skipped) == {NUMBERS[0], NUMBERS[3], NUMBERS[4]}
+        assert summary.complete
+        assert [e.number for e in events if e.status == "skipped"] == [
+            NUMBERS[0], NUMBERS[3], NUMBERS[4]
+        ]
+
+        saved = json.loads(checkpoint.read_text())
+        assert set(saved["purchased"]) == set(NUMBERS[:5])
+        assert saved["failed"] == {}
@@ -0,0 +1,109 @@
+"""Tests for NumberService bulk release planning and execution."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from twilio.base.exceptions import TwilioRestException
+from app.gateways.retry import Retrier, RetryPolicy
+from app.models.phone_number_model import NumberRecord
+
+ACTIVE = [
+    NumberRecord(number="+12125550001", country="US", type="local",
+                 capabilities=["voice"], price=1.15, sid="PN1"),
+    NumberRecord(number="+18005550002", country="US", type="tollfree",
+                 capabilities=["voice"], sid="PN2"),
+    NumberRecord(number="+14165550003", country="CA", type="local",
+                 capabilities=["sms"], price=1.15, sid="PN3"),
+    NumberRecord(number="+61412345678", country="AU", type="mobile",
+                 capabilities=["sms"], sid="PN4"),
+]
+
+def make_service(module, failing=()):
+    """Build a service whose gateway owns the ACTIVE numbers."""
+    gateway = MagicMock()
+    gateway.list_numbers.return_value = ACTIVE
+    gateway.released = []
+
+    def release(sid):
+        if sid in failing:
+            raise RuntimeError("Number is in use")
+        gateway.released.append(sid)
+        return True
+
+    gateway.release_number.side_effect = release
+    return module.NumberService(gateway, MagicMock(), MagicMock()), gateway
+
+@pytest.mark.services
+class TestBulkRelease:
+    """Test suite for plan_release and release_numbers."""
+
+    def test_plan_by_sids(self, number_service_module):
+        """Test a dry-run plan over explicit SIDs."""
+        # Setup
+        service, gateway = make_service(number_service_module)
+
+        # Execute
+        plan = service.plan_release(sids=["PN1", "PN2", "PN9"])
+
+        # Verify
+        assert [record.sid for record in plan.numbers] == ["PN1", "PN2"]
+        assert plan.missing == ["PN9"]
+        assert plan.monthly_savings == pytest.approx(1.15 + 2.15)
+        gateway.release_number.assert_not_called()
+
+    def test_plan_by_filter(self, number_service_module):
+        """Test matching active numbers on record fields."""
+        # Setup
+        service, _ = make_service(number_service_module)
+
+        # Execute
+        us_local = service.plan_release(filters={"country": "US", "type": "local"})
+        mobile_or_ca = service.plan_release(filters={"country": ["CA", "AU"]})
+
+        # Verify
+        assert [record.sid for record in us_local.numbers] == ["PN1"]
+        assert [record.sid for record in mobile_or_ca.numbers] == ["PN3", "PN4"]
+        assert mobile_or_ca.monthly_savings == pytest.approx(1.15 + 6.50)
+        with pytest.raises(ValueError):
+            service.plan_release()
+
+    def test_release_runs_concurrently_with_partial_failure(self, number_service_module):
+        """Test releasing a plan with one failing number."""
+        # Setup
+        service, gateway = make_service(number_service_module, failing={"PN3"})
+        plan = service.plan_release(filters={"country": ["US", "CA"]})
+        events = []
+
+        # Execute
+        summary = asyncio.run(service.release_numbers(
+            plan, concurrency=2, progress=lambda sid, status: events.append((sid, status))
+        ))
+
+        # Verify
+        assert sorted(gateway.released) == ["PN1", "PN2"]
+        assert summary.released == {"PN1": "+12125550001", "PN2": "+18005550002"}
+        assert summary.failed == {"PN3": "Number is in use"}
+        assert summary.monthly_savings == pytest.approx(1.15 + 2.15)
+        assert sorted(events) == [("PN1", "released"), ("PN2", "released"), ("PN3", "failed")]
+        assert service.file_logger.log_operation.call_count == 3
+
+    def test_gateway_release_retry_after_lost_response(self, number_service_module):
+        """Test that a retried release finding the number gone succeeds."""
+        # Setup
+        def api_error(status):
+            return TwilioRestException(status, "/IncomingPhoneNumbers/PN1.json", method="DELETE")
+
+        gateway = number_service_module.TwilioGateway(rate_limiter=MagicMock(),
+                                retrier=Retrier(RetryPolicy(), sleep=lambda delay: None))
+        gateway._client = MagicMock()
+        delete = gateway._client.incoming_phone_numbers.return_value.delete
+
+        # Execute
+        delete.side_effect = [api_error(503), api_error(404)]
+        released = gateway.release_number("PN1")
+        delete.side_effect = [api_error(404)]
+
+        # Verify
+        assert released is True
+        with pytest.raises(TwilioRestException):
+            gateway.release_number("PN1")
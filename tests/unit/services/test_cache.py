@@ -0,0 +1,162 @@
+"""Tests for the TTL and stale-while-revalidate cache."""
+
+import importlib
+import pytest
+from unittest.mock import MagicMock
+from app.shared.cache import cache_stats, cached, reset_cache_stats
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+CLOCK = FakeClock()
+
+class Source:
+    """Read-only source counting its fetches."""
+
+    def __init__(self):
+        self.fetches = 0
+        self.fail = False
+
+    @cached(ttl=10, stale_ttl=50, clock=CLOCK, executor=lambda refresh: refresh())
+    def read(self, key):
+        if self.fail:
+            raise RuntimeError("API down")
+        self.fetches += 1
+        return f"{key}-{self.fetches}"
+
+@pytest.mark.services
+class TestCache:
+    """Test suite for the cached decorator."""
+
+    def setup_method(self):
+        """Start each test at time zero with zeroed counters."""
+        CLOCK.now = 0.0
+        reset_cache_stats()
+
+    def test_fresh_stale_and_expired(self):
+        """Test serving fresh, then stale while refreshing, then blocking."""
+        # Setup
+        source = Source()
+
+        # Execute
+        first = source.read("a")
+        fresh = source.read("a")
+        CLOCK.now = 20
+        stale = source.read("a")
+        refreshed = source.read("a")
+        CLOCK.now = 100
+        expired = source.read("a")
+
+        # Verify
+        assert (first, fresh, stale, refreshed, expired) == ("a-1", "a-1", "a-1", "a-2", "a-3")
+        assert cache_stats()["Source.read"] == {
+            "hits": 2, "stale_hits": 1, "misses": 2, "refreshes": 1,
+            "refresh_errors": 0, "invalidations": 0
+        }
+
+    def test_failures_are_not_cached(self):
+        """Test that errors propagate on a miss and keep stale values on refresh."""
+        # Setup
+        source = Source()
+        source.read("a")
+        source.fail = True
+
+        # Execute
+        CLOCK.now = 20
+        stale = source.read("a")
+        with pytest.raises(RuntimeError):
+            source.read("b")
+
+        # Verify
+        assert stale == "a-1"
+        assert cache_stats()["Source.read"]["refresh_errors"] == 1
+        source.fail = False
+        assert source.read("b") == "b-2"
+
+    def test_invalidation_is_per_instance_and_key(self):
+        """Test dropping one key, then all keys, of one instance."""
+        # Setup
+        first, second = Source(), Source()
+        first.read("a"), first.read("b"), second.read("a")
+
+        # Execute
+        first.read.invalidate("a")
+        after_key = (first.read("a"), first.read("b"), second.read("a"))
+        first.read.invalidate()
+        after_all = first.read("b")
+
+        # Verify
+        assert after_key == ("a-3", "b-2", "a-1")
+        assert after_all == "b-4"
+
+    def test_invalidation_during_fetch_is_not_overwritten(self):
+        """Test that a fetch racing a write does not cache its old result."""
+        # Setup
+        class Racing(Source):
+            @cached(ttl=10, clock=CLOCK)
+            def read(self, key):
+                self.fetches += 1
+                if self.fetches == 1:
+                    # A write lands while the first fetch is in flight
+                    self.read.invalidate(key)
+                return f"{key}-{self.fetches}"
+
+        source = Racing()
+
+        # Execute
+        first = source.read("a")
+        second = source.read("a")
+        third = source.read("a")
+
+        # Verify
+        assert (first, second, third) == ("a-1", "a-2", "a-2")
+        assert source.fetches == 2
+
+    def test_number_config_invalidated_by_update(self, number_service_module):
+        """Test that updating a number drops its cached configuration."""
+        # Setup
+        gateway = MagicMock()
+        gateway.get_number_config.side_effect = [
+            {"voice_url": "https://old.example.com"}, {"voice_url": "https://new.example.com"}
+        ]
+        gateway.update_number_config.return_value = True
+        service = number_service_module.NumberService(gateway, MagicMock())
+
+        # Execute
+        before = service.get_number_config("PN1")
+        cached_config = service.get_number_config("PN1")
+        service.update_number_config("PN1", {"voice_url": "https://new.example.com"})
+        after = service.get_number_config("PN1")
+
+        # Verify
+        assert before == cached_config == {"voice_url": "https://old.example.com"}
+        assert after == {"voice_url": "https://new.example.com"}
+        assert gateway.get_number_config.call_count == 2
+
+    def test_billing_fetched_under_account_rate_limit(self, number_service_module):
+        """Test that cached billing goes through the gateway's limiter and retrier."""
+        # Setup
+        account_service = importlib.import_module("app.services.account_service")
+        limiter = MagicMock()
+        gateway = number_service_module.TwilioGateway(rate_limiter=limiter, retrier=MagicMock())
+        gateway.retrier.call.side_effect = lambda operation, attempt, **kwargs: attempt()
+        gateway._client = MagicMock()
+        gateway._client.api.balance.fetch.return_value = MagicMock(balance="12.5", currency="USD")
+        gateway._client.api.balance.last_month.fetch.return_value = MagicMock(
+            total="3", usage_charges="2", total_fee="1"
+        )
+        service = account_service.AccountService(gateway)
+
+        # Execute
+        billing = service.get_billing()
+        service.get_billing()
+
+        # Verify
+        assert billing["balance"] == 12.5 and billing["last_month_fees"] == 1.0
+        assert [call.args for call in limiter.acquire.call_args_list] == [("account",), ("account",)]
@@ -0,0 +1,261 @@
+"""Tests for the FileLogger gateway."""
+
+import gzip
+import json
+import pytest
+import threading
+from app.gateways.file_logger import FileLogger, RotationPolicy
+
+@pytest.mark.services
+class TestFileLogger:
+    """Test suite for FileLogger."""
+
+    def test_entries_appended_as_json_lines(self, tmp_path):
+        """Test that each entry is written as a single JSON line."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path))
+
+        # Execute
+        file_logger.log_operation("purchase", "+15550001111", details={"sid": "PN1"})
+        file_logger.log_operation("release", "+15550002222")
+
+        # Verify
+        lines = file_logger.operation_log.read_text().splitlines()
+        assert len(lines) == 2
+        first = json.loads(lines[0])
+        assert first["operation"] == "purchase"
+        assert first["details"] == {"sid": "PN1"}
+        assert "timestamp" in first
+        assert json.loads(lines[1])["number"] == "+15550002222"
+
+    def test_legacy_array_migration(self, tmp_path):
+        """Test that legacy JSON array logs are migrated once."""
+        # Setup
+        legacy = tmp_path / "operations.json"
+        legacy.write_text(json.dumps([
+            {"operation": "purchase", "number": "+15550001111",
+             "status": "success", "details": {}, "timestamp": "2024-01-01T00:00:00"},
+            {"operation": "release", "number": "+15550001111",
+             "status": "success", "details": {}, "timestamp": "2024-01-02T00:00:00"}
+        ], indent=2))
+
+        # Execute
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        file_logger.log_operation("purchase", "+15550002222")
+        FileLogger(log_dir=str(tmp_path))  # Second start must not re-migrate
+
+        # Verify
+        assert not legacy.exists()
+        assert (tmp_path / "operations.json.migrated").exists()
+
+        logs = file_logger.get_recent_operations()
+        assert [log["number"] for log in logs] == [
+            "+15550001111", "+15550001111", "+15550002222"
+        ]
+
+    def test_filters_and_limit(self, tmp_path):
+        """Test filtering and limiting recent entries."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        for i in range(5):
+            file_logger.log_search("US" if i % 2 else "CA", "local", results_count=i)
+            file_logger.log_debug("gateway" if i % 2 else "service", f"action_{i}")
+
+        # Execute
+        us_searches = file_logger.get_search_history(country="US")
+        recent_debug = file_logger.get_debug_logs(limit=2, component="service")
+
+        # Verify
+        assert [log["results_count"] for log in us_searches] == [1, 3]
+        assert [log["action"] for log in recent_debug] == ["action_2", "action_4"]
+
+    def test_malformed_lines_skipped(self, tmp_path):
+        """Test that a torn trailing line does not break reads."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        file_logger.log_debug("gateway", "ok")
+        with file_logger.debug_log.open('a') as f:
+            f.write('{"component": "gateway", "act')
+
+        # Execute
+        logs = file_logger.get_debug_logs()
+
+        # Verify
+        assert len(logs) == 1
+        assert logs[0]["action"] == "ok"
+
+    def test_tail_read_across_block_boundaries(self, tmp_path, monkeypatch):
+        """Test reverse reads when records straddle block boundaries."""
+        # Setup
+        monkeypatch.setattr("app.gateways.file_logger.TAIL_BLOCK_SIZE", 7)
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        for i in range(20):
+            file_logger.log_operation("purchase" if i % 3 else "release", f"+1555000{i:04d}")
+
+        # Execute
+        recent = file_logger.get_recent_operations(limit=4)
+        releases = file_logger.get_recent_operations(limit=100, operation_type="release")
+
+        # Verify
+        assert [log["number"] for log in recent] == [
+            f"+1555000{i:04d}" for i in range(16, 20)
+        ]
+        assert [log["number"] for log in releases] == [
+            f"+1555000{i:04d}" for i in range(0, 20, 3)
+        ]
+
+    def test_tail_read_stops_at_limit(self, tmp_path, monkeypatch):
+        """Test that only the newest matching records are parsed."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path))
+        for i in range(1000):
+            file_logger.log_debug("gateway" if i % 2 else "service", f"action_{i}")
+
+        decoded = []
+        original = file_logger._decode_line
+        def counting_decode(line, log_file):
+            decoded.append(line)
+            return original(line, log_file)
+        monkeypatch.setattr(file_logger, "_decode_line", counting_decode)
+
+        # Execute
+        logs = file_logger.get_debug_logs(limit=5, component="service")
+
+        # Verify
+        assert [log["action"] for log in logs] == [
+            f"action_{i}" for i in range(990, 1000, 2)
+        ]
+        assert len(decoded) < 1000
+
+    def test_background_writer_batches_and_flushes(self, tmp_path):
+        """Test that background mode preserves order and flushes on close."""
+        # Setup
+        file_logger = FileLogger(
+            log_dir=str(tmp_path),
+            background=True,
+            batch_size=8,
+            flush_interval=60
+        )
+
+        # Execute
+        for i in range(50):
+            file_logger.log_operation("purchase", f"+1555000{i:04d}")
+            file_logger.log_search("US", "local", results_count=i)
+        file_logger.close()
+
+        # Verify
+        operations = [json.loads(line) for line in file_logger.operation_log.read_text().splitlines()]
+        searches = [json.loads(line) for line in file_logger.search_log.read_text().splitlines()]
+        assert [op["number"] for op in operations] == [f"+1555000{i:04d}" for i in range(50)]
+        assert [s["results_count"] for s in searches] == list(range(50))
+
+        # Logging after close falls back to synchronous writes
+        file_logger.log_debug("service", "after_close")
+        assert file_logger.get_debug_logs()[-1]["action"] == "after_close"
+
+    def test_background_reads_see_queued_entries(self, tmp_path):
+        """Test that reads flush pending background writes first."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path), background=True, flush_interval=60)
+
+        # Execute
+        file_logger.log_debug("gateway", "queued")
+        logs = file_logger.get_debug_logs()
+        file_logger.close()
+
+        # Verify
+        assert [log["action"] for log in logs] == ["queued"]
+
+    def test_size_rotation_with_gzip_archives(self, tmp_path):
+        """Test size-based rotation and reads across archived segments."""
+        # Setup
+        file_logger = FileLogger(
+            log_dir=str(tmp_path),
+            rotation={"operations": RotationPolicy(max_bytes=1024)}
+        )
+
+        # Execute
+        for i in range(60):
+            file_logger.log_operation("purchase", f"+1555000{i:04d}")
+        file_logger.log_search("US", "local")
+
+        # Verify
+        archives = sorted(tmp_path.glob("operations.*.jsonl.gz"))
+        assert len(archives) > 1
+        assert file_logger.operation_log.stat().st_size <= 1024
+        assert not list(tmp_path.glob("searches.*.jsonl*"))
+        with gzip.open(archives[0], 'rt') as f:
+            assert json.loads(f.readline())["number"] == "+15550000000"
+
+        logs = file_logger.get_recent_operations(limit=100)
+        assert [log["number"] for log in logs] == [f"+1555000{i:04d}" for i in range(60)]
+
+    def test_rotation_backup_count(self, tmp_path):
+        """Test that old archives beyond backup_count are pruned."""
+        # Setup
+        file_logger = FileLogger(
+            log_dir=str(tmp_path),
+            rotation=RotationPolicy(max_bytes=300, compression=None, backup_count=2)
+        )
+
+        # Execute
+        for i in range(40):
+            file_logger.log_debug("gateway", f"action_{i}")
+
+        # Verify
+        assert len(list(tmp_path.glob("debug.*.jsonl"))) == 2
+        logs = file_logger.get_debug_logs(limit=1000)
+        assert logs[-1]["action"] == "action_39"
+        assert len(logs) < 40
+
+    def test_daily_rotation(self, tmp_path):
+        """Test that a live file older than max_age_days is rotated."""
+        # Setup
+        (tmp_path / "searches.jsonl").write_text(json.dumps({
+            "operation": "search", "country": "US", "type": "local",
+            "capabilities": {}, "results_count": 1,
+            "timestamp": "2020-01-01T00:00:00"
+        }) + "\n")
+        file_logger = FileLogger(
+            log_dir=str(tmp_path),
+            rotation=RotationPolicy(max_age_days=1)
+        )
+
+        # Execute
+        file_logger.log_search("CA", "local", results_count=2)
+        file_logger.log_search("CA", "local", results_count=3)
+
+        # Verify
+        assert len(list(tmp_path.glob("searches.*.jsonl.gz"))) == 1
+        assert len(file_logger.search_log.read_text().splitlines()) == 2
+        history = file_logger.get_search_history()
+        assert [log["results_count"] for log in history] == [1, 2, 3]
+
+    def test_unsupported_compression(self, tmp_path):
+        """Test that an unknown compression is rejected."""
+        with pytest.raises(ValueError):
+            FileLogger(log_dir=str(tmp_path), rotation=RotationPolicy(compression="lz4"))
+
+    def test_entries_logged_during_close_are_kept(self, tmp_path):
+        """Test that closing while other threads log loses no entries."""
+        # Setup
+        file_logger = FileLogger(log_dir=str(tmp_path), background=True, flush_interval=60)
+        started = threading.Barrier(5)
+
+        def log_numbers(worker):
+            started.wait()
+            for i in range(200):
+                file_logger.log_operation("purchase", f"+1555{worker}{i:06d}")
+
+        threads = [threading.Thread(target=log_numbers, args=(worker,)) for worker in range(4)]
+
+        # Execute
+        for thread in threads:
+            thread.start()
+        started.wait()
+        file_logger.close()
+        for thread in threads:
+            thread.join()
+
+        # Verify
+        assert len(file_logger.operation_log.read_text().splitlines()) == 800
@@ -0,0 +1,78 @@
+"""Tests for the SQLite inventory cache and its NumberService integration."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.gateways.inventory_cache import InventoryCache
+from app.models.phone_number_model import NumberRecord
+
+def make_record(sid, number, date_updated="2024-01-01T00:00:00", friendly_name=None):
+    """Build an owned number record."""
+    return NumberRecord(number=number, country="US", type="local", capabilities=["voice"],
+                        sid=sid, friendly_name=friendly_name, date_updated=date_updated)
+
+@pytest.mark.services
+class TestInventoryCache:
+    """Test suite for InventoryCache and NumberService.list_active_numbers."""
+
+    def test_sync_writes_only_changes(self, tmp_path):
+        """Test that a sync adds, updates and removes only what changed."""
+        # Setup
+        cache = InventoryCache(str(tmp_path / "inventory.db"))
+        cache.sync([make_record("PN1", "+12125550001"), make_record("PN2", "+12125550002"),
+                    make_record("PN3", "+12125550003")])
+
+        # Execute
+        counts = cache.sync([
+            make_record("PN1", "+12125550001"),
+            make_record("PN2", "+12125550002", "2024-02-01T00:00:00", "Support"),
+            make_record("PN4", "+12125550004")
+        ])
+
+        # Verify
+        assert counts == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+        assert [record.sid for record in cache.list_records()] == ["PN1", "PN2", "PN4"]
+        assert cache.get("PN2").friendly_name == "Support"
+        assert cache.is_fresh()
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test freshness before the first sync, after it and after the TTL."""
+        # Setup
+        cache = InventoryCache(str(tmp_path / "inventory.db"), ttl=60)
+        stale = cache.is_fresh()
+
+        # Execute
+        cache.sync([])
+        fresh = cache.is_fresh()
+        cache.ttl = 0
+
+        # Verify
+        assert (stale, fresh, cache.is_fresh()) == (False, True, False)
+
+    def test_service_serves_cache_and_tracks_writes(self, number_service_module, tmp_path):
+        """Test listing from cache and updating it on purchase, release and config."""
+        # Setup
+        gateway = MagicMock()
+        gateway.stream_numbers.return_value = [make_record("PN1", "+12125550001"),
+                                               make_record("PN2", "+12125550002")]
+        gateway.purchase_number.return_value = "PN3"
+        gateway.release_number.return_value = True
+        gateway.update_number_config.return_value = True
+        service = number_service_module.NumberService(
+            gateway, MagicMock(), inventory_cache=InventoryCache(str(tmp_path / "inventory.db"))
+        )
+
+        # Execute
+        first = service.list_active_numbers()
+        asyncio.run(service._purchase("+12125550003"))
+        service.release_number("PN1")
+        service.update_number_config("PN2", {"friendly_name": "Sales"})
+        second = service.list_active_numbers()
+        service.list_active_numbers(force_refresh=True)
+
+        # Verify
+        assert [record.sid for record in first] == ["PN1", "PN2"]
+        assert [(record.sid, record.friendly_name) for record in second] == [
+            ("PN2", "Sales"), ("PN3", None)
+        ]
+        assert gateway.stream_numbers.call_count == 2
@@ -0,0 +1,169 @@
+"""Tests for the local log store and AccountService log sync."""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.gateways.log_store import LogStore
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def make_entry(sid, minute, type_="call", from_="+15550001", to="+15550002",
+               status="completed", direction="outbound-api"):
+    """Build an account log entry."""
+    return {"sid": sid, "type": type_, "timestamp": START + timedelta(minutes=minute),
+            "from": from_, "to": to, "direction": direction, "status": status,
+            "duration": "10", "body": None, "price": 0.0}
+
+def make_resource(sid, minute, status="completed"):
+    """Build a call or message resource."""
+    timestamp = START + timedelta(minutes=minute)
+    return SimpleNamespace(sid=sid, start_time=timestamp, date_created=timestamp,
+                           from_="+15550001", to="+15550002", status=status,
+                           direction="inbound", duration="5", body="hi", price="0.01")
+
+@pytest.mark.services
+class TestLogStore:
+    """Test suite for LogStore and AccountService.sync_logs."""
+
+    def test_query_filters_and_pages(self, tmp_path):
+        """Test filtering on number, type, status and date, newest first."""
+        # Setup
+        store = LogStore(str(tmp_path / "logs.db"))
+        store.upsert([
+            make_entry("CA1", 1),
+            make_entry("CA2", 2, status="failed"),
+            make_entry("SM3", 3, type_="message", from_="+15550003", to="+15550001"),
+            make_entry("SM4", 4, type_="message", from_="+15550003", to="+15550004"),
+            make_entry("CA1", 5, status="no-answer"),
+        ])
+
+        # Execute
+        for_number = store.query(number="+15550001")
+        second_page = store.query(number="+15550001", limit=2, offset=2)
+        failed = store.query(status="failed")
+        recent_messages = store.query(type_="message", start=START + timedelta(minutes=4))
+
+        # Verify
+        assert [entry["sid"] for entry in for_number] == ["CA1", "SM3", "CA2"]
+        assert [entry["sid"] for entry in second_page] == ["CA2"]
+        assert [entry["sid"] for entry in failed] == ["CA2"]
+        assert [entry["sid"] for entry in recent_messages] == ["SM4"]
+        assert store.count() == 4
+        assert for_number[0]["timestamp"] == START + timedelta(minutes=5)
+
+    def test_iter_query_pages_by_keyset(self, tmp_path):
+        """Test that entries synced during an iteration do not shift it."""
+        # Setup
+        store = LogStore(str(tmp_path / "logs.db"))
+        store.upsert([make_entry(f"CA{i}", i // 2) for i in range(7)])
+        store.upsert([{**make_entry("CA9", 0), "timestamp": None}])
+
+        # Execute
+        entries = store.iter_query(batch_size=3)
+        seen = [next(entries)["sid"] for _ in range(3)]
+        store.upsert([make_entry("CA7", 10), make_entry("CA8", 11)])
+        seen.extend(entry["sid"] for entry in entries)
+
+        # Verify
+        assert seen == ["CA6", "CA4", "CA5", "CA2", "CA3", "CA0", "CA1", "CA9"]
+
+    def test_incremental_sync_and_local_reads(self, account_service_module, tmp_path):
+        """Test syncing from the high-water mark and serving reads locally."""
+        # Setup
+        listings = {
+            "calls": [make_resource("CA2", 2), make_resource("CA1", 1)],
+            "messages": [make_resource("SM1", 3)]
+        }
+        gateway = MagicMock()
+        gateway.requests = []
+
+        def fetch_log_page(type_, size, page_url=None, **filters):
+            gateway.requests.append((type_, filters))
+            return {"items": listings[type_], "next_page_token": None}
+
+        gateway.fetch_log_page.side_effect = fetch_log_page
+        store = LogStore(str(tmp_path / "logs.db"), ttl=60)
+        service = account_service_module.AccountService(gateway, log_store=store)
+
+        # Execute
+        first = service.get_account_logs(page_size=2)
+        second = service.get_account_logs(page_token=first["next_page_token"], page_size=2)
+        requests_after_reads = len(gateway.requests)
+        listings["calls"] = [make_resource("CA3", 10), make_resource("CA2", 2, "failed")]
+        counts = service.sync_logs(lookback=timedelta(minutes=1))
+        calls = service.get_logs("+15550001", log_type="voice")
+
+        # Verify
+        assert [entry["sid"] for entry in first["items"]] == ["SM1", "CA2"]
+        assert [entry["sid"] for entry in second["items"]] == ["CA1"]
+        assert second["next_page_token"] is None
+        assert requests_after_reads == 2
+        assert gateway.requests[2] == ("calls", {"start_time_after": START + timedelta(minutes=1)})
+        assert gateway.requests[3] == ("messages", {"date_sent_after": START + timedelta(minutes=2)})
+        assert counts == {"calls": 2, "messages": 1}
+        assert [(entry["sid"], entry["status"]) for entry in calls] == [
+            ("CA3", "completed"), ("CA2", "failed"), ("CA1", "completed")
+        ]
+        assert store.high_water_mark("calls") == START + timedelta(minutes=10)
+
+    def test_failed_sync_leaves_store_stale(self, account_service_module, tmp_path):
+        """Test that a type failing to sync keeps the next read syncing."""
+        # Setup
+        gateway = MagicMock()
+
+        def fetch_log_page(type_, size, page_url=None, **filters):
+            if type_ == "messages":
+                raise ConnectionError("reset by peer")
+            return {"items": [make_resource("CA1", 1)], "next_page_token": None}
+
+        gateway.fetch_log_page.side_effect = fetch_log_page
+        store = LogStore(str(tmp_path / "logs.db"), ttl=60)
+        service = account_service_module.AccountService(gateway, log_store=store)
+
+        # Execute
+        counts = service.sync_logs()
+
+        # Verify
+        assert counts == {"calls": 1, "messages": 0}
+        assert not store.is_fresh()
+        assert store.high_water_mark("messages") is None
+
+    def test_page_token_survives_new_entries(self, account_service_module, tmp_path):
+        """Test that store pages continue after the last entry returned."""
+        # Setup
+        store = LogStore(str(tmp_path / "logs.db"))
+        store.upsert([make_entry(f"CA{i}", i) for i in range(4)])
+        store.mark_synced()
+        service = account_service_module.AccountService(MagicMock(), log_store=store)
+
+        # Execute
+        first = service.get_account_logs(page_size=2)
+        store.upsert([make_entry("CA9", 9)])
+        second = service.get_account_logs(page_token=first["next_page_token"], page_size=2)
+
+        # Verify
+        assert [entry["sid"] for entry in first["items"]] == ["CA3", "CA2"]
+        assert [entry["sid"] for entry in second["items"]] == ["CA1", "CA0"]
+        assert second["next_page_token"] is None
+
+    def test_export_streams_from_store(self, account_service_module, tmp_path):
+        """Test exporting filtered logs from the store in batches."""
+        # Setup
+        store = LogStore(str(tmp_path / "logs.db"))
+        store.upsert([make_entry(f"CA{i}", i) for i in range(5)]
+                     + [make_entry("SM9", 9, type_="message")])
+        store.mark_synced()
+        service = account_service_module.AccountService(MagicMock(), log_store=store)
+        path = tmp_path / "calls.json"
+
+        # Execute
+        count = service.export_logs(str(path), log_type="voice")
+
+        # Verify
+        assert count == 5
+        assert [entry["sid"] for entry in json.loads(path.read_text())] == [
+            "CA4", "CA3", "CA2", "CA1", "CA0"
+        ]
+        service.twilio_gateway.fetch_log_page.assert_not_called()
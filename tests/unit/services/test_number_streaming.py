@@ -0,0 +1,90 @@
+"""Tests for lazily paging through active numbers."""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.gateways.rate_limiter import ACCOUNT, EndpointLimit, RateLimiter
+
+class FakePage(list):
+    """Page of IncomingPhoneNumber resources linked to the next page."""
+
+    def __init__(self, items, next_page=None, fetched=None):
+        super().__init__(items)
+        self._next = next_page
+        self._fetched = fetched
+
+    @property
+    def next_page_url(self):
+        return "/next" if self._next is not None else None
+
+    def next_page(self):
+        if self._next is not None:
+            self._fetched.append(self._next)
+        return self._next
+
+def make_pages(count, page_size):
+    """Build a chain of pages of owned numbers and a log of fetched pages."""
+    fetched = []
+    pages = None
+    for index in reversed(range(count)):
+        items = [
+            SimpleNamespace(
+                phone_number=f"+1212555{index:02d}{i:02d}", sid=f"PN{index}{i}",
+                friendly_name=None, capabilities={"voice": True, "sms": False},
+                date_updated=None
+            )
+            for i in range(page_size)
+        ]
+        pages = FakePage(items, pages, fetched)
+    fetched.append(pages)
+    return pages, fetched
+
+def make_gateway(module, first_page):
+    """Build a gateway whose client serves a page chain."""
+    limiter = RateLimiter({ACCOUNT: EndpointLimit(rate=1000, burst=100)})
+    gateway = module.TwilioGateway(rate_limiter=limiter)
+    gateway._client = MagicMock()
+    gateway._client.incoming_phone_numbers.page.return_value = first_page
+    return gateway
+
+@pytest.mark.services
+class TestNumberStreaming:
+    """Test suite for TwilioGateway.stream_numbers and NumberService.stream_active_numbers."""
+
+    def test_pages_are_fetched_lazily(self, twilio_gateway_module):
+        """Test that later pages are only requested once earlier ones are consumed."""
+        # Setup
+        first_page, fetched = make_pages(3, 2)
+        gateway = make_gateway(twilio_gateway_module, first_page)
+
+        # Execute
+        stream = gateway.stream_numbers(page_size=2)
+        head = [next(stream), next(stream)]
+        fetched_after_head = len(fetched)
+        rest = list(stream)
+
+        # Verify
+        gateway._client.incoming_phone_numbers.page.assert_called_once_with(page_size=2)
+        assert fetched_after_head == 1
+        assert len(fetched) == 3
+        assert [record.number for record in head] == ["+12125550000", "+12125550001"]
+        assert len(rest) == 4
+        assert head[0].capabilities == ["voice"]
+        assert gateway.rate_limiter.stats()[ACCOUNT]["requests"] == 3
+
+    def test_service_streams_asynchronously(self, number_service_module, twilio_gateway_module):
+        """Test iterating active numbers from the event loop."""
+        # Setup
+        first_page, _ = make_pages(2, 3)
+        gateway = make_gateway(twilio_gateway_module, first_page)
+        service = number_service_module.NumberService(gateway, MagicMock())
+
+        # Execute
+        async def run():
+            return [record.sid async for record in service.stream_active_numbers(page_size=3)]
+
+        sids = asyncio.run(run())
+
+        # Verify
+        assert sids == ["PN00", "PN01", "PN02", "PN10", "PN11", "PN12"]
@@ -0,0 +1,134 @@
+"""Tests for the durable purchase queue."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.gateways.purchase_queue import PurchaseQueue
+
+NUMBERS = [f"+1555000{i:04d}" for i in range(6)]
+
+def make_gateway(failing=(), owned=()):
+    """Build a Twilio gateway mock that records purchases."""
+    gateway = MagicMock()
+    gateway.purchased = []
+
+    def purchase(number):
+        if number in failing:
+            raise RuntimeError("Number not available")
+        gateway.purchased.append(number)
+        return f"PN{number[-4:]}"
+
+    gateway.purchase_number.side_effect = purchase
+    gateway.find_owned_number.side_effect = (
+        lambda number: MagicMock(sid=f"PN{number[-4:]}") if number in owned else None
+    )
+    return gateway
+
+@pytest.mark.services
+class TestPurchaseQueue:
+    """Test suite for PurchaseQueue and NumberService.queue_purchase."""
+
+    def test_enqueue_is_exactly_once(self, tmp_path):
+        """Test that a number only ever gets one job."""
+        # Setup
+        queue = PurchaseQueue(str(tmp_path / "queue.db"))
+
+        # Execute
+        first = queue.enqueue(NUMBERS[:3])
+        job = queue.claim()
+        queue.complete(job.number, "PN1")
+        second = queue.enqueue(NUMBERS[:4] + [NUMBERS[3]])
+
+        # Verify
+        assert (first, second) == (3, 1)
+        assert job.number == NUMBERS[0]
+        assert queue.get_job(NUMBERS[0]).status == "purchased"
+        assert queue.counts() == {"queued": 3, "in_progress": 0, "purchased": 1, "failed": 0}
+
+    def test_enqueue_requeues_failed_jobs(self, tmp_path):
+        """Test that enqueueing a failed number queues it again."""
+        # Setup
+        queue = PurchaseQueue(str(tmp_path / "queue.db"))
+        queue.enqueue(NUMBERS[:2])
+        queue.fail(queue.claim().number, "Number not available")
+
+        # Execute
+        added = queue.enqueue(NUMBERS[:3])
+
+        # Verify
+        assert added == 2
+        job = queue.get_job(NUMBERS[0])
+        assert (job.status, job.error, job.attempts) == ("queued", None, 1)
+        assert queue.counts()["failed"] == 0
+
+    def test_recover_requeues_interrupted_jobs(self, tmp_path):
+        """Test that in-progress jobs survive a restart."""
+        # Setup
+        db_path = str(tmp_path / "queue.db")
+        queue = PurchaseQueue(db_path)
+        queue.enqueue(NUMBERS[:2])
+        queue.claim()
+        queue.close()
+
+        # Execute
+        restarted = PurchaseQueue(db_path)
+        recovered = restarted.recover()
+        jobs = [restarted.claim(), restarted.claim(), restarted.claim()]
+
+        # Verify
+        assert recovered == 1
+        assert [job.number for job in jobs[:2]] == NUMBERS[:2]
+        assert jobs[0].attempts == 2
+        assert jobs[2] is None
+
+    def test_workers_drain_queue(self, number_service_module, tmp_path):
+        """Test background workers purchasing queued numbers."""
+        # Setup
+        gateway = make_gateway(failing={NUMBERS[2]})
+        queue = PurchaseQueue(str(tmp_path / "queue.db"))
+        service = number_service_module.NumberService(gateway, MagicMock(), purchase_queue=queue)
+
+        # Execute
+        async def run():
+            queued = await service.queue_purchase(NUMBERS, concurrency=3)
+            await service.wait_for_purchases()
+            requeued = await service.queue_purchase(NUMBERS)
+            await service.wait_for_purchases()
+            return queued, requeued
+
+        queued, requeued = asyncio.run(run())
+
+        # Verify
+        # Only the failed purchase is queued again
+        assert (queued, requeued) == (6, 1)
+        assert gateway.purchase_number.call_count == 7
+        assert sorted(gateway.purchased) == sorted(set(NUMBERS) - {NUMBERS[2]})
+        assert service.get_purchase_status()["failed"] == 1
+        failed = service.get_purchase_jobs("failed")
+        assert [(job.number, job.error) for job in failed] == [(NUMBERS[2], "Number not available")]
+
+    def test_crash_recovery_does_not_buy_twice(self, number_service_module, tmp_path):
+        """Test that an interrupted purchase that went through is not repeated."""
+        # Setup
+        db_path = str(tmp_path / "queue.db")
+        crashed = PurchaseQueue(db_path)
+        crashed.enqueue(NUMBERS[:2])
+        crashed.claim()  # Purchase of NUMBERS[0] was sent, then the process died
+        crashed.close()
+
+        gateway = make_gateway(owned={NUMBERS[0]})
+        service = number_service_module.NumberService(
+            gateway, MagicMock(), purchase_queue=PurchaseQueue(db_path)
+        )
+
+        # Execute
+        async def run():
+            service.start_purchase_workers(concurrency=1)
+            await service.wait_for_purchases()
+
+        asyncio.run(run())
+
+        # Verify
+        assert gateway.purchased == [NUMBERS[1]]
+        job = service.purchase_queue.get_job(NUMBERS[0])
+        assert (job.status, job.sid) == ("purchased", "PN0000")
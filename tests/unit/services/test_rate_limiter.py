@@ -0,0 +1,122 @@
+"""Tests for the adaptive rate limiter."""
+
+import asyncio
+import pytest
+from app.gateways.rate_limiter import (
+    SEARCH, EndpointLimit, RateLimiter, TokenBucket, parse_retry_after
+)
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.mark.services
+class TestRateLimiter:
+    """Test suite for TokenBucket and RateLimiter."""
+
+    def test_bucket_spaces_requests(self):
+        """Test that requests beyond the burst wait for refill."""
+        # Setup
+        clock = FakeClock()
+        bucket = TokenBucket(EndpointLimit(rate=2.0, burst=2), clock=clock)
+
+        # Execute
+        waits = [bucket.reserve() for _ in range(4)]
+        clock.now += 1.0
+        after_refill = bucket.reserve()
+
+        # Verify
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+        assert after_refill == pytest.approx(0.5)
+
+    def test_aimd_adjustment(self):
+        """Test additive increase on success and halving on 429."""
+        # Setup
+        bucket = TokenBucket(
+            EndpointLimit(rate=1.0, max_rate=1.2),
+            increase=0.1,
+            clock=FakeClock()
+        )
+
+        # Execute
+        for _ in range(5):
+            bucket.on_success()
+        ceiling = bucket.rate
+        bucket.on_throttle()
+
+        # Verify
+        assert ceiling == pytest.approx(1.2)
+        assert bucket.rate == pytest.approx(0.6)
+        assert bucket.throttles == 1
+
+    def test_retry_after_pauses_bucket(self):
+        """Test that no tokens are granted before Retry-After elapses."""
+        # Setup
+        clock = FakeClock()
+        limiter = RateLimiter({SEARCH: EndpointLimit(rate=10.0, burst=5)}, clock=clock)
+
+        # Execute
+        limiter.on_response(SEARCH, 429, retry_after=3.0)
+        wait = limiter.bucket(SEARCH).reserve()
+
+        # Verify
+        assert wait == pytest.approx(3.0 + 1 / 5.0)
+        assert limiter.stats()[SEARCH]["throttles"] == 1
+
+    def test_endpoint_classes_are_independent(self):
+        """Test that throttling one class does not slow the others."""
+        # Setup
+        limiter = RateLimiter(clock=FakeClock())
+
+        # Execute
+        limiter.on_response("search", 429)
+
+        # Verify
+        assert limiter.bucket("messages").reserve() == 0.0
+        assert limiter.bucket("search").reserve() > 0
+        with pytest.raises(KeyError):
+            limiter.bucket("unknown")
+
+    def test_search_rate_from_settings(self):
+        """Test that search_rate_limit sets the starting search rate."""
+        # Setup
+        class StubSettings:
+            search_rate_limit = 0.25
+            purchase_rate_limit = 0.5
+            messages_rate_limit = 0.2
+            calls_rate_limit = 1.0
+            account_rate_limit = 0.5
+
+        # Execute
+        limiter = RateLimiter.from_settings(StubSettings())
+
+        # Verify
+        assert limiter.bucket("search").rate == pytest.approx(4.0)
+        assert limiter.bucket("purchase").rate == pytest.approx(2.0)
+
+    def test_acquire_async_waits(self):
+        """Test that async acquisition sleeps for the reserved time."""
+        # Setup
+        limiter = RateLimiter({SEARCH: EndpointLimit(rate=50.0)})
+
+        # Execute
+        async def acquire_twice():
+            await limiter.acquire_async(SEARCH)
+            return await limiter.acquire_async(SEARCH)
+
+        second_wait = asyncio.run(acquire_twice())
+
+        # Verify
+        assert 0 < second_wait <= 0.02
+
+    def test_parse_retry_after(self):
+        """Test parsing delay-seconds and malformed Retry-After values."""
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,149 @@
+"""Tests for the gateway retry layer."""
+
+import asyncio
+import pytest
+from requests import exceptions as requests_exceptions
+from twilio.base.exceptions import TwilioRestException
+from app.gateways.retry import Retrier, RetryPolicy
+
+def api_error(status):
+    """Build a Twilio API error with the given status."""
+    return TwilioRestException(status, "/test", msg=f"status {status}", method="POST")
+
+def flaky(errors, result="ok"):
+    """Build a request failing with the given errors before succeeding."""
+    remaining = list(errors)
+    calls = []
+
+    def request():
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return result
+
+    return request, calls
+
+@pytest.fixture
+def retrier():
+    """Retrier that records backoffs instead of sleeping."""
+    delays = []
+    instance = Retrier(RetryPolicy(max_attempts=3), sleep=delays.append)
+    instance.delays = delays
+    return instance
+
+@pytest.mark.services
+class TestRetrier:
+    """Test suite for Retrier."""
+
+    def test_idempotent_request_retried_on_5xx(self, retrier):
+        """Test that GET-style requests are retried on server errors."""
+        # Setup
+        request, calls = flaky([api_error(503), requests_exceptions.ReadTimeout()])
+
+        # Execute
+        result = retrier.call("search_batch", request, idempotent=True)
+
+        # Verify
+        assert result == "ok"
+        assert len(calls) == 3
+        stats = retrier.stats["search_batch"]
+        assert (stats.calls, stats.attempts, stats.retries, stats.failures) == (1, 3, 2, 0)
+        assert len(retrier.delays) == 2
+
+    def test_unsafe_post_not_retried_on_ambiguous_failure(self, retrier):
+        """Test that non-idempotent requests are not repeated after a 5xx."""
+        # Setup
+        request, calls = flaky([api_error(500)])
+
+        # Execute and verify
+        with pytest.raises(TwilioRestException):
+            retrier.call("send_sms", request)
+        assert len(calls) == 1
+        assert retrier.stats["send_sms"].failures == 1
+
+    def test_unsafe_post_retried_when_not_processed(self, retrier):
+        """Test that 429s and failed connects are retried for any request."""
+        # Setup
+        request, calls = flaky([api_error(429), requests_exceptions.ConnectTimeout()])
+
+        # Execute
+        result = retrier.call("make_call", request)
+
+        # Verify
+        assert result == "ok"
+        assert len(calls) == 3
+
+    def test_client_errors_not_retried(self, retrier):
+        """Test that 4xx errors other than 429 fail immediately."""
+        # Setup
+        request, calls = flaky([api_error(400)])
+
+        # Execute and verify
+        with pytest.raises(TwilioRestException):
+            retrier.call("list_numbers", request, idempotent=True)
+        assert len(calls) == 1
+
+    def test_reconcile_recovers_applied_request(self, retrier):
+        """Test that an idempotency check returns the earlier result."""
+        # Setup
+        request, calls = flaky([requests_exceptions.ConnectionError("reset")])
+
+        # Execute
+        result = retrier.call("purchase_number", request, reconcile=lambda: "PN-existing")
+
+        # Verify
+        assert result == "PN-existing"
+        assert len(calls) == 1
+        assert retrier.stats["purchase_number"].recovered == 1
+
+    def test_reconcile_miss_retries(self, retrier):
+        """Test that the request is retried when it did not take effect."""
+        # Setup
+        request, calls = flaky([api_error(502)], result="PN-new")
+
+        # Execute
+        result = retrier.call("purchase_number", request, reconcile=lambda: None)
+
+        # Verify
+        assert result == "PN-new"
+        assert len(calls) == 2
+
+    def test_gives_up_after_max_attempts(self, retrier):
+        """Test that the last error is raised once attempts run out."""
+        # Setup
+        request, calls = flaky([api_error(503)] * 5)
+
+        # Execute and verify
+        with pytest.raises(TwilioRestException):
+            retrier.call("fetch_page", request, idempotent=True)
+        assert len(calls) == 3
+        assert retrier.stats["fetch_page"].failures == 1
+        assert "503" in retrier.stats["fetch_page"].last_error
+
+    def test_async_call(self):
+        """Test retries of coroutine requests."""
+        # Setup
+        delays = []
+
+        async def no_sleep(delay):
+            delays.append(delay)
+
+        retrier = Retrier(async_sleep=no_sleep)
+        request, calls = flaky([api_error(504)])
+
+        async def attempt():
+            return request()
+
+        # Execute
+        result = asyncio.run(retrier.call_async("search_stream", attempt, idempotent=True))
+
+        # Verify
+        assert result == "ok"
+        assert len(calls) == 2
+        assert len(delays) == 1
+
+    def test_backoff_is_capped(self):
+        """Test that jittered backoff never exceeds the cap."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        assert all(0 <= policy.backoff(retry) <= 4.0 for retry in range(1, 10) for _ in range(20))
+        assert all(policy.backoff(1) <= 1.0 for _ in range(20))
@@ -0,0 +1,122 @@
+"""Tests for the search result cache."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.gateways.search_cache import SearchCache
+from app.models.phone_number_model import NumberRecord
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_http_gateway(pages):
+    """Build an HTTP gateway streaming fixed pages and counting searches."""
+    gateway = MagicMock()
+    gateway.searches = 0
+
+    async def search_stream(**kwargs):
+        gateway.searches += 1
+        for page in pages:
+            yield {"numbers": [{"phone_number": number} for number in page]}
+
+    gateway.search_stream = search_stream
+    return gateway
+
+def record(number):
+    """Build an available number record."""
+    return NumberRecord(number=number, country="US", type="local", capabilities=[])
+
+async def collect(service, limit=None, **query):
+    """Read numbers from stream_available, stopping after limit."""
+    numbers = []
+    pages = service.stream_available(page_size=2, **query)
+    try:
+        async for page in pages:
+            numbers.extend(record.number for record in page)
+            if limit and len(numbers) >= limit:
+                break
+    finally:
+        await pages.aclose()
+    return numbers
+
+@pytest.mark.services
+class TestSearchCache:
+    """Test suite for SearchCache and its use in NumberService."""
+
+    def test_fingerprint_normalizes_query(self):
+        """Test that equivalent queries share a key."""
+        # Execute
+        first = SearchCache.fingerprint("us", "Local", {"voice": True, "sms": True, "mms": False},
+                                        " 555 ", {"in_region": "GA", "in_locality": ""})
+        second = SearchCache.fingerprint("US", "local", ["SMS", "voice"], "555", {"in_region": "ga"})
+        other = SearchCache.fingerprint("US", "local", ["voice"], "555", {"in_region": "GA"})
+
+        # Verify
+        assert first == second
+        assert first != other
+
+    def test_regex_patterns_keep_their_case(self):
+        """Test that only Contains patterns are case-folded in the key."""
+        # Execute
+        def key(pattern):
+            return SearchCache.fingerprint("US", "local", pattern=pattern)
+
+        # Verify
+        assert key("call*me") == key("CALL*ME")
+        assert key(r"\d{3}$") != key(r"\D{3}$")
+        assert key("^[a-z]") != key("^[A-Z]")
+
+    def test_ttl_lru_and_eviction(self):
+        """Test expiry, the size bound and evicting purchased numbers."""
+        # Setup
+        clock = FakeClock()
+        cache = SearchCache(ttl=60, max_entries=2, clock=clock)
+        cache.put("a", [record("+1"), record("+2")], complete=True)
+        cache.put("b", [record("+2")], complete=True)
+
+        # Execute
+        cache.get("a")
+        cache.put("c", [], complete=True)
+        evicted = cache.evict_number("+2")
+        clock.now = 61
+        expired = cache.get("a")
+
+        # Verify
+        assert cache.get("b") is None
+        assert evicted == 1
+        assert expired is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_repeated_search_is_served_from_cache(self, number_service_module):
+        """Test replaying cached results and resuming a search that was cut short."""
+        # Setup
+        gateway = make_http_gateway([["+1", "+2"], ["+3", "+4"], ["+5"]])
+        twilio_gateway = MagicMock()
+        twilio_gateway.purchase_number.return_value = "PN1"
+        service = number_service_module.NumberService(
+            twilio_gateway, gateway, search_cache=SearchCache()
+        )
+        query = {"country": "US", "type_": "local", "capabilities": {"voice": True}}
+
+        # Execute
+        async def run():
+            partial = await collect(service, limit=2, **query)
+            resumed = await collect(service, **query)
+            replayed = await collect(service, **query)
+            await service._purchase("+3")
+            after_purchase = await collect(service, **query)
+            return partial, resumed, replayed, after_purchase
+
+        partial, resumed, replayed, after_purchase = asyncio.run(run())
+
+        # Verify
+        assert partial == ["+1", "+2"]
+        assert resumed == replayed == ["+1", "+2", "+3", "+4", "+5"]
+        assert after_purchase == ["+1", "+2", "+4", "+5"]
+        assert gateway.searches == 2
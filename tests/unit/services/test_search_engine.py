@@ -0,0 +1,131 @@
+"""Tests for the concurrent search engine."""
+
+import asyncio
+import pytest
+from app.gateways.search_engine import SearchEngine, SearchError, default_search_shards
+
+def make_fetcher(pages_per_shard, delay=0.0, fail_shards=(), calls=None):
+    """Build a fake page fetcher serving numbered pages per shard."""
+    state = {"active": 0, "max_active": 0}
+
+    async def fetch(shard, page_url):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+            code = shard.get("AreaCode", 0)
+            if code in fail_shards:
+                raise ConnectionError("reset by peer")
+            page = int(page_url.rsplit("=", 1)[1]) if page_url else 0
+            if calls is not None:
+                calls.append((code, page))
+            has_next = page + 1 < pages_per_shard
+            return {
+                "numbers": [{"phone_number": f"+1{code}{page:03d}{i:04d}"} for i in range(2)],
+                "next_page_url": f"/AvailablePhoneNumbers?Page={page + 1}" if has_next else None,
+                "uri": None
+            }
+        finally:
+            state["active"] -= 1
+
+    return fetch, state
+
+async def collect(engine, shards, stop_after=None):
+    """Collect streamed pages, optionally stopping early."""
+    pages = []
+    async for page in engine.stream(shards):
+        pages.append(page)
+        if stop_after is not None and len(pages) >= stop_after:
+            break
+    return pages
+
+@pytest.mark.services
+class TestSearchEngine:
+    """Test suite for SearchEngine."""
+
+    def test_follows_next_page_url_for_each_shard(self):
+        """Test that every page of every shard is fetched."""
+        # Setup
+        fetch, _ = make_fetcher(pages_per_shard=3)
+        engine = SearchEngine(fetch, concurrency=2)
+        shards = [{"AreaCode": 212}, {"AreaCode": 415}]
+
+        # Execute
+        pages = asyncio.run(collect(engine, shards))
+
+        # Verify
+        assert len(pages) == 6
+        numbers = {n["phone_number"] for page in pages for n in page["numbers"]}
+        assert len(numbers) == 12
+        assert sorted(page["page"] for page in pages if page["shard"] == {"AreaCode": 212}) == [1, 2, 3]
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than the configured shards run at once."""
+        # Setup
+        fetch, state = make_fetcher(pages_per_shard=2, delay=0.01)
+        engine = SearchEngine(fetch, concurrency=3)
+        shards = [{"AreaCode": code} for code in range(200, 210)]
+
+        # Execute
+        pages = asyncio.run(collect(engine, shards))
+
+        # Verify
+        assert len(pages) == 20
+        assert state["max_active"] == 3
+
+    def test_failed_shard_does_not_abort_search(self):
+        """Test that a failing shard is recorded and others continue."""
+        # Setup
+        fetch, _ = make_fetcher(pages_per_shard=2, fail_shards={415})
+        engine = SearchEngine(fetch, concurrency=2)
+
+        # Execute
+        pages = asyncio.run(collect(engine, [{"AreaCode": 212}, {"AreaCode": 415}]))
+
+        # Verify
+        assert len(pages) == 2
+        assert engine.errors == [{"shard": {"AreaCode": 415}, "pages": 0, "error": "reset by peer"}]
+
+    def test_all_shards_failing_raises(self):
+        """Test that a search where every shard failed raises SearchError."""
+        # Setup
+        fetch, _ = make_fetcher(pages_per_shard=2, fail_shards={212, 415})
+        errors = []
+        engine = SearchEngine(fetch, concurrency=2, errors=errors)
+
+        # Execute
+        with pytest.raises(SearchError) as raised:
+            asyncio.run(collect(engine, [{"AreaCode": 212}, {"AreaCode": 415}]))
+
+        # Verify
+        assert len(raised.value.errors) == 2
+        assert errors is engine.errors
+        assert "reset by peer" in str(raised.value)
+
+    def test_early_stop_and_page_cap(self):
+        """Test max_pages_per_shard and cancelling on early exit."""
+        # Setup
+        calls = []
+        fetch, state = make_fetcher(pages_per_shard=50, delay=0.001, calls=calls)
+        engine = SearchEngine(fetch, concurrency=2, max_pages_per_shard=4)
+
+        # Execute
+        capped = asyncio.run(collect(engine, [{"AreaCode": 212}]))
+        early = asyncio.run(collect(SearchEngine(fetch, concurrency=2), [{"AreaCode": 305}], stop_after=3))
+
+        # Verify
+        assert len(capped) == 4
+        assert len(early) == 3
+        assert len([c for c in calls if c[0] == 305]) < 50
+        assert state["active"] == 0
+
+    def test_default_shards_from_country_data(self):
+        """Test shard planning from COUNTRY_DATA."""
+        us = default_search_shards("US")
+        assert {"AreaCode": 212} in us
+        assert len(us) == len({s["AreaCode"] for s in us})
+
+        assert default_search_shards("US", region="Alaska") == [{"AreaCode": 907}]
+        assert {"InRegion": "Victoria"} in default_search_shards("AU")
+        assert default_search_shards("GB") == [{}]
+        assert default_search_shards("XX") == [{}]
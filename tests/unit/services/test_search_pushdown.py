@@ -0,0 +1,117 @@
+"""Tests for pushing search filters down to Twilio."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.gateways.search_cache import SearchCache
+from app.gateways.search_engine import SearchError, plan_search_query
+
+@pytest.mark.services
+class TestSearchPushdown:
+    """Test suite for plan_search_query and its use in NumberService."""
+
+    def test_filters_become_query_parameters(self):
+        # Execute
+        query = plan_search_query("555*", {
+            "area_code": 415,
+            "state": "CA",
+            "city": "San Francisco",
+            "postal_code": "94103",
+            "near_lat_long": (37.77, -122.41),
+            "distance": 25,
+            "exclude_all_address_required": True,
+            "beta": False,
+            "locality": None
+        })
+
+        # Verify
+        assert query.params == {
+            "Contains": "555*",
+            "AreaCode": "415",
+            "InRegion": "CA",
+            "InLocality": "San Francisco",
+            "InPostalCode": "94103",
+            "NearLatLong": "37.77,-122.41",
+            "Distance": "25",
+            "ExcludeAllAddressRequired": "true",
+            "Beta": "false"
+        }
+        assert query.shards is None
+        assert query.matches({"phone_number": "+14155550000"})
+
+    def test_only_unsupported_predicates_are_residual(self):
+        # Execute
+        query = plan_search_query(r"^\+1415\d{3}00", {
+            "area_code": [415, 628],
+            "city": ["Oakland", "Berkeley"]
+        })
+
+        # Verify
+        assert query.params == {}
+        assert query.shards == [{"AreaCode": "415"}, {"AreaCode": "628"}]
+        assert query.residual == {"locality": {"oakland", "berkeley"}}
+        assert query.matches({"phone_number": "+14155550012", "locality": "Oakland"})
+        assert not query.matches({"phone_number": "+14155550012", "locality": "Fremont"})
+        assert not query.matches({"phone_number": "+14155551099", "locality": "Oakland"})
+
+    def test_stream_available_pushes_filters_to_gateway(self, number_service_module):
+        # Setup
+        requests = []
+
+        async def search_stream(**kwargs):
+            requests.append(kwargs)
+            yield {"numbers": [
+                {"phone_number": "+14155550100", "locality": "Oakland"},
+                {"phone_number": "+14155550101", "locality": "Fremont"}
+            ]}
+
+        gateway = MagicMock()
+        gateway.search_stream = search_stream
+        service = number_service_module.NumberService(
+            MagicMock(), gateway, search_cache=SearchCache()
+        )
+
+        # Execute
+        results = asyncio.run(service.search_available(
+            "US", "local",
+            pattern="555",
+            locality={"city": ["Oakland", "Berkeley"], "state": "CA"},
+            filters={"area_code": [415, 510], "exclude_all_address_required": True}
+        ))
+
+        # Verify
+        assert [record.number for record in results] == ["+14155550100"]
+        assert requests[0]["filters"] == {
+            "InRegion": "CA",
+            "ExcludeAllAddressRequired": "true",
+            "Contains": "555"
+        }
+        assert requests[0]["shards"] == [{"AreaCode": "415"}, {"AreaCode": "510"}]
+
+    def test_failed_shards_are_not_cached_as_complete(self, number_service_module):
+        # Setup
+        calls = []
+
+        async def search_stream(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                kwargs["errors"].append({"shard": {"AreaCode": 510}, "pages": 0, "error": "timeout"})
+                yield {"numbers": [{"phone_number": "+14155550100"}]}
+            else:
+                raise SearchError([{"shard": {"AreaCode": 415}, "pages": 0, "error": "timeout"}])
+                yield
+
+        gateway = MagicMock()
+        gateway.search_stream = search_stream
+        service = number_service_module.NumberService(
+            MagicMock(), gateway, search_cache=SearchCache()
+        )
+
+        # Execute
+        partial = asyncio.run(service.search_available("US", "local", limit=10))
+        with pytest.raises(SearchError):
+            asyncio.run(service.search_available("US", "local", limit=10))
+
+        # Verify
+        assert [record.number for record in partial] == ["+14155550100"]
+        assert len(calls) == 2
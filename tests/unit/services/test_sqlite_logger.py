@@ -0,0 +1,98 @@
+"""Tests for the SQLite history logger."""
+
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from app.gateways.sqlite_logger import SQLiteLogger
+
+@pytest.mark.services
+class TestSQLiteLogger:
+    """Test suite for SQLiteLogger."""
+
+    def test_filters_match_file_logger_interface(self, tmp_path):
+        """Test filtered queries through the FileLogger interface."""
+        # Setup
+        history = SQLiteLogger(log_dir=str(tmp_path))
+        for i in range(10):
+            history.log_operation(
+                "purchase" if i % 2 else "release",
+                f"+1555000{i:04d}",
+                details={"sid": f"PN{i}"}
+            )
+            history.log_search("US" if i < 3 else "CA", "local", results_count=i)
+            history.log_debug("gateway" if i % 3 == 0 else "service", f"action_{i}")
+
+        # Execute
+        purchases = history.get_recent_operations(limit=3, operation_type="purchase")
+        by_number = history.get_recent_operations(number="+15550000004")
+        us_searches = history.get_search_history(country="US")
+        gateway_logs = history.get_debug_logs(component="gateway")
+        history.close()
+
+        # Verify
+        assert [log["number"] for log in purchases] == [
+            "+15550000005", "+15550000007", "+15550000009"
+        ]
+        assert purchases[0]["details"] == {"sid": "PN5"}
+        assert [log["operation"] for log in by_number] == ["release"]
+        assert [log["results_count"] for log in us_searches] == [0, 1, 2]
+        assert [log["action"] for log in gateway_logs] == [
+            "action_0", "action_3", "action_6", "action_9"
+        ]
+
+    def test_time_range_queries(self, tmp_path):
+        """Test since/until filtering on indexed timestamps."""
+        # Setup
+        history = SQLiteLogger(log_dir=str(tmp_path))
+        history.log_debug("gateway", "old")
+        history.flush()
+        with sqlite3.connect(history.db_path) as conn:
+            conn.execute("UPDATE debug SET timestamp = '2020-01-01T00:00:00'")
+        history.log_debug("gateway", "new")
+
+        # Execute
+        recent = history.get_debug_logs(since=datetime.utcnow() - timedelta(hours=1))
+        older = history.get_debug_logs(until=datetime(2021, 1, 1))
+        history.close()
+
+        # Verify
+        assert [log["action"] for log in recent] == ["new"]
+        assert [log["action"] for log in older] == ["old"]
+
+    def test_background_mode_and_wal(self, tmp_path):
+        """Test batched background inserts and WAL journal mode."""
+        # Setup
+        history = SQLiteLogger(log_dir=str(tmp_path), background=True, batch_size=16)
+
+        # Execute
+        for i in range(100):
+            history.log_operation("purchase", f"+1555000{i:04d}")
+        logs = history.get_recent_operations(limit=1000)
+        history.close()
+
+        # Verify
+        assert [log["number"] for log in logs] == [f"+1555000{i:04d}" for i in range(100)]
+        with sqlite3.connect(history.db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_background_entries_are_snapshots_and_bad_rows_skipped(self, tmp_path):
+        """Test that queued entries ignore later changes and one bad row loses no others."""
+        # Setup
+        history = SQLiteLogger(log_dir=str(tmp_path), background=True, flush_interval=60)
+        history._conn.execute(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON operations "
+            "WHEN NEW.number = 'bad' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+        details = {"sid": "PN1"}
+
+        # Execute
+        history.log_operation("purchase", "+15550001", details=details)
+        details["sid"] = "changed"
+        history.log_operation("purchase", "bad")
+        history.log_operation("purchase", "+15550002")
+        logs = history.get_recent_operations(limit=10)
+        history.close()
+
+        # Verify
+        assert [log["number"] for log in logs] == ["+15550001", "+15550002"]
+        assert logs[0]["details"] == {"sid": "PN1"}
@@ -0,0 +1,72 @@
+"""Tests for cached usage statistics in AccountService."""
+
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+from app.gateways.usage_store import UsageStore
+
+def make_gateway():
+    """Build a gateway serving one call and SMS record set per day."""
+    gateway = MagicMock()
+
+    def list_daily_usage(start, end):
+        records = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            records += [
+                {"day": day, "category": "calls", "usage": 10.0, "units": "minutes", "cost": 0.14},
+                {"day": day, "category": "sms", "usage": 5.0, "units": "segments", "cost": 0.04},
+                {"day": day, "category": "totalprice", "usage": 0.0, "units": "usd", "cost": 0.18},
+            ]
+        return records
+
+    gateway.list_daily_usage.side_effect = list_daily_usage
+    return gateway
+
+@pytest.mark.services
+class TestUsageHistory:
+    """Test suite for get_usage and get_usage_history."""
+
+    def test_history_fetches_only_missing_days(self, account_service_module, tmp_path):
+        """Test that cached days are read locally and gaps fetched in runs."""
+        # Setup
+        gateway = make_gateway()
+        service = account_service_module.AccountService(
+            gateway, usage_store=UsageStore(str(tmp_path / "usage.db"))
+        )
+        service.get_usage_history(datetime(2024, 1, 3), datetime(2024, 1, 4))
+        service.get_usage_history(datetime(2024, 1, 7), datetime(2024, 1, 7))
+
+        # Execute
+        history = service.get_usage_history(datetime(2024, 1, 1), datetime(2024, 1, 8))
+        again = service.get_usage_history(datetime(2024, 1, 1), datetime(2024, 1, 8))
+
+        # Verify
+        fetched = [call.args for call in gateway.list_daily_usage.call_args_list[2:]]
+        assert fetched == [
+            (date(2024, 1, 1), date(2024, 1, 2)),
+            (date(2024, 1, 5), date(2024, 1, 6)),
+            (date(2024, 1, 8), date(2024, 1, 8)),
+        ]
+        assert gateway.list_daily_usage.call_count == 5
+        assert again == history
+        assert len(history) == 8
+        assert history[0].date == datetime(2024, 1, 1)
+        assert (history[0].voice_minutes, history[0].sms_count) == (10.0, 5.0)
+        assert history[0].total_cost == pytest.approx(0.18)
+        assert history[-1].moving_average == pytest.approx(0.18)
+
+    def test_usage_totals_use_rollup_category(self, account_service_module, tmp_path):
+        """Test that totals do not double count the totalprice rollup."""
+        # Setup
+        service = account_service_module.AccountService(
+            make_gateway(), usage_store=UsageStore(str(tmp_path / "usage.db"))
+        )
+
+        # Execute
+        stats = service.get_usage(days=10)
+
+        # Verify
+        assert stats.cost == pytest.approx(1.8)
+        assert stats.projection == pytest.approx(5.4)
+        assert stats.usage["calls"]["usage"] == 100.0